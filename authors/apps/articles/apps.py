@@ -2,4 +2,10 @@ from django.apps import AppConfig
 
 
 class ArticlesConfig(AppConfig):
-    name = 'articles'
+    name = 'authors.apps.articles'
+
+    def ready(self):
+        # connect the receivers keeping the search index, the response
+        # cache and the related articles in step with the articles, so
+        # they run for saves from any code, not only once the views load
+        from . import cache, related, search  # noqa: F401
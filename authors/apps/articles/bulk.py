@@ -0,0 +1,220 @@
+"""
+Bulk import and export of articles as NDJSON, one article per line, to
+move content between environments (see the import_articles and
+export_articles commands and ArticlesBulkView).
+
+Imports go ARTICLE_IMPORT_CHUNK_SIZE lines at a time. The lines of a
+chunk are validated, their authors, tags and slugs are looked up with a
+query or two for the whole chunk, and the articles, their counters, tag
+links and search postings are inserted with bulk_create. bulk_create
+sends no signals, so what the receivers do when an article is saved is
+done here for the chunk instead: the tags are recounted, the article
+lists are invalidated once, and the jobs that add the articles to the
+followers' feeds, and notify them if asked to, are queued for the
+process_notifications worker. Related articles are left
+to rebuild_related_articles.
+"""
+import json
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils.text import slugify
+from rest_framework.exceptions import ValidationError
+
+from authors.apps.authentication.models import User
+from authors.apps.core.utils import chunked
+from authors.apps.notifications.models import NotificationJob
+from .cache import response_cache
+from .models import ArticlesModel, ArticleCounters, Tags
+from .search import drop_document_count, get_backend
+from .serializers import ArticleImportSerializer
+
+EXPORT_FIELDS = ('slug', 'title', 'description', 'body', 'image_url', 'created_at')
+
+
+def allocate_slugs(candidates):
+    """
+    Returns a free slug for each candidate, in order. A candidate that is
+    taken, or repeated, gets the next suffix after the highest one used,
+    as ArticlesModel.create_title_slug does, with one query for all the
+    candidates and one for the suffixes of the taken ones.
+    """
+    taken = set(ArticlesModel.objects.filter(slug__in=set(candidates)).values_list('slug', flat=True))
+    seen, clashes = set(), set()
+    for slug in candidates:
+        if slug in taken or slug in seen:
+            clashes.add(slug)
+        seen.add(slug)
+    suffixes = dict.fromkeys(clashes, 0)
+    if clashes:
+        prefixes = Q()
+        for slug in clashes:
+            prefixes |= Q(slug__startswith=slug + '-')
+        for slug in ArticlesModel.objects.filter(prefixes).values_list('slug', flat=True):
+            base, _, suffix = slug.rpartition('-')
+            if base in suffixes and suffix.isdigit():
+                suffixes[base] = max(suffixes[base], int(suffix))
+
+    assigned, slugs = set(), []
+    for slug in candidates:
+        if slug in taken or slug in assigned:
+            base = slug
+            while slug in assigned or slug in taken:
+                suffixes[base] += 1
+                slug = '{}-{}'.format(base, suffixes[base])
+        assigned.add(slug)
+        slugs.append(slug)
+    return slugs
+
+
+class ArticleImporter:
+    """
+    Imports NDJSON lines of articles, each line with the fields of
+    ArticleImportSerializer. Articles without an author are the given
+    author's. Invalid lines are skipped and listed in errors, with their
+    line number, along with the lines whose author is not found.
+
+    The followers are only notified of the imported articles with
+    notify, moving content over is not news to them.
+    """
+
+    def __init__(self, author=None, notify=False, skip_existing=False, chunk_size=None):
+        self.author = author
+        self.notify = notify
+        # lines whose slug is taken are skipped rather than given another
+        # one, so an import that stopped half way can be run again
+        self.skip_existing = skip_existing
+        self.chunk_size = chunk_size or settings.ARTICLE_IMPORT_CHUNK_SIZE
+        self.serializer = ArticleImportSerializer()
+        self.created = 0
+        self.skipped = 0
+        self.errors = []
+
+    def run(self, lines):
+        """Imports the lines, returns how many articles were created"""
+        for chunk in chunked(self.parse(lines), self.chunk_size):
+            self.import_chunk(chunk)
+        self.errors.sort(key=lambda error: error[0])
+        if self.created:
+            response_cache.invalidate(response_cache.LISTS)
+            drop_document_count()
+        return self.created
+
+    def parse(self, lines):
+        """Yields the line number and validated data of the valid lines"""
+        for number, line in enumerate(lines, 1):
+            if isinstance(line, bytes):
+                line = line.decode('utf-8')
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                self.errors.append((number, {'line': ['Provide one JSON object per line.']}))
+                continue
+            try:
+                yield number, self.serializer.run_validation(record)
+            except ValidationError as error:
+                self.errors.append((number, error.detail))
+
+    def resolve_authors(self, records):
+        """Returns the records whose author is found, with the author's id"""
+        usernames = {data['author'] for _, data in records if 'author' in data}
+        authors = dict(User.objects.filter(username__in=usernames).values_list('username', 'id'))
+        found = []
+        for number, data in records:
+            if 'author' in data:
+                author_id = authors.get(data['author'])
+            else:
+                author_id = getattr(self.author, 'id', None)
+            if author_id is None:
+                self.errors.append((number, {'author': ['No user found for the author given.']}))
+            else:
+                found.append((number, data, author_id))
+        return found
+
+    def import_chunk(self, records):
+        records = self.resolve_authors(records)
+        if self.skip_existing:
+            existing = set(ArticlesModel.objects.filter(
+                slug__in=[data['slug'] for _, data, _ in records if 'slug' in data]).values_list('slug', flat=True))
+            self.skipped += sum(1 for _, data, _ in records if data.get('slug') in existing)
+            records = [record for record in records if record[1].get('slug') not in existing]
+        if not records:
+            return
+        tags = {tag.tag: tag.id for tag in Tags.objects.resolve(
+            [name for _, data, _ in records for name in data.get('tags', ())])}
+        for attempt in range(ArticlesModel.SLUG_ATTEMPTS):
+            try:
+                with transaction.atomic():
+                    self.insert(records, tags)
+                break
+            except IntegrityError:
+                # another article took one of the slugs meanwhile
+                if attempt == ArticlesModel.SLUG_ATTEMPTS - 1:
+                    raise
+        self.created += len(records)
+
+    def insert(self, records, tags):
+        slugs = allocate_slugs([data.get('slug') or slugify(data['title']) for _, data, _ in records])
+        articles, dates = [], {}
+        for (_, data, author_id), slug in zip(records, slugs):
+            article = ArticlesModel(
+                slug=slug, title=data['title'], description=data.get('description', ''), body=data['body'],
+                image_url=data.get('image_url'), author_id=author_id)
+            article.update_reading_time()
+            articles.append(article)
+            if 'created_at' in data:
+                dates[slug] = data['created_at']
+        ArticlesModel.objects.bulk_create(articles)
+
+        # only some databases return the ids of the inserted rows
+        ids = dict(ArticlesModel.objects.filter(slug__in=slugs).values_list('slug', 'id'))
+        for article in articles:
+            article.id = ids[article.slug]
+        # bulk_create dates every row now, bulk_update does not
+        dated = [article for article in articles if article.slug in dates]
+        for article in dated:
+            article.created_at = dates[article.slug]
+        if dated:
+            ArticlesModel.objects.bulk_update(dated, ['created_at'])
+
+        ArticleCounters.objects.bulk_create([ArticleCounters(article_id=article.id) for article in articles])
+        links = ArticlesModel.tags.through
+        links.objects.bulk_create([
+            links(articlesmodel_id=article.id, tags_id=tags[name])
+            for article, (_, data, _) in zip(articles, records) for name in data.get('tags', ())
+        ])
+        if tags:
+            Tags.objects.recount(tags.values())
+        get_backend().index_many(articles, {
+            article.id: data.get('tags', []) for article, (_, data, _) in zip(articles, records)})
+        # unnotified articles still go to the feeds
+        kind = NotificationJob.ARTICLE if self.notify else NotificationJob.TIMELINE
+        NotificationJob.objects.bulk_create([
+            NotificationJob(kind=kind, article_id=article.id) for article in articles
+        ])
+
+
+def export_articles(queryset=None, chunk_size=None):
+    """
+    Yields the articles as NDJSON lines that ArticleImporter reads back,
+    streaming them with .iterator() and looking up the tags of a chunk
+    at a time, so memory use does not grow with the number of articles
+    """
+    chunk_size = chunk_size or settings.ARTICLE_IMPORT_CHUNK_SIZE
+    queryset = ArticlesModel.objects.all() if queryset is None else queryset
+    rows = (queryset.order_by('id').values_list('id', 'author__username', *EXPORT_FIELDS)
+            .iterator(chunk_size=chunk_size))
+    for chunk in chunked(rows, chunk_size):
+        tags = defaultdict(list)
+        links = (ArticlesModel.tags.through.objects.filter(articlesmodel_id__in=[row[0] for row in chunk])
+                 .order_by('id').values_list('articlesmodel_id', 'tags__tag'))
+        for article_id, tag in links:
+            tags[article_id].append(tag)
+        for row in chunk:
+            record = dict(zip(EXPORT_FIELDS, row[2:]), author=row[1], tags=tags[row[0]])
+            yield json.dumps(record, cls=DjangoJSONEncoder) + '\n'
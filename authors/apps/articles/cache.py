@@ -0,0 +1,204 @@
+import hashlib
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date, parse_etags, parse_http_date_safe, quote_etag
+
+from authors.apps.authentication.models import User
+from authors.apps.profiles.models import Profile, Follow
+from .models import ArticlesModel, Comment, Rating, Favourite
+
+
+class ResponseCache:
+    """
+    Keeps the rendered responses of anonymous article reads.
+
+    Entries are stored in the Django cache named by ARTICLE_RESPONSE_CACHE,
+    so the backend is whatever that alias is configured with: local memory
+    by default, a FileBasedCache directory or a shared cache when several
+    processes must see each other's invalidations. Instead of deleting
+    entries, the signal receivers below replace version tokens that are
+    part of the keys: one per article for its detail response, one for
+    every list and one for the profiles embedded in both.
+    """
+
+    LISTS = 'lists'
+    PROFILES = 'profiles'
+
+    def __init__(self, cache=None):
+        self._cache = cache
+
+    @property
+    def cache(self):
+        return self._cache or caches[settings.ARTICLE_RESPONSE_CACHE]
+
+    def cacheable(self, request):
+        """
+        Only anonymous reads are cached, the others depend on the user.
+        Requests carrying credentials, a token or basic auth header or a
+        session cookie, are left to the view, which works out the user.
+        """
+        return (bool(settings.ARTICLE_RESPONSE_CACHE) and
+                request.method in ('GET', 'HEAD') and
+                'HTTP_AUTHORIZATION' not in request.META and
+                settings.SESSION_COOKIE_NAME not in request.COOKIES)
+
+    def versions(self, *names):
+        """Returns the current token of every version, creating missing ones"""
+        keys = ['version:' + name for name in names]
+        found = self.cache.get_many(keys)
+        for key in keys:
+            if key not in found:
+                self.cache.add(key, uuid.uuid4().hex, None)
+                found[key] = self.cache.get(key)
+        return [found[key] for key in keys]
+
+    def invalidate(self, *names):
+        """
+        Replaces the version tokens, the entries built with them are never
+        read again. Inside a transaction they are replaced again once it
+        commits, as a read racing it may have cached the rows it had not
+        committed yet under the new tokens.
+        """
+        self.replace(names)
+        if transaction.get_connection().in_atomic_block:
+            transaction.on_commit(lambda: self.replace(names))
+
+    def replace(self, names):
+        self.cache.set_many({'version:' + name: uuid.uuid4().hex for name in names}, None)
+
+    def invalidate_article(self, slug=None):
+        names = [self.LISTS]
+        if slug:
+            names.append('article:' + slug)
+        self.invalidate(*names)
+
+    def key(self, request, slug=None):
+        names = ['article:' + slug if slug else self.LISTS, self.PROFILES]
+        path = hashlib.md5(request.get_full_path().encode()).hexdigest()
+        return 'response:{}:{}'.format(':'.join(self.versions(*names)), path)
+
+    def get(self, key):
+        return self.cache.get(key)
+
+    def store(self, key, response):
+        """Caches a rendered response and returns the entry"""
+        entry = {
+            'content': response.content,
+            'content_type': response['Content-Type'],
+            'etag': quote_etag(hashlib.md5(response.content).hexdigest()),
+            'last_modified': int(time.time()),
+        }
+        self.cache.set(key, entry)
+        return entry
+
+    def not_modified(self, request, entry):
+        if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+        if if_none_match:
+            etags = parse_etags(if_none_match)
+            return '*' in etags or entry['etag'] in etags
+        if_modified_since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE', ''))
+        return if_modified_since is not None and entry['last_modified'] <= if_modified_since
+
+    def respond(self, request, entry, response=None):
+        """
+        Answers from an entry, with a 304 when the client's copy is current,
+        or by adding the validators to the response it was built from
+        """
+        if self.not_modified(request, entry):
+            response = HttpResponseNotModified()
+        elif response is None:
+            response = HttpResponse(entry['content'], content_type=entry['content_type'])
+            response['X-Cache'] = 'HIT'
+        else:
+            response['X-Cache'] = 'MISS'
+        response['ETag'] = entry['etag']
+        response['Last-Modified'] = http_date(entry['last_modified'])
+        return response
+
+
+response_cache = ResponseCache()
+
+
+class AnonymousResponseCacheMixin:
+    """
+    Serves anonymous GETs from the response cache, the view only runs on
+    a miss and conditional requests are answered before it is reached
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        response = self.cached_dispatch(request, *args, **kwargs)
+        # the response depends on who asks, so must shared caches
+        patch_vary_headers(response, ('Authorization', 'Cookie'))
+        return response
+
+    def cached_dispatch(self, request, *args, **kwargs):
+        if not response_cache.cacheable(request):
+            return super().dispatch(request, *args, **kwargs)
+        key = response_cache.key(request, kwargs.get('slug'))
+        entry = response_cache.get(key)
+        if entry is not None:
+            return response_cache.respond(request, entry)
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code != 200:
+            return response
+        response.render()
+        return response_cache.respond(request, response_cache.store(key, response), response)
+
+
+@receiver(post_save, sender=ArticlesModel)
+@receiver(post_delete, sender=ArticlesModel)
+def invalidate_article(sender, instance, **kwargs):
+    response_cache.invalidate_article(instance.slug)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+@receiver(post_save, sender=Rating)
+@receiver(post_delete, sender=Rating)
+@receiver(post_save, sender=Favourite)
+@receiver(post_delete, sender=Favourite)
+def invalidate_article_of(sender, instance, **kwargs):
+    if sender.article.is_cached(instance):
+        slug = instance.article.slug
+    else:
+        slug = ArticlesModel.objects.filter(id=instance.article_id).values_list('slug', flat=True).first()
+    response_cache.invalidate_article(slug)
+
+
+@receiver(m2m_changed, sender=ArticlesModel.tags.through)
+def invalidate_article_tags(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse and action == 'pre_clear':
+        # the articles losing the tag are gone by post_clear
+        instance._cleared_article_slugs = list(instance.articles.values_list('slug', flat=True))
+        return
+    if not action.startswith('post_'):
+        return
+    if not reverse:
+        response_cache.invalidate_article(instance.slug)
+        return
+    if action == 'post_clear':
+        slugs = instance.__dict__.pop('_cleared_article_slugs', [])
+    else:
+        slugs = ArticlesModel.objects.filter(id__in=pk_set or ()).values_list('slug', flat=True)
+    response_cache.invalidate(response_cache.LISTS, *['article:' + slug for slug in slugs])
+
+
+@receiver(post_save, sender=Profile)
+@receiver(post_save, sender=Follow)
+@receiver(post_delete, sender=Follow)
+def invalidate_profiles(sender, **kwargs):
+    response_cache.invalidate(response_cache.PROFILES)
+
+
+@receiver(post_save, sender=User)
+def invalidate_usernames(sender, update_fields=None, **kwargs):
+    if update_fields is None or 'username' in update_fields:
+        response_cache.invalidate(response_cache.PROFILES)
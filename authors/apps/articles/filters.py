@@ -1,5 +1,8 @@
 import django_filters
+from rest_framework.filters import BaseFilterBackend
+
 from .models import ArticlesModel
+from .search import get_backend
 
 
 class ArticlesFilter(django_filters.FilterSet):
@@ -11,3 +14,17 @@ class ArticlesFilter(django_filters.FilterSet):
     class Meta:
         model = ArticlesModel
         fields = ('title', 'description', 'tag', 'author')
+
+
+class ArticleSearchFilter(BaseFilterBackend):
+    """
+    Filters the articles with ?search= through the search index, the best
+    matches first
+    """
+    search_param = 'search'
+
+    def filter_queryset(self, request, queryset, view):
+        text = request.query_params.get(self.search_param, '').strip()
+        if not text:
+            return queryset
+        return get_backend().search(queryset, text)
@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from authors.apps.articles.models import ArticlesModel
+
+
+class Command(BaseCommand):
+    """
+    Stores the word count and reading time of articles saved before they
+    were computed on save, a batch of articles at a time
+    """
+    help = 'Backfill the stored word count and reading time of the articles'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all', action='store_true',
+            help='Recompute every article, not only those without a word count')
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Number of articles to update per batch')
+
+    def handle(self, *args, **options):
+        articles = ArticlesModel.objects.order_by('id').only('id', 'body')
+        if not options['all']:
+            articles = articles.filter(word_count=0)
+        batch_size = options['batch_size']
+        updated = 0
+
+        batch = []
+        for article in articles.iterator():
+            article.update_reading_time()
+            batch.append(article)
+            if len(batch) == batch_size:
+                updated += self.save(batch)
+                batch = []
+        if batch:
+            updated += self.save(batch)
+
+        self.stdout.write(self.style.SUCCESS(
+            'Reading times stored for {} article(s)'.format(updated)))
+
+    def save(self, articles):
+        with transaction.atomic():
+            ArticlesModel.objects.bulk_update(articles, ['word_count', 'reading_time'])
+        return len(articles)
@@ -0,0 +1,46 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from authors.apps.articles.rollups import compact, first_uncompacted_day
+from authors.apps.articles.stats import view_buffer
+
+
+class Command(BaseCommand):
+    """
+    Rolls the views, comments, likes, favourites and ratings of whole days up
+    into the daily article statistics, by default every day from the last
+    one compacted up to yesterday. Compacting a day again replaces its rows.
+    """
+    help = 'Compact the article events into daily statistics'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--since', help='First day to compact, as YYYY-MM-DD')
+        parser.add_argument('--until', help='Last day to compact, as YYYY-MM-DD')
+
+    def parse_day(self, value):
+        try:
+            day = parse_date(value)
+        except ValueError:
+            day = None
+        if day is None:
+            raise CommandError('{} is not a date as YYYY-MM-DD'.format(value))
+        return day
+
+    def handle(self, *args, **options):
+        # count the views still buffered in this process too
+        view_buffer.flush()
+        until = self.parse_day(options['until']) if options['until'] else \
+            timezone.localdate() - timedelta(days=1)
+        since = self.parse_day(options['since']) if options['since'] else first_uncompacted_day()
+        if since is None or since > until:
+            self.stdout.write('Nothing to compact')
+            return
+        day, articles = since, 0
+        while day <= until:
+            articles += compact(day)
+            day += timedelta(days=1)
+        self.stdout.write(self.style.SUCCESS('Compacted {} day(s), {} article day(s) with events'.format(
+            (until - since).days + 1, articles)))
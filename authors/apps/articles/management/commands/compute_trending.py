@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from authors.apps.articles.stats import view_buffer
+from authors.apps.articles.trending import refresh_scores
+
+
+class Command(BaseCommand):
+    """
+    Recomputes the trending scores from the recent views, likes, ratings,
+    comments and favourites, once or every --every seconds
+    """
+    help = 'Recompute the trending article scores'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--every', type=float,
+            help='Keep recomputing, waiting this many seconds between runs')
+
+    def handle(self, *args, **options):
+        while True:
+            # count the views still buffered in this process too
+            view_buffer.flush()
+            start = time.perf_counter()
+            scored = refresh_scores()
+            self.stdout.write(self.style.SUCCESS('Scored {} trending article(s) in {:.1f}s'.format(
+                scored, time.perf_counter() - start)))
+            if not options['every']:
+                break
+            time.sleep(options['every'])
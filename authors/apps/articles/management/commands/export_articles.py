@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from authors.apps.articles.bulk import export_articles
+from authors.apps.articles.models import ArticlesModel
+
+
+class Command(BaseCommand):
+    """
+    Exports the articles as NDJSON, one article per line, for
+    import_articles to read back in another environment
+    """
+    help = 'Export articles as NDJSON, to standard output unless --output is given'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', help='File to write the articles to')
+        parser.add_argument('--author', help='Only export the articles of this username')
+        parser.add_argument('--chunk-size', type=int, help='Articles read at a time')
+
+    def handle(self, *args, **options):
+        articles = ArticlesModel.objects.all()
+        if options['author']:
+            articles = articles.filter(author__username=options['author'])
+        lines = export_articles(articles, options['chunk_size'])
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                exported = self.write(lines, output.write)
+        else:
+            exported = self.write(lines, lambda line: self.stdout.write(line, ending=''))
+        self.stderr.write('Exported {} article(s)'.format(exported))
+
+    def write(self, lines, write):
+        exported = 0
+        for line in lines:
+            write(line)
+            exported += 1
+        return exported
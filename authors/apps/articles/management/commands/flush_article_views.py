@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from authors.apps.articles.stats import view_buffer
+
+
+class Command(BaseCommand):
+    """
+    Writes out buffered article views, including any left in the spool
+    file by other processes, e.g. before shutting down
+    """
+    help = 'Flush buffered article views to the database'
+
+    def handle(self, *args, **options):
+        flushed = view_buffer.flush()
+        self.stdout.write(self.style.SUCCESS('Flushed {} article view(s)'.format(flushed)))
@@ -0,0 +1,48 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from authors.apps.articles.bulk import ArticleImporter
+from authors.apps.authentication.models import User
+
+
+class Command(BaseCommand):
+    """
+    Imports articles from an NDJSON file, one article per line as written
+    by export_articles, validating and inserting them a chunk at a time
+    """
+    help = 'Import articles from an NDJSON file, - reads standard input'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='NDJSON file to import, - for standard input')
+        parser.add_argument('--author', help='Username of the author of the articles without one')
+        parser.add_argument('--chunk-size', type=int, help='Articles validated and inserted at a time')
+        parser.add_argument(
+            '--notify', action='store_true',
+            help="Notify the authors' followers of the imported articles, which only go to their feeds otherwise")
+        parser.add_argument(
+            '--skip-existing', action='store_true',
+            help='Skip the articles whose slug is taken instead of giving them another one')
+
+    def handle(self, *args, **options):
+        author = None
+        if options['author']:
+            author = User.objects.filter(username=options['author']).first()
+            if author is None:
+                raise CommandError('No user found for the username {}'.format(options['author']))
+        importer = ArticleImporter(author=author, notify=options['notify'],
+                                   skip_existing=options['skip_existing'], chunk_size=options['chunk_size'])
+        start = time.perf_counter()
+        if options['path'] == '-':
+            importer.run(sys.stdin)
+        else:
+            with open(options['path'], 'rb') as lines:
+                importer.run(lines)
+        for number, errors in importer.errors:
+            self.stderr.write('Line {}: {}'.format(number, errors))
+        self.stdout.write(self.style.SUCCESS(
+            'Imported {} article(s) in {:.1f}s, skipped {} existing and {} invalid line(s)'.format(
+                importer.created, time.perf_counter() - start, importer.skipped, len(importer.errors))))
+        if importer.created:
+            self.stdout.write('Run rebuild_related_articles to relate the imported articles')
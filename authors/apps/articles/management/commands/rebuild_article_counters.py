@@ -0,0 +1,85 @@
+import math
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from authors.apps.articles.models import ArticlesModel, ArticleCounters
+
+
+def differs(existing, counters):
+    """
+    Tells whether stored counters differ from recomputed ones. rating_sum
+    is a float summed in a different order, so it is compared with
+    math.isclose rather than !=.
+    """
+    for field in ArticleCounters.COUNTER_FIELDS:
+        stored, expected = getattr(existing, field), getattr(counters, field)
+        if isinstance(stored, float) or isinstance(expected, float):
+            if not math.isclose(stored, expected, abs_tol=1e-9):
+                return True
+        elif stored != expected:
+            return True
+    return False
+
+
+class Command(BaseCommand):
+    """
+    Rebuilds, or with --verify only checks, the denormalized article
+    counters against the likes, ratings (sum, count and histogram),
+    comments, views and favourites tables, a batch of articles at a time
+    """
+    help = 'Rebuild or verify the per-article counters from the source tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--verify', action='store_true',
+            help='Report articles whose counters have drifted without fixing them')
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Number of articles to recompute per batch')
+
+    def handle(self, *args, **options):
+        article_ids = ArticlesModel.objects.order_by('id').values_list('id', flat=True)
+        batch_size = options['batch_size']
+        verify = options['verify']
+        drifted = 0
+
+        batch = []
+        for article_id in article_ids.iterator():
+            batch.append(article_id)
+            if len(batch) == batch_size:
+                drifted += self.process(batch, verify)
+                batch = []
+        if batch:
+            drifted += self.process(batch, verify)
+
+        if verify:
+            if drifted:
+                raise CommandError('{} article(s) have drifted counters'.format(drifted))
+            self.stdout.write(self.style.SUCCESS('Article counters are up to date'))
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                'Article counters rebuilt, {} article(s) fixed'.format(drifted)))
+
+    def process(self, article_ids, verify):
+        """Compares one batch against the source tables and fixes it unless verifying"""
+        expected = ArticleCounters.objects.compute(article_ids)
+        current = ArticleCounters.objects.in_bulk(article_ids)
+
+        missing, changed = [], []
+        for article_id, counters in expected.items():
+            existing = current.get(article_id)
+            if existing is None:
+                missing.append(counters)
+            elif differs(existing, counters):
+                changed.append(counters)
+
+        for counters in missing + changed:
+            if verify:
+                self.stdout.write('Drift on article {}'.format(counters.article_id))
+
+        if not verify:
+            with transaction.atomic():
+                ArticleCounters.objects.bulk_create(missing)
+                ArticleCounters.objects.bulk_update(changed, ArticleCounters.COUNTER_FIELDS)
+        return len(missing) + len(changed)
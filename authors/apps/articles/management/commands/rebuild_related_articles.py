@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from authors.apps.articles.models import ArticlesModel, RelatedArticle
+
+
+class Command(BaseCommand):
+    """
+    Rebuilds the related articles of every article, e.g. to fill the index
+    for the articles published before it existed. Later tag and favourite
+    changes keep it up to date.
+    """
+    help = 'Rebuild the related articles index'
+
+    def handle(self, *args, **options):
+        rebuilt = 0
+        for article_id in ArticlesModel.objects.order_by('id').values_list('id', flat=True).iterator():
+            RelatedArticle.objects.rebuild(article_id)
+            rebuilt += 1
+        self.stdout.write(self.style.SUCCESS('Related articles rebuilt for {} article(s)'.format(rebuilt)))
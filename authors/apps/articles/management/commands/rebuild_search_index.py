@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+
+from authors.apps.articles.models import ArticlesModel
+from authors.apps.articles.search import get_backend, BACKENDS
+
+
+class Command(BaseCommand):
+    """
+    Reindexes every article for search, a batch of articles at a time,
+    e.g after switching SEARCH_BACKEND or for articles written before
+    search was indexed
+    """
+    help = 'Rebuild the article search index'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--backend', choices=sorted(BACKENDS),
+            help='Index for this backend instead of SEARCH_BACKEND')
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help='Number of articles to index per batch')
+
+    def handle(self, *args, **options):
+        backend = BACKENDS[options['backend']]() if options['backend'] else get_backend()
+        batch_size = options['batch_size']
+        indexed = 0
+
+        batch = []
+        for article in ArticlesModel.objects.order_by('id').iterator():
+            batch.append(article)
+            if len(batch) == batch_size:
+                backend.index_many(batch)
+                indexed += len(batch)
+                batch = []
+        if batch:
+            backend.index_many(batch)
+            indexed += len(batch)
+
+        self.stdout.write(self.style.SUCCESS('Search index rebuilt, {} article(s) indexed'.format(indexed)))
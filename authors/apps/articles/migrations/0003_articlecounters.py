@@ -0,0 +1,59 @@
+# Generated by Django 2.2.28 on 2026-10-18 10:17
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+import django.db.models.deletion
+
+
+def backfill_counters(apps, schema_editor):
+    """Creates the counters of existing articles from the source tables"""
+    ArticlesModel = apps.get_model('articles', 'ArticlesModel')
+    ArticleCounters = apps.get_model('articles', 'ArticleCounters')
+
+    def grouped(model, field, aggregate):
+        return dict(model.objects.order_by().values_list(field).annotate(aggregate))
+
+    likes = grouped(ArticlesModel.likes.through, 'articlesmodel_id', Count('id'))
+    dislikes = grouped(ArticlesModel.dislikes.through, 'articlesmodel_id', Count('id'))
+    rating_sums = grouped(apps.get_model('articles', 'Rating'), 'article_id', Sum('rating'))
+    rating_counts = grouped(apps.get_model('articles', 'Rating'), 'article_id', Count('id'))
+    comments = grouped(apps.get_model('articles', 'Comment'), 'article_id', Count('id'))
+    views = grouped(apps.get_model('articles', 'ArticleStat'), 'article_id', Count('id'))
+    favourites = grouped(apps.get_model('articles', 'Favourite'), 'article_id', Count('id'))
+
+    ArticleCounters.objects.bulk_create([
+        ArticleCounters(
+            article_id=article_id,
+            likes=likes.get(article_id, 0),
+            dislikes=dislikes.get(article_id, 0),
+            rating_sum=rating_sums.get(article_id, 0),
+            rating_count=rating_counts.get(article_id, 0),
+            comments=comments.get(article_id, 0),
+            views=views.get(article_id, 0),
+            favourites=favourites.get(article_id, 0),
+        ) for article_id in ArticlesModel.objects.values_list('id', flat=True).iterator()
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0002_auto_20181127_2037'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArticleCounters',
+            fields=[
+                ('article', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='counters', serialize=False, to='articles.ArticlesModel')),
+                ('likes', models.PositiveIntegerField(default=0)),
+                ('dislikes', models.PositiveIntegerField(default=0)),
+                ('rating_sum', models.FloatField(default=0)),
+                ('rating_count', models.PositiveIntegerField(default=0)),
+                ('comments', models.PositiveIntegerField(default=0)),
+                ('views', models.PositiveIntegerField(default=0)),
+                ('favourites', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
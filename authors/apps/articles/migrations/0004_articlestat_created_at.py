@@ -0,0 +1,19 @@
+# Generated by Django 2.2.28 on 2026-10-18 10:20
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0003_articlecounters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='articlestat',
+            name='created_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 2.2.28 on 2026-10-18 10:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0004_articlestat_created_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='favourite',
+            index=models.Index(fields=['article', 'user'], name='favourite_article_user_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 2.2.28 on 2026-10-18 10:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0005_favourite_article_user_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='articlesmodel',
+            index=models.Index(fields=['created_at', 'id'], name='article_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['article', 'parent', 'created_at', 'id'], name='comment_article_page_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='favourite',
+            index=models.Index(fields=['user', 'created_at', 'id'], name='favourite_user_page_idx'),
+        ),
+    ]
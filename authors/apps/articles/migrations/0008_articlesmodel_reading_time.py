@@ -0,0 +1,23 @@
+# Generated by Django 2.2.28 on 2026-10-18 10:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0007_article_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='articlesmodel',
+            name='reading_time',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='articlesmodel',
+            name='word_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 2.2.28 on 2026-10-18 11:09
+
+from django.db import migrations, models
+
+PATH_STEP = '{:010d}/'
+
+
+def backfill_paths(apps, schema_editor):
+    """Sets the paths one level of the comment trees at a time, roots first"""
+    Comment = apps.get_model('articles', 'Comment')
+    level = list(Comment.objects.filter(parent__isnull=True).only('id', 'parent_id'))
+    paths = {}
+    depth = 0
+    while level:
+        for comment in level:
+            comment.path = paths.get(comment.parent_id, '') + PATH_STEP.format(comment.id)
+            comment.depth = depth
+        Comment.objects.bulk_update(level, ['path', 'depth'], batch_size=500)
+        paths = {comment.id: comment.path for comment in level}
+        parent_ids = list(paths)
+        level = []
+        for start in range(0, len(parent_ids), 500):
+            level += Comment.objects.filter(
+                parent_id__in=parent_ids[start:start + 500]).only('id', 'parent_id')
+        depth += 1
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0008_articlesmodel_reading_time'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='depth',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='path',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=1000),
+        ),
+        migrations.RunPython(backfill_paths, migrations.RunPython.noop),
+    ]
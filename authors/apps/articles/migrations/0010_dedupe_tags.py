@@ -0,0 +1,50 @@
+# Generated by Django 2.2.28 on 2026-10-18 11:20
+
+from django.db import migrations
+from django.utils.text import slugify
+
+
+def dedupe_tags(apps, schema_editor):
+    """
+    Merges tags with the same slugged name into the oldest one before the
+    name becomes unique, moving their articles over
+    """
+    Tags = apps.get_model('articles', 'Tags')
+    ArticleTags = apps.get_model('articles', 'ArticlesModel').tags.through
+    kept, duplicates = {}, {}
+    for tag in Tags.objects.order_by('id'):
+        name = slugify(tag.tag)
+        if name in kept:
+            duplicates[tag.id] = kept[name]
+            continue
+        kept[name] = tag.id
+        if tag.tag != name:
+            Tags.objects.filter(id=tag.id).update(tag=name)
+    if not duplicates:
+        return
+
+    tagged = set(ArticleTags.objects.filter(tags_id__in=set(duplicates.values()))
+                 .values_list('articlesmodel_id', 'tags_id'))
+    moved = []
+    for article_id, tag_id in ArticleTags.objects.filter(
+            tags_id__in=list(duplicates)).values_list('articlesmodel_id', 'tags_id'):
+        link = (article_id, duplicates[tag_id])
+        if link not in tagged:
+            tagged.add(link)
+            moved.append(ArticleTags(articlesmodel_id=article_id, tags_id=link[1]))
+    ArticleTags.objects.bulk_create(moved)
+    ArticleTags.objects.filter(tags_id__in=list(duplicates)).delete()
+    Tags.objects.filter(id__in=list(duplicates)).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0009_comment_path'),
+    ]
+
+    # the unique index is added by the next migration, PostgreSQL can't
+    # alter the table in the transaction that deleted the duplicates
+    operations = [
+        migrations.RunPython(dedupe_tags, migrations.RunPython.noop),
+    ]
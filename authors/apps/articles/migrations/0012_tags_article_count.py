@@ -0,0 +1,33 @@
+# Generated by Django 2.2.28 on 2026-10-18 11:24
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_tag_articles(apps, schema_editor):
+    Tags = apps.get_model('articles', 'Tags')
+    ArticleTags = apps.get_model('articles', 'ArticlesModel').tags.through
+    articles = (ArticleTags.objects.filter(tags_id=OuterRef('pk'))
+                .order_by().values('tags_id').annotate(total=Count('id')).values('total'))
+    Tags.objects.update(article_count=Coalesce(Subquery(articles, output_field=IntegerField()), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0011_tags_unique_tag'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tags',
+            name='article_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(count_tag_articles, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='tags',
+            index=models.Index(fields=['-article_count', 'tag'], name='tag_popularity_idx'),
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 2.2.28 on 2026-10-18 11:26
+
+from collections import defaultdict
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import Floor
+
+
+def backfill_histogram(apps, schema_editor):
+    """Counts the existing ratings of every article by whole number of stars"""
+    ArticleCounters = apps.get_model('articles', 'ArticleCounters')
+    Rating = apps.get_model('articles', 'Rating')
+    histograms = defaultdict(dict)
+    for article_id, bucket, total in (Rating.objects.order_by().annotate(bucket=Floor('rating'))
+                                      .values_list('article_id', 'bucket').annotate(Count('id'))):
+        field = 'rating_{}'.format(min(int(bucket), 5))
+        histograms[article_id][field] = histograms[article_id].get(field, 0) + total
+    for article_id, histogram in histograms.items():
+        ArticleCounters.objects.filter(article_id=article_id).update(**histogram)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0012_tags_article_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='articlecounters',
+            name='rating_0',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='articlecounters',
+            name='rating_1',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='articlecounters',
+            name='rating_2',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='articlecounters',
+            name='rating_3',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='articlecounters',
+            name='rating_4',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='articlecounters',
+            name='rating_5',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_histogram, migrations.RunPython.noop),
+    ]
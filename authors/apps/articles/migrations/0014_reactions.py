@@ -0,0 +1,69 @@
+# Generated by Django 2.2.28 on 2026-10-18 11:30
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def move_reactions(apps, schema_editor):
+    """
+    Keeps the likes that were only in the many to many fields as reaction
+    rows, which were written alongside them, and counts the article and
+    comment likes again from the reaction rows, which are now all there is
+    """
+    ArticlesModel = apps.get_model('articles', 'ArticlesModel')
+    ArticleCounters = apps.get_model('articles', 'ArticleCounters')
+    Comment = apps.get_model('articles', 'Comment')
+    LikesDislikes = apps.get_model('articles', 'LikesDislikes')
+    CommentLike = apps.get_model('articles', 'CommentLike')
+
+    LikesDislikes.objects.bulk_create([
+        LikesDislikes(article_id=article_id, reader_id=user_id, likes=likes)
+        for relation, likes in ((ArticlesModel.likes, True), (ArticlesModel.dislikes, False))
+        for article_id, user_id in relation.through.objects.values_list('articlesmodel_id', 'user_id')
+    ], ignore_conflicts=True)
+    CommentLike.objects.bulk_create([
+        CommentLike(specific_comment_id=comment_id, commentor_id=user_id, comment_likes=True)
+        for comment_id, user_id in Comment.comment_likes.through.objects.values_list('comment_id', 'user_id')
+    ], ignore_conflicts=True)
+
+    like_counts = (CommentLike.objects.filter(comment_likes=True).order_by()
+                   .values_list('specific_comment_id').annotate(Count('id')))
+    for comment_id, like_count in like_counts:
+        Comment.objects.filter(id=comment_id).update(like_count=like_count)
+
+    # seeded from the many to many fields, where a reader could both like
+    # and dislike an article
+    ArticleCounters.objects.update(likes=0, dislikes=0)
+    reaction_counts = (LikesDislikes.objects.order_by().values_list('article_id', 'likes')
+                       .annotate(Count('id')))
+    for article_id, likes, count in reaction_counts:
+        ArticleCounters.objects.update_or_create(
+            article_id=article_id, defaults={'likes' if likes else 'dislikes': count})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0013_articlecounters_rating_histogram'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(move_reactions, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='articlesmodel',
+            name='dislikes',
+        ),
+        migrations.RemoveField(
+            model_name='articlesmodel',
+            name='likes',
+        ),
+        migrations.RemoveField(
+            model_name='comment',
+            name='comment_likes',
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 2.2.28 on 2026-10-18 11:44
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+def date_existing_reactions(apps, schema_editor):
+    """
+    Dates the likes and ratings given before they had a date with their
+    article's, rather than now, so they don't all count as recent
+    """
+    ArticlesModel = apps.get_model('articles', 'ArticlesModel')
+    published = ArticlesModel.objects.filter(id=models.OuterRef('article_id')).values('created_at')
+    for name in ('LikesDislikes', 'Rating'):
+        apps.get_model('articles', name).objects.update(created_at=models.Subquery(published))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0014_reactions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrendingScore',
+            fields=[
+                ('article', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='trending', serialize=False, to='articles.ArticlesModel')),
+                ('score', models.FloatField()),
+                ('computed_at', models.DateTimeField()),
+            ],
+        ),
+        migrations.AddField(
+            model_name='likesdislikes',
+            name='created_at',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='rating',
+            name='created_at',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now),
+        ),
+        migrations.AddIndex(
+            model_name='articlestat',
+            index=models.Index(fields=['created_at', 'article'], name='article_stat_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['created_at', 'article'], name='comment_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='favourite',
+            index=models.Index(fields=['created_at', 'article'], name='favourite_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='trendingscore',
+            index=models.Index(fields=['-score', 'article'], name='trending_score_idx'),
+        ),
+        migrations.RunPython(date_existing_reactions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 2.2.28 on 2026-10-18 12:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0017_articledailystats'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='articlesearchterm',
+            index=models.Index(fields=['term', '-weight'], name='search_term_weight_idx'),
+        ),
+    ]
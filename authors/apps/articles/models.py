@@ -1,12 +1,30 @@
+import re
+from collections import OrderedDict
+from math import ceil, sqrt
+
 from rest_framework.reverse import reverse as api_reverse
 
-from django.db import models
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models, transaction, IntegrityError
+from django.conf import settings
+from django.db.models import Count, F, Min, Sum, OuterRef, Subquery, IntegerField
+from django.db.models.functions import Coalesce, Floor
+from django.db.models.signals import m2m_changed, pre_delete, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+from django.utils.crypto import get_random_string
 from django.utils.text import slugify
 
+from authors.settings import WPM
 from authors.apps.authentication.models import User
 from authors.apps.core.models import TimeStampedModel
 
 
+def count_words(text):
+    """Counts the words of a text to estimate how long it takes to read"""
+    return len(re.sub('[^A-Za-z0-9]+', ' ', text).split())
+
+
 class ArticlesModel(models.Model):
     """ This class defines the model for creating articles"""
     slug = models.SlugField(db_index=True, max_length=1000, unique=True, blank=True)
@@ -18,8 +36,9 @@ class ArticlesModel(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, auto_now=False)
     updated_at = models.DateTimeField(auto_now=True, auto_now_add=False)
     author = models.ForeignKey(User, related_name='article', on_delete=models.CASCADE)
-    likes = models.ManyToManyField(User, blank=True, related_name='LikesDislikes.user+')
-    dislikes = models.ManyToManyField(User, blank=True, related_name='LikesDislikes.user+')
+    # Set from the body on save, reading_time is in minutes
+    word_count = models.PositiveIntegerField(default=0)
+    reading_time = models.PositiveIntegerField(default=0)
 
     def __str__(self):
         return self.title
@@ -27,26 +46,198 @@ class ArticlesModel(models.Model):
     def api_url(self,request=None):
         return api_reverse("articles:article-details",kwargs={'slug':self.slug},request=request)
 
-    def create_title_slug(self):
-        """This method automatically slugs the title before saving"""
-        slug = slugify(self.title)
-        new_slug = slug
-        n = 1
-        while ArticlesModel.objects.filter(slug=new_slug).exists():
-            new_slug = '{}-{}'.format(slug, n)
-            n += 1
+    # Tries at inserting an article whose slug was taken meanwhile
+    SLUG_ATTEMPTS = 3
 
-        return new_slug
+    def create_title_slug(self, random_suffix=False):
+        """
+        This method automatically slugs the title before saving, a taken
+        slug gets the next suffix after the highest one used, e.g title-3
+        """
+        slug = slugify(self.title)
+        if random_suffix:
+            return '{}-{}'.format(slug, get_random_string(8, 'abcdefghijklmnopqrstuvwxyz0123456789'))
+        # slugs only have letters, digits, _ and -, which match themselves
+        taken = ArticlesModel.objects.filter(
+            slug__regex=r'^{}(-[0-9]+)?$'.format(slug)).values_list('slug', flat=True)
+        suffixes = [int(taken_slug[len(slug) + 1:] or 0) for taken_slug in taken]
+        if not suffixes:
+            return slug
+        return '{}-{}'.format(slug, max(suffixes) + 1)
+
+    def insert(self, *args, **kwargs):
+        """Inserts the article and its counters together"""
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            ArticleCounters.objects.create(article=self)
+
+    def insert_with_free_slug(self, *args, **kwargs):
+        """
+        Inserts the article, picking its slug again when another one has
+        taken it since, with a random suffix if that keeps happening
+        """
+        for attempt in range(self.SLUG_ATTEMPTS):
+            try:
+                return self.insert(*args, **kwargs)
+            except IntegrityError:
+                # other constraints failing again would not help
+                if attempt == self.SLUG_ATTEMPTS - 1 or not ArticlesModel.objects.filter(slug=self.slug).exists():
+                    raise
+                self.slug = self.create_title_slug(random_suffix=attempt > 0)
+
+    def update_reading_time(self, words_per_minute=WPM):
+        """This method counts the words of the body and the minutes to read them"""
+        self.word_count = count_words(self.body)
+        self.reading_time = ceil(self.word_count / words_per_minute)
+
+    @property
+    def time_to_read(self):
+        if self.reading_time == 1:
+            return "1 min"
+        return "{} mins".format(self.reading_time)
 
     def save(self, *args, **kwargs):
-        """This method ensures that the article is saved with a slug"""
-        if not self.slug:
+        """This method ensures that the article is saved with a slug and reading time"""
+        generated_slug = not self.slug
+        if generated_slug:
             self.slug = self.create_title_slug()
-        super().save(*args, **kwargs)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'body' in update_fields:
+            self.update_reading_time()
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | {'word_count', 'reading_time'}
+        if not self._state.adding:
+            super().save(*args, **kwargs)
+        elif generated_slug:
+            self.insert_with_free_slug(*args, **kwargs)
+        else:
+            self.insert(*args, **kwargs)
+
+    def get_counters(self):
+        """This method returns the article counters, or empty ones if missing"""
+        try:
+            return self.counters
+        except ArticleCounters.DoesNotExist:
+            return ArticleCounters(article=self)
 
     class Meta:
         ordering = ['-created_at']
-   
+        indexes = [
+            # keyset pagination walks (created_at, id)
+            models.Index(fields=['created_at', 'id'], name='article_created_id_idx'),
+        ]
+
+
+class ArticleCountersManager(models.Manager):
+    """Manager for keeping the denormalized article counters up to date"""
+
+    def bump(self, article, **deltas):
+        """
+        Atomically adds the given deltas to an article's counters
+        e.g bump(article, likes=1, dislikes=-1)
+        """
+        return self.filter(article=article).update(
+            **{field: F(field) + delta for field, delta in deltas.items()})
+
+    def compute(self, article_ids):
+        """
+        Recomputes the counters of the given articles from the source tables,
+        one grouped query per counter, and returns them unsaved
+        """
+        def grouped(queryset, field, aggregate):
+            return dict(queryset.filter(**{field + '__in': article_ids})
+                        .order_by().values_list(field).annotate(aggregate))
+
+        likes = grouped(LikesDislikes.objects.filter(likes=True), 'article_id', Count('id'))
+        dislikes = grouped(LikesDislikes.objects.filter(likes=False), 'article_id', Count('id'))
+        rating_sums = grouped(Rating.objects, 'article_id', Sum('rating'))
+        rating_counts = grouped(Rating.objects, 'article_id', Count('id'))
+        comments = grouped(Comment.objects, 'article_id', Count('id'))
+        views = grouped(ArticleStat.objects, 'article_id', Count('id'))
+        favourites = grouped(Favourite.objects, 'article_id', Count('id'))
+        histogram = {
+            (article_id, self.model.rating_bucket(bucket)): total
+            for article_id, bucket, total in Rating.objects.filter(article_id__in=article_ids)
+            .order_by().annotate(bucket=Floor('rating'))
+            .values_list('article_id', 'bucket').annotate(Count('id'))
+        }
+
+        return {
+            article_id: self.model(
+                article_id=article_id,
+                likes=likes.get(article_id, 0),
+                dislikes=dislikes.get(article_id, 0),
+                rating_sum=rating_sums.get(article_id, 0),
+                rating_count=rating_counts.get(article_id, 0),
+                comments=comments.get(article_id, 0),
+                views=views.get(article_id, 0),
+                favourites=favourites.get(article_id, 0),
+                **{field: histogram.get((article_id, field), 0)
+                   for field in self.model.HISTOGRAM_FIELDS}
+            ) for article_id in article_ids
+        }
+
+
+class ArticleCounters(models.Model):
+    """
+    Model for the per-article counters, updated in the same transaction as
+    the likes, ratings, comments, views and favourites they count so that
+    reads never have to aggregate the source tables
+    """
+    # How many ratings have each whole number of stars, from RATING_MIN to RATING_MAX
+    HISTOGRAM_FIELDS = ('rating_0', 'rating_1', 'rating_2', 'rating_3', 'rating_4', 'rating_5')
+    COUNTER_FIELDS = ('likes', 'dislikes', 'rating_sum', 'rating_count',
+                      'comments', 'views', 'favourites') + HISTOGRAM_FIELDS
+
+    article = models.OneToOneField(
+        ArticlesModel, primary_key=True, related_name='counters', on_delete=models.CASCADE)
+    likes = models.PositiveIntegerField(default=0)
+    dislikes = models.PositiveIntegerField(default=0)
+    rating_sum = models.FloatField(default=0)
+    rating_count = models.PositiveIntegerField(default=0)
+    comments = models.PositiveIntegerField(default=0)
+    views = models.PositiveIntegerField(default=0)
+    favourites = models.PositiveIntegerField(default=0)
+    rating_0 = models.PositiveIntegerField(default=0)
+    rating_1 = models.PositiveIntegerField(default=0)
+    rating_2 = models.PositiveIntegerField(default=0)
+    rating_3 = models.PositiveIntegerField(default=0)
+    rating_4 = models.PositiveIntegerField(default=0)
+    rating_5 = models.PositiveIntegerField(default=0)
+
+    objects = ArticleCountersManager()
+
+    @staticmethod
+    def rating_bucket(rating):
+        """Returns the histogram field a rating is counted in, e.g 3.5 in rating_3"""
+        return 'rating_{}'.format(min(int(rating), 5))
+
+    @classmethod
+    def rating_deltas(cls, previous, current):
+        """
+        Returns the counter deltas of a rating change for bump(), previous
+        or current being None when the rating is created or deleted
+        """
+        deltas = {
+            'rating_sum': (current or 0) - (previous or 0),
+            'rating_count': (current is not None) - (previous is not None),
+        }
+        for rating, delta in ((previous, -1), (current, 1)):
+            if rating is not None:
+                bucket = cls.rating_bucket(rating)
+                deltas[bucket] = deltas.get(bucket, 0) + delta
+        return deltas
+
+    @property
+    def avg_rating(self):
+        if not self.rating_count:
+            return None
+        return self.rating_sum / self.rating_count
+
+    @property
+    def rating_histogram(self):
+        return OrderedDict((field[len('rating_'):], getattr(self, field)) for field in self.HISTOGRAM_FIELDS)
+
 
 class ArticleStat(models.Model):
     """
@@ -54,18 +245,196 @@ class ArticleStat(models.Model):
     """
     user = models.ForeignKey(User, related_name="article_views", on_delete=models.CASCADE)
     article = models.ForeignKey(ArticlesModel, related_name="article_views", on_delete=models.CASCADE)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            # trending scores scan the recent views
+            models.Index(fields=['created_at', 'article'], name='article_stat_created_idx'),
+        ]
+
+
+class TrendingScore(models.Model):
+    """
+    Model for the trending score of an article, the time-decayed weight of
+    its recent engagement, rewritten by the compute_trending command
+    """
+    article = models.OneToOneField(
+        ArticlesModel, primary_key=True, related_name='trending', on_delete=models.CASCADE)
+    score = models.FloatField()
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-score', 'article'], name='trending_score_idx'),
+        ]
+
+
+class ArticleDailyStats(models.Model):
+    """
+    Model for the events of an article on one day, rolled up from the raw
+    views, comments, likes, favourites and ratings by the
+    compact_article_stats command (see rollups.py)
+    """
+    FIELDS = ('views', 'unique_viewers', 'comments', 'likes', 'favourites', 'ratings', 'rating_sum')
+
+    article = models.ForeignKey(ArticlesModel, related_name='daily_stats', on_delete=models.CASCADE)
+    # Copied from the article, so an author's statistics are one range scan
+    author = models.ForeignKey(User, related_name='+', on_delete=models.CASCADE)
+    day = models.DateField(db_index=True)
+    views = models.PositiveIntegerField(default=0)
+    unique_viewers = models.PositiveIntegerField(default=0)
+    comments = models.PositiveIntegerField(default=0)
+    likes = models.PositiveIntegerField(default=0)
+    favourites = models.PositiveIntegerField(default=0)
+    ratings = models.PositiveIntegerField(default=0)
+    rating_sum = models.FloatField(default=0)
+
+    class Meta:
+        unique_together = ('article', 'day')
+        indexes = [
+            models.Index(fields=['author', 'day'], name='daily_stats_author_day_idx'),
+        ]
+
+
+class RelatedArticleManager(models.Manager):
+    """
+    Manager for the related articles index, each article keeping its
+    RELATED_SIZE most similar articles. Similarity is the Jaccard index of
+    the tags of two articles plus RELATED_FAVOURITE_WEIGHT times the cosine
+    similarity of the readers who favourited them, both symmetric.
+    """
+
+    def similarities(self, article_id):
+        """
+        Returns the similarity of an article with every article sharing a
+        tag or a favouriter with it, from grouped queries on the tag links
+        and favourites
+        """
+        links = ArticlesModel.tags.through.objects.order_by()
+        tag_ids = links.filter(articlesmodel_id=article_id).values('tags_id')
+        shared_tags = dict(links.filter(tags_id__in=tag_ids).exclude(articlesmodel_id=article_id)
+                           .values_list('articlesmodel_id').annotate(Count('id')))
+        favouriters = Favourite.objects.filter(article_id=article_id).values('user_id')
+        shared_favouriters = dict(Favourite.objects.filter(user_id__in=favouriters).exclude(article_id=article_id)
+                                  .order_by().values_list('article_id').annotate(Count('id')))
+        candidates = set(shared_tags) | set(shared_favouriters)
+        if not candidates:
+            return {}
+
+        tag_counts = dict(links.filter(articlesmodel_id__in=candidates | {article_id})
+                          .values_list('articlesmodel_id').annotate(Count('id')))
+        favourite_counts = dict(Favourite.objects.filter(article_id__in=candidates | {article_id})
+                                .order_by().values_list('article_id').annotate(Count('id')))
+        weight = settings.RELATED_FAVOURITE_WEIGHT
+        similarities = {}
+        for candidate in candidates:
+            shared = shared_tags.get(candidate, 0)
+            union = tag_counts.get(article_id, 0) + tag_counts.get(candidate, 0) - shared
+            score = shared / union if union else 0
+            favourites = favourite_counts.get(article_id, 0) * favourite_counts.get(candidate, 0)
+            if favourites:
+                score += weight * shared_favouriters.get(candidate, 0) / sqrt(favourites)
+            similarities[candidate] = score
+        return similarities
+
+    def rebuild(self, article_id):
+        """
+        Replaces an article's related articles, unless they are the same,
+        and returns all its similarities and whether the list changed
+        """
+        similarities = self.similarities(article_id)
+        best = sorted(similarities.items(), key=lambda item: (-item[1], item[0]))[:settings.RELATED_SIZE]
+        current = self.filter(article_id=article_id).order_by('-score', 'related_id')
+        if list(current.values_list('related_id', 'score')) == best:
+            return similarities, False
+        with transaction.atomic():
+            current.delete()
+            self.bulk_create([
+                self.model(article_id=article_id, related_id=related_id, score=score)
+                for related_id, score in best
+            ])
+        return similarities, True
+
+    def refresh(self, article_id):
+        """
+        Rebuilds the related articles of an article, and of the articles
+        whose lists it left or may now enter, and returns the ids of the
+        articles whose lists changed
+        """
+        similarities, changed = self.rebuild(article_id)
+        changed = {article_id} if changed else set()
+        # the lists holding the article may lose it, the others may gain it
+        listed = set(self.filter(related_id=article_id).values_list('article_id', flat=True))
+        lists = {
+            neighbour: (size, lowest) for neighbour, size, lowest in
+            self.filter(article_id__in=similarities).order_by().values('article_id')
+            .annotate(size=Count('id'), lowest=Min('score')).values_list('article_id', 'size', 'lowest')
+        }
+        for neighbour, score in similarities.items():
+            size, lowest = lists.get(neighbour, (0, None))
+            if size < settings.RELATED_SIZE or score > lowest:
+                listed.add(neighbour)
+        listed.discard(article_id)
+        return changed | {neighbour for neighbour in listed if self.rebuild(neighbour)[1]}
+
+
+class RelatedArticle(models.Model):
+    """
+    Model for an article related to another, with their similarity, kept
+    by RelatedArticle.objects
+    """
+    article = models.ForeignKey(ArticlesModel, related_name='related_articles', on_delete=models.CASCADE)
+    related = models.ForeignKey(ArticlesModel, related_name='+', on_delete=models.CASCADE)
+    score = models.FloatField()
+
+    objects = RelatedArticleManager()
+
+    class Meta:
+        unique_together = ('article', 'related')
+        indexes = [
+            # the related articles of an article are read best first
+            models.Index(fields=['article', '-score'], name='related_article_score_idx'),
+        ]
+
+
+class CommentQuerySet(models.QuerySet):
+
+    def subtree(self, comment, max_depth=None, since=None):
+        """
+        Returns the replies under a comment, depth first, in one range
+        query on the path, optionally only max_depth levels down or those
+        created after since
+        """
+        if not comment.path:
+            # every path starts with the empty one
+            raise ValueError('Comment {} has no path yet'.format(comment.pk))
+        queryset = self.filter(article_id=comment.article_id, path__startswith=comment.path).exclude(pk=comment.pk)
+        if max_depth is not None:
+            queryset = queryset.filter(depth__lte=comment.depth + max_depth)
+        if since is not None:
+            queryset = queryset.filter(created_at__gt=since)
+        return queryset.order_by('path')
+
 
 class Comment(models.Model):
     """
-    Model for comments
+    Model for comments, each with the materialized path of the comments
+    above it so a whole thread is one range query
     """
+    # Ids are zero padded so paths sort in thread order
+    PATH_STEP = '{:010d}/'
+    PATH_LENGTH = 1000
+    # The deepest reply whose path still fits, the top level being depth 0
+    MAX_DEPTH = PATH_LENGTH // len(PATH_STEP.format(0)) - 1
 
     body = models.CharField(max_length=2000)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     author = models.ForeignKey(User, related_name='comments', on_delete=models.CASCADE)
     article = models.ForeignKey(ArticlesModel, related_name='comments', on_delete=models.CASCADE)
-    comment_likes = models.ManyToManyField(User, blank=True, related_name='LikeComment')
+    # Kept up to date by CommentLike.objects
+    like_count = models.PositiveIntegerField(default=0)
     parent = models.ForeignKey(
         'self',
         null=True,
@@ -73,12 +442,38 @@ class Comment(models.Model):
         related_name='threads',
         on_delete=models.CASCADE
     )
+    path = models.CharField(max_length=PATH_LENGTH, db_index=True, blank=True, editable=False)
+    depth = models.PositiveSmallIntegerField(default=0, editable=False)
+
+    objects = CommentQuerySet.as_manager()
 
     def __str__(self):
        return self.body
 
+    def save(self, *args, **kwargs):
+        """
+        This method sets the path of a new comment once it has an id, in the
+        same transaction as the insert so no comment is left without one
+        """
+        creating = self._state.adding
+        if not creating:
+            return super().save(*args, **kwargs)
+        if self.parent_id:
+            self.depth = self.parent.depth + 1
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            parent_path = self.parent.path if self.parent_id else ''
+            self.path = parent_path + self.PATH_STEP.format(self.pk)
+            Comment.objects.filter(pk=self.pk).update(path=self.path)
+
     class Meta:
         ordering = ('-created_at',)
+        indexes = [
+            # top level comments of an article are paged on (created_at, id)
+            models.Index(fields=['article', 'parent', 'created_at', 'id'], name='comment_article_page_idx'),
+            # trending scores scan the recent comments
+            models.Index(fields=['created_at', 'article'], name='comment_created_idx'),
+        ]
 
 class Highlighted(TimeStampedModel):
     author = models.ForeignKey(User, related_name='highlights', on_delete=models.CASCADE)
@@ -91,6 +486,7 @@ class Rating(models.Model):
     user = models.ForeignKey(User, related_name='rating', on_delete=models.CASCADE)
     article = models.ForeignKey(ArticlesModel, related_name='rating', on_delete=models.CASCADE)
     rating = models.FloatField(null=False)
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
 
 
 class Favourite(TimeStampedModel):
@@ -100,19 +496,184 @@ class Favourite(TimeStampedModel):
 
     class Meta:
         ordering = ('created_at',)
+        indexes = [
+            # comment notifications look up who favourited an article
+            models.Index(fields=['article', 'user'], name='favourite_article_user_idx'),
+            # a reader's favourites are paged on (created_at, id)
+            models.Index(fields=['user', 'created_at', 'id'], name='favourite_user_page_idx'),
+            # trending scores scan the recent favourites
+            models.Index(fields=['created_at', 'article'], name='favourite_created_idx'),
+        ]
+
+
+class ArticleSearchTerm(models.Model):
+    """
+    A posting of the inverted index used to search articles on databases
+    without full-text search, the weight adds up the occurrences of the
+    term weighted by the field they are in (see search.py)
+    """
+    term = models.CharField(max_length=64)
+    article = models.ForeignKey(ArticlesModel, related_name='search_terms', on_delete=models.CASCADE)
+    weight = models.PositiveIntegerField()
+
+    class Meta:
+        unique_together = ('term', 'article')
+        indexes = [
+            # the postings of a common term are capped to its heaviest ones
+            models.Index(fields=['term', '-weight'], name='search_term_weight_idx'),
+        ]
+
+
+class ArticleSearchVector(models.Model):
+    """
+    The weighted tsvector of an article, searched through a GIN index
+    when the database is PostgreSQL (see search.py)
+    """
+    article = models.OneToOneField(
+        ArticlesModel, primary_key=True, related_name='search_vector', on_delete=models.CASCADE)
+    vector = SearchVectorField(null=True)
+
+
+class TagsManager(models.Manager):
+    """Manager for looking up the tags of an article at once"""
+
+    def resolve(self, names):
+        """
+        Returns the tags with the given (slugged) names in order, creating
+        the missing ones, in one query when they all exist
+        """
+        names = list(dict.fromkeys(names))
+        found = {tag.tag: tag for tag in self.filter(tag__in=names)}
+        missing = [name for name in names if name not in found]
+        if missing:
+            # another article may be adding the same tags, the unique
+            # index keeps one of each and both read them back
+            self.bulk_create([self.model(tag=name) for name in missing], ignore_conflicts=True)
+            found.update((tag.tag, tag) for tag in self.filter(tag__in=missing))
+        return [found[name] for name in names]
+
+    def recount(self, tag_ids=None):
+        """Recomputes how many articles have the given tags, or every tag"""
+        articles = (ArticlesModel.tags.through.objects.filter(tags_id=OuterRef('pk'))
+                    .order_by().values('tags_id').annotate(total=Count('id')).values('total'))
+        tags = self.all() if tag_ids is None else self.filter(id__in=list(tag_ids))
+        return tags.update(article_count=Coalesce(Subquery(articles, output_field=IntegerField()), 0))
 
 
 class Tags(models.Model):
-    tag = models.CharField(max_length=120)
+    # Stored slugged, so the same tag written differently is one row
+    tag = models.CharField(max_length=120, unique=True)
+    # Kept up to date by the receivers below
+    article_count = models.PositiveIntegerField(default=0)
+
+    objects = TagsManager()
 
     def __str__(self):
         return self.tag
 
+    class Meta:
+        indexes = [
+            # the tag listing is ordered by popularity
+            models.Index(fields=['-article_count', 'tag'], name='tag_popularity_idx'),
+        ]
+
+
+@receiver(m2m_changed, sender=ArticlesModel.tags.through)
+def count_tag_articles(sender, instance, action, reverse, pk_set, **kwargs):
+    """Recounts the articles of the tags added to or removed from articles"""
+    if reverse:
+        if action.startswith('post_'):
+            Tags.objects.recount([instance.pk])
+    elif action == 'pre_clear':
+        instance._cleared_tag_ids = list(instance.tags.values_list('id', flat=True))
+    elif action == 'post_clear':
+        Tags.objects.recount(instance.__dict__.pop('_cleared_tag_ids', []))
+    elif action in ('post_add', 'post_remove') and pk_set:
+        Tags.objects.recount(pk_set)
+
+
+@receiver(pre_delete, sender=ArticlesModel)
+def remember_deleted_article_tags(sender, instance, **kwargs):
+    # the tag links are gone by post_delete
+    instance._deleted_tag_ids = list(instance.tags.values_list('id', flat=True))
+
+
+@receiver(post_delete, sender=ArticlesModel)
+def count_deleted_article_tags(sender, instance, **kwargs):
+    tag_ids = instance.__dict__.pop('_deleted_tag_ids', None)
+    if tag_ids:
+        Tags.objects.recount(tag_ids)
+
+
+class ReactionManager(models.Manager):
+    """
+    Manager for reactions stored as one row per user and target with a
+    boolean, e.g liked or disliked. Reactions are set and withdrawn with
+    conditional writes rather than read then written, so requests racing
+    each other can't leave the rows and the counters out of step.
+    Subclasses name the fields and define apply_counts(target, deltas),
+    which applies {reaction: delta} to the counters of a target.
+    """
+    target_field = None
+    user_field = None
+    value_field = None
+
+    def switch(self, lookup, value):
+        """Turns the opposite reaction into this one, returns whether there was one"""
+        return self.filter(**lookup, **{self.value_field: not value}).update(**{self.value_field: value})
+
+    def react(self, target, user, value):
+        """
+        Sets a user's reaction and updates the counters, returns the previous
+        reaction, None when there was none and value when nothing changed
+        """
+        lookup = {self.target_field: target, self.user_field: user}
+        with transaction.atomic():
+            if not self.switch(lookup, value):
+                try:
+                    with transaction.atomic():
+                        self.create(**lookup, **{self.value_field: value})
+                except IntegrityError:
+                    # a racing request reacted first
+                    if not self.switch(lookup, value):
+                        return value
+                else:
+                    self.apply_counts(target, {value: 1})
+                    return None
+            self.apply_counts(target, {value: 1, not value: -1})
+        return not value
+
+    def withdraw(self, target, user):
+        """Deletes a user's reaction and updates the counters, returns it or None"""
+        with transaction.atomic():
+            reaction = self.select_for_update().filter(
+                **{self.target_field: target, self.user_field: user}).first()
+            if reaction is None:
+                return None
+            value = getattr(reaction, self.value_field)
+            reaction.delete()
+            self.apply_counts(target, {value: -1})
+        return value
+
+
+class LikesDislikesManager(ReactionManager):
+    target_field = 'article'
+    user_field = 'reader'
+    value_field = 'likes'
+
+    def apply_counts(self, article, deltas):
+        ArticleCounters.objects.bump(
+            article, **{'likes' if value else 'dislikes': delta for value, delta in deltas.items()})
+
 
 class LikesDislikes(models.Model):
+    """Model for the like (likes=True) or dislike of an article by a reader"""
     article = models.ForeignKey(ArticlesModel, related_name='like' ,on_delete=models.CASCADE)
     reader = models.ForeignKey(User, related_name='like', on_delete=models.CASCADE)
     likes = models.BooleanField()
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    objects = LikesDislikesManager()
 
     class Meta:
         unique_together = ('article', 'reader')
@@ -139,11 +700,25 @@ class CommentHistory(models.Model):
     class Meta:
         ordering = ('created_at',)
 
+class CommentLikeManager(ReactionManager):
+    target_field = 'specific_comment'
+    user_field = 'commentor'
+    value_field = 'comment_likes'
+
+    def apply_counts(self, comment, deltas):
+        # only likes are counted
+        if deltas.get(True):
+            Comment.objects.filter(pk=comment.pk).update(like_count=F('like_count') + deltas[True])
+
+
 class CommentLike(models.Model):
+    """Model for the like (comment_likes=True) or unlike of a comment"""
     specific_comment = models.ForeignKey(Comment,related_name='comment_like', on_delete=models.CASCADE)
     commentor = models.ForeignKey(User, related_name='comment_like', on_delete=models.CASCADE)
     comment_likes = models.BooleanField()
 
+    objects = CommentLikeManager()
+
     class Meta:
         unique_together = ('specific_comment','commentor')
 
@@ -0,0 +1,102 @@
+import threading
+
+from django.db.models.signals import m2m_changed, post_save, post_delete, pre_delete
+from django.dispatch import receiver
+
+from .cache import response_cache
+from authors.apps.notifications.models import NotificationJob
+from .models import ArticlesModel, Favourite, RelatedArticle
+
+
+def related_articles(article):
+    """
+    Returns the articles related to an article, best first, in one query
+    on the (article, score) index
+    """
+    related = (RelatedArticle.objects.filter(article=article).order_by('-score')
+               .values_list('related__slug', 'related__title', 'related__description', 'score'))
+    return [{'slug': slug, 'title': title, 'description': description, 'score': round(score, 4)}
+            for slug, title, description, score in related]
+
+
+# the articles being deleted in this thread, whose favourites go with them
+deleting = threading.local()
+
+
+def invalidate_details(article_ids):
+    slugs = ArticlesModel.objects.filter(id__in=article_ids).values_list('slug', flat=True)
+    if slugs:
+        response_cache.invalidate(*['article:' + slug for slug in slugs])
+
+
+def refresh_related(article_ids):
+    """
+    Queues refreshing the related articles of the given articles, and of
+    their neighbours, for the process_notifications worker
+    """
+    article_ids = set(article_ids)
+    queued = set(NotificationJob.objects.filter(
+        kind=NotificationJob.RELATED, status=NotificationJob.PENDING, article_id__in=article_ids
+    ).values_list('article_id', flat=True))
+    NotificationJob.objects.bulk_create([
+        NotificationJob(kind=NotificationJob.RELATED, article_id=article_id)
+        for article_id in article_ids - queued
+    ])
+
+
+def refresh_lists(article_id):
+    """Refreshes the related articles of an article and its neighbours, and the cached details"""
+    invalidate_details(RelatedArticle.objects.refresh(article_id))
+
+
+@receiver(post_save, sender=ArticlesModel)
+def invalidate_neighbours(sender, instance, created, update_fields=None, **kwargs):
+    """The details of the articles listing this one show its slug, title and description"""
+    if created or (update_fields is not None and not {'slug', 'title', 'description'} & set(update_fields)):
+        return
+    slugs = RelatedArticle.objects.filter(related=instance).values_list('article__slug', flat=True)
+    if slugs:
+        response_cache.invalidate(*['article:' + slug for slug in slugs])
+
+
+@receiver(m2m_changed, sender=ArticlesModel.tags.through)
+def refresh_tagged(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action.startswith('post_'):
+            refresh_related([instance.pk])
+    elif action == 'pre_clear':
+        instance._cleared_article_ids = list(instance.articles.values_list('id', flat=True))
+    elif action == 'post_clear':
+        refresh_related(instance.__dict__.pop('_cleared_article_ids', []))
+    elif action.startswith('post_') and pk_set:
+        refresh_related(pk_set)
+
+
+@receiver(post_save, sender=Favourite)
+def refresh_favourited(sender, instance, created, **kwargs):
+    if created:
+        refresh_related([instance.article_id])
+
+
+@receiver(post_delete, sender=Favourite)
+def refresh_unfavourited(sender, instance, **kwargs):
+    if instance.article_id not in getattr(deleting, 'article_ids', ()):
+        refresh_related([instance.article_id])
+
+
+@receiver(pre_delete, sender=ArticlesModel)
+def remember_related_lists(sender, instance, **kwargs):
+    if not hasattr(deleting, 'article_ids'):
+        deleting.article_ids = set()
+    deleting.article_ids.add(instance.pk)
+    # the entries for the article are deleted with it
+    instance._related_list_ids = list(
+        RelatedArticle.objects.filter(related=instance).values_list('article_id', flat=True))
+
+
+@receiver(post_delete, sender=ArticlesModel)
+def refill_related_lists(sender, instance, **kwargs):
+    deleting.article_ids.discard(instance.pk)
+    # other articles deleted at once are already gone
+    refresh_related(ArticlesModel.objects.filter(
+        id__in=instance.__dict__.pop('_related_list_ids', [])).values_list('id', flat=True))
@@ -1,5 +1,6 @@
 import re
 from rest_framework import serializers
+from rest_framework.relations import ManyRelatedField, MANY_RELATION_KWARGS
 from django.utils.text import slugify
 
 from authors.apps.articles.models import Tags
@@ -17,12 +18,36 @@ class TagsRelation(serializers.RelatedField):
     def to_representation(self, value):
         return value.tag
 
-    def to_internal_value(self, data):
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        """Lists of tags are resolved together by TagsListRelation"""
+        list_kwargs = {'child_relation': cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return TagsListRelation(**list_kwargs)
+
+    def normalize(self, data):
         # Ensures tags with CAPS and spaces are saved as slugs
         # Capitalize characters and small letter characters are saved as one
-        if not re.match(r'^[a-zA-Z0-9][ A-Za-z0-9_-]*$', data):
+        if not isinstance(data, str) or not re.match(r'^[a-zA-Z0-9][ A-Za-z0-9_-]*$', data):
             raise serializers.ValidationError('Tag cannot have special characters')
-        new_tag = slugify(data)
-        tag, created = Tags.objects.get_or_create(tag=new_tag)
-        return tag
+        return slugify(data)
+
+    def to_internal_value(self, data):
+        return Tags.objects.resolve([self.normalize(data)])[0]
+
+
+class TagsListRelation(ManyRelatedField):
+    """
+    Validates every tag of an article and then looks them all up, and
+    creates the missing ones, with one query each
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail('empty')
+        return Tags.objects.resolve([self.child_relation.normalize(item) for item in data])
 
@@ -0,0 +1,112 @@
+from collections import OrderedDict, defaultdict
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Count, Max, Min, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import ArticlesModel, ArticleDailyStats
+from .trending import event_sources
+
+# What is rolled up from each kind of event
+AGGREGATES = {
+    'views': lambda: {'views': Count('id'), 'unique_viewers': Count('user', distinct=True)},
+    'likes': lambda: {'likes': Count('id')},
+    'ratings': lambda: {'ratings': Count('id'), 'rating_sum': Sum('rating')},
+    'comments': lambda: {'comments': Count('id')},
+    'favourites': lambda: {'favourites': Count('id')},
+}
+
+
+def day_start(day):
+    """Returns when a day starts in the current time zone"""
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def count_events(start, end, by_day=False, author=None):
+    """
+    Counts the events between start and end with one grouped query per kind
+    of event, by article and, if by_day, by day. Returns the counts by
+    article id or (article id, day).
+    """
+    counts = defaultdict(lambda: dict.fromkeys(ArticleDailyStats.FIELDS, 0))
+    for kind, events in event_sources().items():
+        events = events.filter(created_at__gte=start, created_at__lt=end).order_by()
+        if author is not None:
+            events = events.filter(article__author=author)
+        group_by = ['article_id']
+        if by_day:
+            events = events.annotate(day=TruncDate('created_at'))
+            group_by.append('day')
+        for row in events.values(*group_by).annotate(**AGGREGATES[kind]()):
+            key = (row['article_id'], row['day']) if by_day else row['article_id']
+            counts[key].update((field, row[field] or 0) for field in AGGREGATES[kind]())
+    return counts
+
+
+def compact(day):
+    """Replaces the rollups of a day with the day's events, returns how many articles had any"""
+    counts = count_events(day_start(day), day_start(day + timedelta(days=1)))
+    authors = dict(ArticlesModel.objects.filter(id__in=counts).values_list('id', 'author_id'))
+    with transaction.atomic():
+        ArticleDailyStats.objects.filter(day=day).delete()
+        ArticleDailyStats.objects.bulk_create([
+            ArticleDailyStats(article_id=article_id, author_id=authors[article_id], day=day, **fields)
+            for article_id, fields in counts.items() if article_id in authors
+        ])
+    return len(counts)
+
+
+def last_compacted_day():
+    return ArticleDailyStats.objects.aggregate(day=Max('day'))['day']
+
+
+def first_uncompacted_day():
+    """
+    Returns the day after the last day with rollups, or the day of the
+    first event. Days without any events leave no rows, so they are
+    compacted again until a later day has some.
+    """
+    last = last_compacted_day()
+    if last is not None:
+        return last + timedelta(days=1)
+    firsts = [events.aggregate(first=Min('created_at'))['first'] for events in event_sources().values()]
+    firsts = [first for first in firsts if first is not None]
+    return timezone.localdate(min(firsts)) if firsts else None
+
+
+def author_stats(author, since, until):
+    """
+    Returns the totals, the series by day and the totals by article of an
+    author's articles from since to until, both included.
+
+    Compacted days are read from the rollups, the days after the last
+    compaction (usually only today) are counted from the raw events.
+    """
+    series = OrderedDict((since + timedelta(days=offset), dict.fromkeys(ArticleDailyStats.FIELDS, 0))
+                         for offset in range((until - since).days + 1))
+    by_article = defaultdict(lambda: dict.fromkeys(ArticleDailyStats.FIELDS, 0))
+    sums = {field: Sum(field) for field in ArticleDailyStats.FIELDS}
+
+    last = last_compacted_day()
+    if last is not None and last >= since:
+        rollups = ArticleDailyStats.objects.filter(author=author, day__gte=since, day__lte=min(until, last))
+        for row in rollups.order_by().values('day').annotate(**sums):
+            series[row['day']].update((field, row[field]) for field in ArticleDailyStats.FIELDS)
+        for row in rollups.order_by().values('article_id').annotate(**sums):
+            by_article[row['article_id']].update((field, row[field]) for field in ArticleDailyStats.FIELDS)
+
+    tail = since if last is None or last < since else last + timedelta(days=1)
+    if tail <= until:
+        # a single day, as usual, needs no grouping by day
+        by_day = tail < until
+        live = count_events(day_start(tail), day_start(until + timedelta(days=1)), by_day=by_day, author=author)
+        for key, fields in live.items():
+            article_id, day = key if by_day else (key, tail)
+            for field, value in fields.items():
+                series[day][field] += value
+                by_article[article_id][field] += value
+
+    totals = {field: sum(day[field] for day in series.values()) for field in ArticleDailyStats.FIELDS}
+    return totals, series, by_article
@@ -0,0 +1,262 @@
+"""
+Full-text search of the articles.
+
+Articles are indexed on every save and whenever their tags change, once
+for a save and the tag changes made with it inside index_once(), and their
+index rows are deleted with them. There are two backends:
+
+PostgresSearchBackend keeps a weighted tsvector of each article behind a
+GIN index and ranks the matches with ts_rank.
+
+PostingsSearchBackend keeps an inverted index of (term, article, weight)
+postings and ranks the matches by tf-idf in SQL. It works on any
+database, so it is the one the tests run on SQLite. Only the postings of
+the articles holding the query's rarest term are ranked, and for a term
+that common only the SEARCH_MAX_CANDIDATES articles it weighs the most
+in, so a query of common words does not rank most of the articles.
+
+Both only match articles that contain every term of the query, found
+through an index rather than by scanning the articles.
+"""
+import math
+import re
+import threading
+from collections import Counter
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import caches
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connection, transaction
+from django.db.models import (Case, Count, ExpressionWrapper, F, FloatField, OuterRef,
+                              Subquery, Sum, TextField, Value, When, prefetch_related_objects)
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .models import ArticlesModel, ArticleSearchTerm, ArticleSearchVector
+
+TOKEN = re.compile(r'[a-z0-9]+')
+MAX_TERM_LENGTH = 64
+STOP_WORDS = frozenset((
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'has', 'in',
+    'is', 'it', 'its', 'of', 'on', 'or', 'that', 'the', 'this', 'to', 'was',
+    'were', 'will', 'with',
+))
+# How much an occurrence counts, by the field it is in
+FIELD_WEIGHTS = {'title': 4, 'tags': 3, 'description': 2, 'body': 1}
+DOCUMENT_COUNT_KEY = 'search:document_count'
+
+
+def tokenize(text):
+    """Splits text into lowercase search terms, dropping stop words"""
+    return [token[:MAX_TERM_LENGTH] for token in TOKEN.findall(text.lower())
+            if token not in STOP_WORDS]
+
+
+def document(article, tags=None):
+    """Returns the searchable text of the article by field, given its tag names if known"""
+    if tags is None:
+        tags = [tag.tag for tag in article.tags.all()]
+    return {
+        'title': article.title,
+        'tags': ' '.join(tags),
+        'description': article.description,
+        'body': article.body,
+    }
+
+
+def drop_document_count():
+    """
+    Drops the cached article count, and again once the transaction commits
+    as a process counting before then would cache the old count
+    """
+    cache = caches[settings.SEARCH_CACHE]
+    cache.delete(DOCUMENT_COUNT_KEY)
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: cache.delete(DOCUMENT_COUNT_KEY))
+
+
+def document_count():
+    """
+    Returns how many articles there are, for the term weights, cached in
+    SEARCH_CACHE for SEARCH_COUNT_TTL seconds and dropped when an article is
+    added or deleted, so processes sharing that cache weigh terms alike
+    """
+    return caches[settings.SEARCH_CACHE].get_or_set(
+        DOCUMENT_COUNT_KEY, ArticlesModel.objects.count, settings.SEARCH_COUNT_TTL)
+
+
+# the articles to index when the index_once() block of this thread ends
+deferred = threading.local()
+
+
+@contextmanager
+def index_once():
+    """
+    Indexes the articles saved or retagged inside the block once, when it
+    ends, rather than on each save and tag change
+    """
+    if getattr(deferred, 'articles', None) is not None:
+        yield
+        return
+    deferred.articles = {}
+    try:
+        yield
+        articles = list(deferred.articles.values())
+    finally:
+        deferred.articles = None
+    if articles:
+        index(articles)
+
+
+def index(articles):
+    """Indexes the articles now, or when the index_once() block ends"""
+    if getattr(deferred, 'articles', None) is None:
+        get_backend().index_many(articles)
+    else:
+        deferred.articles.update((article.pk, article) for article in articles)
+
+
+class PostingsSearchBackend:
+    """Searches an inverted index of the article terms"""
+
+    def postings(self, article, tags=None):
+        weights = Counter()
+        for field, text in document(article, tags).items():
+            for term in tokenize(text):
+                weights[term] += FIELD_WEIGHTS[field]
+        return [ArticleSearchTerm(term=term, article_id=article.id, weight=weight)
+                for term, weight in weights.items()]
+
+    def index(self, article):
+        self.index_many([article])
+
+    def index_many(self, articles, tags=None):
+        """
+        Replaces the postings of the articles, in one delete and one insert,
+        tags maps the article ids to their tag names when they are known
+        """
+        if tags is None:
+            prefetch_related_objects(articles, 'tags')
+            tags = {}
+        postings = [posting for article in articles for posting in self.postings(article, tags.get(article.id))]
+        with transaction.atomic():
+            ArticleSearchTerm.objects.filter(article__in=[article.id for article in articles]).delete()
+            ArticleSearchTerm.objects.bulk_create(postings)
+
+    def search(self, queryset, text):
+        terms = list(dict.fromkeys(tokenize(text)))
+        if not terms:
+            return queryset.none()
+        postings = ArticleSearchTerm.objects.filter(term__in=terms)
+        frequencies = dict(postings.order_by().values_list('term').annotate(Count('id')))
+        if len(frequencies) < len(terms):
+            # a term no article contains, so no article contains them all
+            return queryset.none()
+
+        rarest = min(frequencies, key=frequencies.get)
+        if frequencies[rarest] > settings.SEARCH_MAX_CANDIDATES:
+            candidates = (ArticleSearchTerm.objects.filter(term=rarest).order_by('-weight')
+                          .values('article_id')[:settings.SEARCH_MAX_CANDIDATES])
+            postings = postings.filter(article_id__in=candidates)
+        elif len(terms) > 1:
+            postings = postings.filter(
+                article_id__in=ArticleSearchTerm.objects.filter(term=rarest).values('article_id'))
+
+        total = document_count()
+        score = Sum(Case(*[
+            When(term=term, then=ExpressionWrapper(
+                F('weight') * Value(math.log(1 + total / frequency)), output_field=FloatField()))
+            for term, frequency in frequencies.items()
+        ], output_field=FloatField()))
+        ranked = (postings.order_by().values('article_id')
+                  .annotate(matched=Count('id'), score=score).filter(matched=len(terms)))
+        return (queryset.filter(id__in=ranked.values('article_id'))
+                .annotate(search_rank=Subquery(
+                    ranked.filter(article_id=OuterRef('pk')).values('score'), output_field=FloatField()))
+                .order_by('-search_rank', '-id'))
+
+
+class PostgresSearchBackend:
+    """Searches the articles' tsvectors through a GIN index"""
+    config = 'english'
+    # ts_rank weighs A the most and D the least
+    FIELD_LABELS = {'title': 'A', 'tags': 'B', 'description': 'C', 'body': 'D'}
+
+    def vector(self, article, tags=None):
+        fields = document(article, tags).items()
+        vectors = [SearchVector(Value(text, output_field=TextField()),
+                                weight=self.FIELD_LABELS[field], config=self.config)
+                   for field, text in fields]
+        vector = vectors[0]
+        for other in vectors[1:]:
+            vector = vector + other
+        return vector
+
+    def index(self, article):
+        ArticleSearchVector.objects.update_or_create(
+            article_id=article.id, defaults={'vector': self.vector(article)})
+
+    def index_many(self, articles, tags=None):
+        """Replaces the vectors of the articles, in one delete and one insert"""
+        if tags is None:
+            prefetch_related_objects(articles, 'tags')
+            tags = {}
+        with transaction.atomic():
+            ArticleSearchVector.objects.filter(article__in=[article.id for article in articles]).delete()
+            ArticleSearchVector.objects.bulk_create([
+                ArticleSearchVector(article_id=article.id, vector=self.vector(article, tags.get(article.id)))
+                for article in articles
+            ])
+
+    def search(self, queryset, text):
+        terms = tokenize(text)
+        if not terms:
+            return queryset.none()
+        # plain queries AND the terms together, as the postings backend does
+        query = SearchQuery(' '.join(terms), config=self.config)
+        return (queryset.filter(search_vector__vector=query)
+                .annotate(search_rank=SearchRank(F('search_vector__vector'), query))
+                .order_by('-search_rank', '-id'))
+
+
+BACKENDS = {
+    'postgres': PostgresSearchBackend,
+    'postings': PostingsSearchBackend,
+}
+
+
+def get_backend():
+    """Returns the SEARCH_BACKEND, or the best one for the database"""
+    name = settings.SEARCH_BACKEND
+    if not name:
+        name = 'postgres' if connection.vendor == 'postgresql' else 'postings'
+    return BACKENDS[name]()
+
+
+@receiver(post_save, sender=ArticlesModel)
+def index_article(sender, instance=None, raw=False, **kwargs):
+    """Reindexes an article whenever it is saved"""
+    if not raw:
+        index([instance])
+
+
+@receiver(post_save, sender=ArticlesModel)
+@receiver(post_delete, sender=ArticlesModel)
+def count_articles_again(sender, created=True, **kwargs):
+    """Drops the cached article count when articles are added or deleted"""
+    if created:
+        drop_document_count()
+
+
+@receiver(m2m_changed, sender=ArticlesModel.tags.through)
+def index_article_tags(sender, instance=None, action=None, reverse=False, pk_set=None, **kwargs):
+    """Reindexes the articles whose tags changed"""
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if reverse:
+        articles = list(ArticlesModel.objects.filter(pk__in=pk_set or ()))
+    else:
+        articles = [instance]
+    if articles:
+        index(articles)
@@ -1,15 +1,30 @@
 from rest_framework import serializers
-from django.db.models import Avg
+from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
+from django.utils.functional import cached_property
 
 from authors import settings
-from authors.apps.articles.helpers import get_time_to_read_article
-from authors.apps.profiles.models import Profile
+from authors.apps.articles.helpers import prefetch_article_list, prefetch_comment_threads
 from rest_framework.validators import UniqueTogetherValidator
 from .models import ArticlesModel, Rating, Comment, Favourite, Tags, LikesDislikes, CommentLike, CommentHistory, \
-    ReportArticles, ArticleStat, Highlighted
+    ReportArticles, Highlighted, ArticleDailyStats
 from authors.apps.profiles.serializers import ProfileListSerializer
 from authors.apps.articles.relations import TagsRelation
+from .search import index_once
+
+
+class ArticlesListSerializer(serializers.ListSerializer):
+    """
+    Serializes many articles at once, loading the counts and the reader's
+    own state for the whole list up front instead of once per row
+    """
+
+    def to_representation(self, data):
+        articles = list(data.all() if isinstance(data, models.Manager) else data)
+        if articles:
+            request = self.context.get('request')
+            prefetch_article_list(articles, getattr(request, 'user', None), self.context.get('fields'))
+        return super(ArticlesListSerializer, self).to_representation(articles)
 
 
 class ArticlesSerializers(serializers.ModelSerializer):
@@ -47,6 +62,8 @@ class ArticlesSerializers(serializers.ModelSerializer):
     favourited = serializers.SerializerMethodField()
 
     def get_favourited(self, obj):
+        if hasattr(obj, 'is_favourited'):
+            return obj.is_favourited
         try:
             favourite = Favourite.objects.get(
                 user=self.context["request"].user.id, article=obj.id)
@@ -57,6 +74,8 @@ class ArticlesSerializers(serializers.ModelSerializer):
     like_status = serializers.SerializerMethodField()
 
     def get_like_status(self, obj):
+        if hasattr(obj, 'reaction'):
+            return {True: 'liked', False: 'disliked'}.get(obj.reaction)
         try:
             like_dislike_entry = LikesDislikes.objects.values_list(
                 'likes', flat=True).filter(
@@ -74,79 +93,135 @@ class ArticlesSerializers(serializers.ModelSerializer):
     author = serializers.SerializerMethodField(read_only=True)
     rating = serializers.SerializerMethodField()
 
-    likes_count = serializers.IntegerField(
-        read_only=True,
-        source="likes.count"
-    )
+    likes_count = serializers.SerializerMethodField()
 
-    dislikes_count = serializers.IntegerField(
-        read_only=True,
-        source="dislikes.count"
-    )
+    dislikes_count = serializers.SerializerMethodField()
+
+    def get_likes_count(self, obj):
+        return obj.get_counters().likes
+
+    def get_dislikes_count(self, obj):
+        return obj.get_counters().dislikes
 
     def get_author(self, obj):
         """This method gets the profile object for the article"""
-        serializer = ProfileListSerializer(
-            instance=Profile.objects.get(user=obj.author))
-        return serializer.data
+        return self.profile_serializer.to_representation(obj.author.profile)
+
+    @cached_property
+    def profile_serializer(self):
+        """One profile serializer for every article, building its fields is costly"""
+        return ProfileListSerializer()
 
     def get_rating(self, obj):
         """This method gets and returns the rating for the article"""
 
         # Get average rating
-        avg_rating = Rating.objects.filter(
-            article=obj.id).aggregate(Avg('rating'))
+        avg_rating = obj.get_counters().avg_rating
 
         # Check that this user is authenticated in order to include their rating,
         # if not, we return the default rating
         user = self.context["request"].user
         if user.is_authenticated:
-            try:
-                rating = Rating.objects.get(user=user, article=obj.id).rating
-            except Rating.DoesNotExist:
-                rating = None
+            if hasattr(obj, 'user_rating'):
+                rating = obj.user_rating
+            else:
+                try:
+                    rating = Rating.objects.get(user=user, article=obj.id).rating
+                except Rating.DoesNotExist:
+                    rating = None
 
             return {
-                'avg_rating': avg_rating['rating__avg'],
+                'avg_rating': avg_rating,
                 'rating': rating
             }
 
         return {
-            'avg_rating': avg_rating['rating__avg']
+            'avg_rating': avg_rating
         }
 
+    # Fields left out of ?view=summary lists
+    SUMMARY_EXCLUDE = ('body', 'facebook', 'Linkedin', 'twitter', 'mail')
+    # Columns only needed by some fields, deferred when they are left out
+    FIELD_COLUMNS = {
+        'title': ('title',),
+        'description': ('description',),
+        'body': ('body',),
+        'image_url': ('image_url',),
+        'updated_at': ('updated_at',),
+        'time_to_read': ('reading_time',),
+    }
+
+    @classmethod
+    def requested_fields(cls, query_params):
+        """
+        Returns the fields picked with ?fields=title,slug or ?view=summary,
+        or None when all of them are wanted
+        """
+        all_fields = set(cls.Meta.fields) | {'time_to_read'}
+        if query_params.get('fields'):
+            fields = {field.strip() for field in query_params['fields'].split(',') if field.strip()}
+            unknown = fields - all_fields
+            if unknown:
+                raise serializers.ValidationError(
+                    {'fields': ['Unknown field(s): {}'.format(', '.join(sorted(unknown)))]})
+            return fields
+        if query_params.get('view') == 'summary':
+            return all_fields - set(cls.SUMMARY_EXCLUDE)
+        return None
+
+    @classmethod
+    def deferred_columns(cls, fields):
+        """Returns the article columns none of the fields need"""
+        if fields is None:
+            return []
+        return [column for field, columns in cls.FIELD_COLUMNS.items()
+                if field not in fields for column in columns]
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Leaving the fields out skips their methods as well
+        fields = self.context.get('fields')
+        if fields is not None:
+            for name in list(self.fields):
+                if name not in fields:
+                    self.fields.pop(name)
+
     def to_representation(self, instance):
         """
         overide representatiom for custom output
         """
         representation = super(ArticlesSerializers,
                                self).to_representation(instance)
-        representation['time_to_read'] = get_time_to_read_article(instance)
+        fields = self.context.get('fields')
+        if fields is None or 'time_to_read' in fields:
+            # Stored on save, so the body isn't needed here
+            representation['time_to_read'] = instance.time_to_read
         return representation
 
+    def article_url(self, obj):
+        """Reverses the article url once, the share links are built from it"""
+        if not hasattr(obj, 'absolute_url'):
+            obj.absolute_url = obj.api_url(request=self.context.get("request"))
+        return obj.absolute_url
+
     def get_url(self, obj):
-        request = self.context.get("request")
-        return obj.api_url(request=request)
+        return self.article_url(obj)
 
     def get_facebook(self, obj):
-        request = self.context.get("request")
-        return 'http://www.facebook.com/sharer.php?u=' + obj.api_url(request=request)
+        return 'http://www.facebook.com/sharer.php?u=' + self.article_url(obj)
 
     def get_Linkedin(self, obj):
-        request = self.context.get("request")
-        return 'http://www.linkedin.com/shareArticle?mini=true&amp;url=' + obj.api_url(request=request)
+        return 'http://www.linkedin.com/shareArticle?mini=true&amp;url=' + self.article_url(obj)
 
     def get_twitter(self, obj):
-        request = self.context.get("request")
-        return 'https://twitter.com/share?url=' + obj.api_url(request=request) + '&amp;text=Amazing Read'
+        return 'https://twitter.com/share?url=' + self.article_url(obj) + '&amp;text=Amazing Read'
 
     def get_mail(self, obj):
-        request = self.context.get("request")
-        return 'mailto:?subject=New Article Alert&body={}'.format(
-            obj.api_url(request=request))
+        return 'mailto:?subject=New Article Alert&body={}'.format(self.article_url(obj))
 
     class Meta:
         model = ArticlesModel
+        list_serializer_class = ArticlesListSerializer
         fields = (
             'title',
             'description',
@@ -172,22 +247,25 @@ class ArticlesSerializers(serializers.ModelSerializer):
     def create(self, validated_data):
         """This method creates an article instance object and adds tags to it"""
         tags = validated_data.pop('tags', [])
-        # creates an article instance
-        article = ArticlesModel.objects.create(**validated_data)
-        # Adds tags to the article instance
-        for tag in tags:
-            article.tags.add(tag)
+        # the article is indexed once, with its tags
+        with index_once():
+            # creates an article instance
+            article = ArticlesModel.objects.create(**validated_data)
+            # Adds tags to the article instance
+            article.tags.add(*tags)
         # returns the article object
         return article
 
+    def update(self, instance, validated_data):
+        """Saves the article and sets its tags, reindexing it once"""
+        with index_once():
+            return super().update(instance, validated_data)
+
 
 class TagSerializers(serializers.ModelSerializer):
     class Meta:
         model = Tags
-        fields = ('tag',)
-
-    def to_representation(self, instance):
-        return instance.tag
+        fields = ('tag', 'article_count')
 
 
 class FavouriteSerializer(serializers.ModelSerializer):
@@ -205,6 +283,21 @@ class FavouriteSerializer(serializers.ModelSerializer):
         ]
 
 
+class FavouritesListSerializer(serializers.ListSerializer):
+    """
+    Serializes many favourites at once, loading what their articles need
+    for the whole list up front as ArticlesListSerializer does
+    """
+
+    def to_representation(self, data):
+        favourites = list(data.all() if isinstance(data, models.Manager) else data)
+        if favourites:
+            request = self.context.get('request')
+            prefetch_article_list([favourite.article for favourite in favourites],
+                                  getattr(request, 'user', None), self.context.get('fields'))
+        return super(FavouritesListSerializer, self).to_representation(favourites)
+
+
 class FavouriteListSerializer(serializers.ModelSerializer):
     """Class to serialise favorite articles"""
 
@@ -215,35 +308,83 @@ class FavouriteListSerializer(serializers.ModelSerializer):
 
         representation = super(FavouriteListSerializer,
                                self).to_representation(instance)
-        serializer = ArticlesSerializers(instance.article, context=self.context)
         representation.update({
-            'article': serializer.data
+            'article': self.article_serializer.to_representation(instance.article)
         })
 
         return representation
 
+    @cached_property
+    def article_serializer(self):
+        """One article serializer for every favourite"""
+        return ArticlesSerializers(context=self.context)
+
     class Meta:
         model = Favourite
+        list_serializer_class = FavouritesListSerializer
         fields = ('article',)
 
 
 class ArticleStatSerializer(serializers.ModelSerializer):
     """
-    Serializer class for reading stats
+    Serializer class for reading stats, the lifetime counts along with the
+    events in the period asked for, which the view passes in the context
+    as 'periods' by article id
     """
     slug = serializers.SlugField(read_only=True)
     view_count = serializers.SerializerMethodField()
     comment_count = serializers.SerializerMethodField()
+    period = serializers.SerializerMethodField()
 
     def get_comment_count(self, value):
-        return Comment.objects.filter(article=value).count()
+        return value.get_counters().comments
 
     def get_view_count(self, value):
-        return ArticleStat.objects.filter(article=value).count()
+        return value.get_counters().views
+
+    def get_period(self, value):
+        periods = self.context.get('periods', {})
+        if value.id in periods:
+            return periods[value.id]
+        return dict.fromkeys(ArticleDailyStats.FIELDS, 0)
 
     class Meta:
         model = ArticlesModel
-        fields = ['slug', 'title', 'view_count', 'comment_count']
+        fields = ['slug', 'title', 'view_count', 'comment_count', 'period']
+
+
+class ArticleImportSerializer(serializers.Serializer):
+    """
+    Validates a line of an article import (see bulk.py). The tags are only
+    normalized, the importer looks up the tags and authors of a whole
+    chunk at once.
+    """
+    slug = serializers.SlugField(required=False, max_length=1000)
+    title = serializers.CharField(max_length=1000)
+    description = serializers.CharField(required=False, max_length=2000)
+    body = serializers.CharField()
+    image_url = serializers.URLField(required=False, allow_null=True)
+    tags = serializers.ListField(child=serializers.CharField(), required=False)
+    author = serializers.CharField(required=False, max_length=255)
+    created_at = serializers.DateTimeField(required=False)
+
+    def validate_tags(self, value):
+        normalize = TagsRelation().normalize
+        return list(dict.fromkeys(normalize(tag) for tag in value))
+
+
+class CommentsListSerializer(serializers.ListSerializer):
+    """
+    Serializes a page of comments with their replies, loading the whole
+    page up front instead of once per comment and reply
+    """
+
+    def to_representation(self, data):
+        comments = list(data.all() if isinstance(data, models.Manager) else data)
+        if comments:
+            request = self.context.get('request')
+            prefetch_comment_threads(comments, getattr(request, 'user', None))
+        return super(CommentsListSerializer, self).to_representation(comments)
 
 
 class CommentsSerializers(serializers.ModelSerializer):
@@ -257,12 +398,21 @@ class CommentsSerializers(serializers.ModelSerializer):
 
     like_status = serializers.SerializerMethodField()
 
+    def validate_parent(self, parent):
+        """Rejects replies nested deeper than a comment path can hold"""
+        if parent is not None and parent.depth >= Comment.MAX_DEPTH:
+            raise serializers.ValidationError(
+                'Replies cannot be nested more than {} levels deep.'.format(Comment.MAX_DEPTH))
+        return parent
+
     def get_like_status(self, obj):
+        if hasattr(obj, 'is_liked'):
+            return obj.is_liked
         try:
             like_dislike_entry = CommentLike.objects.get(
                 commentor=self.context["request"].user.id, specific_comment=obj.id
             )
-            return True
+            return like_dislike_entry.comment_likes
         except:
             return False
 
@@ -280,37 +430,53 @@ class CommentsSerializers(serializers.ModelSerializer):
 
     def get_author(self, obj):
         """This method gets the profile object for the article"""
-        serializer = ProfileListSerializer(
-            instance=Profile.objects.get(user=obj.author))
-        return serializer.data
+        return self.profile_serializer.to_representation(obj.author.profile)
+
+    @cached_property
+    def profile_serializer(self):
+        """One profile serializer for every comment and reply"""
+        return ProfileListSerializer()
 
     def format_date(self, date):
         return date.strftime('%d %b %Y %H:%M:%S')
 
+    @staticmethod
+    def like_count(comment):
+        return comment.like_count
+
+    @staticmethod
+    def reply_count(comment):
+        if hasattr(comment, 'reply_total'):
+            return comment.reply_total
+        return comment.threads.count()
+
     def to_representation(self, instance):
         """
        overide representation for custom output
        """
+        # Lists load the replies up front, see prefetch_comment_threads
+        replies = getattr(instance, 'thread_list', None)
+        if replies is None:
+            replies = instance.threads.select_related('author__profile')
         threads = [
             {
 
                 'id': thread.id,
                 'body': thread.body,
-                'author': ProfileListSerializer(
-                    instance=Profile.objects.get(user=thread.author)).data,
+                'author': self.get_author(thread),
                 'created_at': self.format_date(thread.created_at),
-                'replies': thread.threads.count(),
-                'comment_like_count': thread.comment_likes.count(),
+                'replies': self.reply_count(thread),
+                'comment_like_count': self.like_count(thread),
                 'updated_at': self.format_date(thread.updated_at)
-            } for thread in instance.threads.all()
+            } for thread in replies
         ]
 
         representation = super(CommentsSerializers, self).to_representation(instance)
         representation['created_at'] = self.format_date(instance.created_at)
         representation['updated_at'] = self.format_date(instance.updated_at)
-        representation['comment_like_count'] = instance.comment_likes.count()
+        representation['comment_like_count'] = self.like_count(instance)
         representation['article'] = instance.article.title
-        representation['reply_count'] = instance.threads.count()
+        representation['reply_count'] = self.reply_count(instance)
         representation['threads'] = threads
         del representation['parent']
 
@@ -318,6 +484,7 @@ class CommentsSerializers(serializers.ModelSerializer):
 
     class Meta:
         model = Comment
+        list_serializer_class = CommentsListSerializer
         fields = (
             'id',
             'body',
@@ -331,6 +498,27 @@ class CommentsSerializers(serializers.ModelSerializer):
         )
 
 
+class CommentTreeSerializer(serializers.ModelSerializer):
+    """
+    Serializes the replies of a thread flat, in thread order, with the
+    parent and depth of each to nest them by
+    """
+    author = serializers.SerializerMethodField()
+    created_at = serializers.DateTimeField(format='%d %b %Y %H:%M:%S', read_only=True)
+    updated_at = serializers.DateTimeField(format='%d %b %Y %H:%M:%S', read_only=True)
+
+    def get_author(self, obj):
+        return self.profile_serializer.to_representation(obj.author.profile)
+
+    @cached_property
+    def profile_serializer(self):
+        return ProfileListSerializer()
+
+    class Meta:
+        model = Comment
+        fields = ('id', 'body', 'parent', 'depth', 'author', 'created_at', 'updated_at')
+
+
 class RatingSerializer(serializers.ModelSerializer):
     rating = serializers.FloatField(
         required=True,
@@ -355,9 +543,7 @@ class RatingSerializer(serializers.ModelSerializer):
     article = serializers.SerializerMethodField()
 
     def get_avg_rating(self, obj):
-        avg = Rating.objects.filter(
-            article=obj.article.id).aggregate(Avg('rating'))
-        return avg['rating__avg']
+        return obj.article.get_counters().avg_rating
 
     def get_article(self, obj):
         return obj.article.slug
@@ -376,6 +562,7 @@ class LikesDislikesSerializer(serializers.ModelSerializer):
     class Meta:
         model = LikesDislikes
         fields = '__all__'
+        read_only_fields = ('created_at',)
         validators = [
             UniqueTogetherValidator(
                 queryset=LikesDislikes.objects.all(),
@@ -0,0 +1,170 @@
+import atexit
+import fcntl
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from authors.apps.authentication.models import User
+from .models import ArticlesModel, ArticleStat, ArticleCounters
+
+logger = logging.getLogger(__name__)
+
+
+class ArticleViewBuffer:
+    """
+    Collects article views off the request path and writes them in bulk.
+
+    Views are kept in memory, or appended to a local spool file when
+    ARTICLE_VIEWS_SPOOL is set so that any process can flush them, and are
+    written with one bulk insert plus one counter update per article by a
+    background thread, every ARTICLE_VIEWS_FLUSH_INTERVAL seconds or as soon
+    as ARTICLE_VIEWS_BUFFER_SIZE views are pending. Without the thread
+    (ARTICLE_VIEWS_FLUSH_THREAD off) they wait for the flush_article_views
+    command. Repeat views of an article by the same user within
+    ARTICLE_VIEWS_DEDUPE_WINDOW seconds are only counted once per process.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pending = []
+        self.buffered = 0
+        self.seen = {}
+        self.due = threading.Event()
+        self.flusher = None
+
+    def record(self, article_id, user_id):
+        """Buffers a view and flushes if a threshold has been reached"""
+        now = time.time()
+        key = (article_id, user_id)
+        with self.lock:
+            last_seen = self.seen.get(key)
+            if last_seen is not None and now - last_seen < settings.ARTICLE_VIEWS_DEDUPE_WINDOW:
+                return False
+            self.seen[key] = now
+            spool = settings.ARTICLE_VIEWS_SPOOL
+            if spool:
+                self.append_to_spool(spool, '{} {} {}\n'.format(article_id, user_id, now))
+            else:
+                self.pending.append((article_id, user_id, now))
+            self.buffered += 1
+            if self.buffered >= settings.ARTICLE_VIEWS_BUFFER_SIZE:
+                self.due.set()
+            self.start_flusher()
+        return True
+
+    def start_flusher(self):
+        """Starts the thread flushing the views of this process, unless it runs"""
+        if settings.ARTICLE_VIEWS_FLUSH_THREAD and (self.flusher is None or not self.flusher.is_alive()):
+            self.flusher = threading.Thread(target=self.run_flusher, name='article-view-flusher', daemon=True)
+            self.flusher.start()
+
+    def run_flusher(self):
+        while True:
+            self.due.wait(settings.ARTICLE_VIEWS_FLUSH_INTERVAL)
+            try:
+                self.flush()
+            except Exception:
+                logger.exception('Flushing article views failed')
+            finally:
+                connection.close()
+
+    def flush(self):
+        """Writes every buffered view to the database and returns how many there were"""
+        with self.lock:
+            events, self.pending = self.pending, []
+            self.buffered = 0
+            self.due.clear()
+            events.extend(self.read_spool())
+            self.forget_expired()
+        # articles or readers deleted since they were viewed would fail the
+        # foreign keys of the whole batch
+        events = self.existing(events)
+        if not events:
+            return 0
+
+        try:
+            with transaction.atomic():
+                ArticleStat.objects.bulk_create([
+                    ArticleStat(
+                        article_id=article_id,
+                        user_id=user_id,
+                        created_at=datetime.fromtimestamp(viewed_at, timezone.utc)
+                    ) for article_id, user_id, viewed_at in events
+                ], batch_size=500)
+                views = Counter(article_id for article_id, _, _ in events)
+                for article_id, count in views.items():
+                    ArticleCounters.objects.bump(article_id, views=count)
+        except Exception:
+            # a batch put back would fail every later flush the same way
+            logger.exception('Dropped %s article view(s) that could not be written', len(events))
+            return 0
+        return len(events)
+
+    def existing(self, events):
+        """Returns the views whose article and reader still exist"""
+        article_ids = set(ArticlesModel.objects.filter(
+            id__in={article_id for article_id, _, _ in events}).values_list('id', flat=True))
+        user_ids = set(User.objects.filter(
+            id__in={user_id for _, user_id, _ in events}).values_list('id', flat=True))
+        return [event for event in events if event[0] in article_ids and event[1] in user_ids]
+
+    def open_spool(self, spool, mode):
+        """
+        Opens the spool file holding its exclusive lock. A file renamed by a
+        flush while waiting for the lock is given up for the new one, so no
+        view is appended after the flush has read the file.
+        """
+        while True:
+            spool_file = open(spool, mode)
+            fcntl.flock(spool_file, fcntl.LOCK_EX)
+            try:
+                if os.fstat(spool_file.fileno()).st_ino == os.stat(spool).st_ino:
+                    return spool_file
+            except FileNotFoundError:
+                pass
+            spool_file.close()
+
+    def append_to_spool(self, spool, line):
+        with self.open_spool(spool, 'a') as spool_file:
+            spool_file.write(line)
+
+    def read_spool(self):
+        """Takes over the spool file, if any, and returns the views in it"""
+        spool = settings.ARTICLE_VIEWS_SPOOL
+        if not spool or not os.path.exists(spool):
+            return []
+        claimed = '{}.{}.flushing'.format(spool, os.getpid())
+        # renamed under the lock, appends waiting for it then reopen the spool
+        with self.open_spool(spool, 'a') as spool_file:
+            os.rename(spool, claimed)
+        with open(claimed) as spool_file:
+            events = []
+            for line in spool_file:
+                article_id, user_id, viewed_at = line.split()
+                events.append((int(article_id), int(user_id), float(viewed_at)))
+        os.remove(claimed)
+        return events
+
+    def forget_expired(self):
+        """Drops dedupe entries older than the window so memory stays bounded"""
+        cutoff = time.time() - settings.ARTICLE_VIEWS_DEDUPE_WINDOW
+        self.seen = {key: seen for key, seen in self.seen.items() if seen >= cutoff}
+
+    def reset(self):
+        """Discards buffered views and dedupe state without writing them"""
+        with self.lock:
+            self.pending = []
+            self.buffered = 0
+            self.seen = {}
+            self.due.clear()
+
+
+view_buffer = ArticleViewBuffer()
+atexit.register(view_buffer.flush)
@@ -1,14 +1,25 @@
 from rest_framework.test import APITestCase, APIClient
 from rest_framework.reverse import reverse as API_Reverse
+from django.test import override_settings
 from django.urls import reverse
 
 from authors.apps.authentication.token import generate_token
+from authors.apps.articles.stats import view_buffer
+from authors.apps.articles.cache import response_cache
+from authors.apps.authentication.backends import token_cache
 
 
+# a flusher thread would write the views on its own connection, which
+# can't see the rows of the test's transaction
+@override_settings(ARTICLE_VIEWS_FLUSH_THREAD=False)
 class BaseTest(APITestCase):
     """This class provides a base for other tests"""
 
     def setUp(self):
+        view_buffer.reset()
+        self.addCleanup(view_buffer.reset)
+        token_cache.clear()
+        response_cache.cache.clear()
         self.url = API_Reverse('articles:articles')
         self.client = APIClient()
         self.unauthorised_client = APIClient()
@@ -0,0 +1,54 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.reverse import reverse as API_Reverse
+
+from .base_tests import BaseTest
+
+
+class ArticleFieldsTest(BaseTest):
+    """
+    Tests for picking the article fields of list responses
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.token = self.create_and_login_user()
+        self.slug = self.create_article(token=self.token)
+
+    def test_only_the_requested_fields_are_returned(self):
+        response = self.client.get(self.url, {'fields': 'title,slug,time_to_read'})
+        self.assertEqual(set(response.data['results'][0]), {'title', 'slug', 'time_to_read'})
+
+    def test_unneeded_columns_and_lookups_are_skipped(self):
+        self.client.logout()
+        self.client.credentials()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, {'fields': 'slug'})
+        self.assertEqual(response.data['results'][0], {'slug': self.slug})
+        # the count and the page, no tags, profiles or counters
+        self.assertEqual(len(queries), 2)
+        page = queries.captured_queries[-1]['sql']
+        for column in ('"body"', '"description"', '"reading_time"'):
+            self.assertNotIn(column, page)
+
+    def test_summary_leaves_out_the_body_and_share_links(self):
+        response = self.client.get(self.url, {'view': 'summary'})
+        article = response.data['results'][0]
+        for field in ('body', 'facebook', 'Linkedin', 'twitter', 'mail'):
+            self.assertNotIn(field, article)
+        self.assertIn(self.slug, article['url'])
+
+    def test_share_links_are_built_from_the_article_url(self):
+        article = self.client.get(self.url).data['results'][0]
+        self.assertEqual(article['facebook'], 'http://www.facebook.com/sharer.php?u=' + article['url'])
+        self.assertTrue(article['mail'].endswith(article['url']))
+
+    def test_unknown_fields_are_rejected(self):
+        response = self.client.get(self.url, {'fields': 'slug,password'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_favourites_can_be_summarised(self):
+        self.client.post(API_Reverse('articles:favourite', {self.slug: 'slug'}))
+        response = self.client.get(API_Reverse('articles:favourite-list'), {'fields': 'slug,favourited'})
+        favourite = response.json()['article']['results'][0]
+        self.assertEqual(favourite['article'], {'slug': self.slug, 'favourited': True})
@@ -0,0 +1,59 @@
+from rest_framework import status
+
+from authors.apps.articles.models import ArticlesModel, ArticleCounters, Rating, Favourite, LikesDislikes, Tags
+from authors.apps.authentication.models import User
+from .base_tests import BaseTest
+
+
+class ArticleListQueriesTest(BaseTest):
+    """
+    Checks that the cost of listing articles does not grow with the page
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.token = self.create_and_login_user()
+        self.author = User.objects.get(email=self.user['user']['email'])
+        self.create_and_login_user(self.user2)
+        self.reader = User.objects.get(email=self.user2['user']['email'])
+
+    def create_articles(self, number):
+        for _ in range(number):
+            article = ArticlesModel.objects.create(
+                title='query count', description='description',
+                body='body', author=self.author)
+            article.tags.add(*Tags.objects.resolve(['counting']))
+            LikesDislikes.objects.react(article, self.reader, True)
+            Rating.objects.create(article=article, user=self.reader, rating=4)
+            Favourite.objects.create(article=article, user=self.reader)
+            ArticleCounters.objects.bump(
+                article, rating_sum=4, rating_count=1, favourites=1)
+
+    def test_anonymous_page_query_count_is_constant(self):
+        """The anonymous list costs the same for one row as for many"""
+        self.client.credentials()
+        self.create_articles(1)
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.create_articles(6)
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url)
+        self.assertEqual(len(response.data['results']), 7)
+
+    def test_authenticated_page_query_count_is_constant(self):
+        """The reader's own rating, favourite and reaction are batched too"""
+        self.create_articles(1)
+        # the first request caches the reader's token, later ones need no query for it
+        self.client.get(self.url)
+        with self.assertNumQueries(6):
+            self.client.get(self.url)
+        self.create_articles(6)
+        with self.assertNumQueries(6):
+            response = self.client.get(self.url)
+        article = response.data['results'][0]
+        self.assertEqual(article['likes_count'], 1)
+        self.assertEqual(article['rating'], {'avg_rating': 4.0, 'rating': 4.0})
+        self.assertTrue(article['favourited'])
+        self.assertEqual(article['like_status'], 'liked')
+        self.assertEqual(article['tags'], ['counting'])
@@ -1,7 +1,6 @@
 from rest_framework import status
 import json
 
-from authors.apps.articles.helpers import get_time_to_read_article
 from authors.apps.articles.tests.base_tests import BaseTest, API_Reverse
 from authors.apps.articles.models import ArticlesModel
 
@@ -29,6 +28,9 @@ class ArticleTests(BaseTest):
         token = self.login_user()
         response = self.client.post(self.url, self.article, format='json', HTTP_AUTHORIZATION=token)
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        article = ArticlesModel.objects.get(slug=response.data['slug'])
+        self.assertEqual(response.data['time_to_read'], '{} min'.format(article.reading_time))
+        self.assertEqual(article.word_count, len(self.article['article']['body'].split()))
 
     def test_create_articles_unauthorized_user(self):
         """This method checks if an unauthorized user cannot create an article"""
@@ -0,0 +1,147 @@
+import json
+import os
+import tempfile
+from datetime import datetime
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.reverse import reverse as API_Reverse
+from rest_framework.test import APIClient
+
+from authors.apps.articles.bulk import ArticleImporter, allocate_slugs, export_articles
+from authors.apps.articles.models import ArticlesModel, Tags
+from authors.apps.articles.search import get_backend
+from authors.apps.authentication.models import User
+from authors.apps.feed.models import TimelineEntry
+from authors.apps.notifications.models import NotificationJob, UserNotifications
+from authors.apps.profiles.models import Follow
+
+
+def lines(*records):
+    return [json.dumps(record) + '\n' for record in records]
+
+
+def article(index, **fields):
+    return dict({'title': 'Imported {}'.format(index), 'description': 'description',
+                 'body': 'one two three', 'tags': ['Bulk', 'import']}, **fields)
+
+
+class BulkArticlesTest(TestCase):
+    """
+    Tests for importing and exporting articles as NDJSON
+    """
+
+    def setUp(self):
+        self.author = User.objects.create_user('author', 'author@test.com', 'password')
+        self.other = User.objects.create_user('other', 'other@test.com', 'password')
+
+    def test_import_creates_articles_as_saving_them_does(self):
+        ArticlesModel.objects.create(title='Imported 0', description='description', body='body',
+                                     author=self.author)
+        importer = ArticleImporter(author=self.author, notify=True)
+        created = importer.run(lines(
+            article(0, created_at='2020-01-02T03:04:05Z'),
+            article(1, author='other', slug='kept-slug'),
+            article(1)))
+        self.assertEqual((created, importer.errors), (3, []))
+
+        imported = ArticlesModel.objects.exclude(slug='imported-0').order_by('id')
+        self.assertEqual([entry.slug for entry in imported], ['imported-0-1', 'kept-slug', 'imported-1'])
+        first = imported[0]
+        self.assertEqual(first.created_at, datetime(2020, 1, 2, 3, 4, 5, tzinfo=timezone.utc))
+        self.assertEqual((first.word_count, first.reading_time), (3, 1))
+        self.assertEqual(first.get_counters().views, 0)
+        self.assertTrue(hasattr(first, 'counters'))
+        self.assertEqual(imported[1].author, self.other)
+        self.assertEqual(sorted(first.tags.values_list('tag', flat=True)), ['bulk', 'import'])
+        self.assertEqual(Tags.objects.get(tag='bulk').article_count, 3)
+        self.assertEqual(set(get_backend().search(ArticlesModel.objects.all(), 'imported')),
+                         set(ArticlesModel.objects.all()))
+        self.assertEqual(NotificationJob.objects.filter(kind=NotificationJob.ARTICLE).count(), 4)
+
+    def test_queries_do_not_grow_with_the_articles(self):
+        def count(records):
+            with CaptureQueriesContext(connection) as queries:
+                ArticleImporter(author=self.author, chunk_size=100).run(lines(*records))
+            return len(queries)
+
+        # the first import creates the tags
+        count([article(0)])
+        few = count([article(i) for i in range(1, 4)])
+        many = count([article(i) for i in range(4, 34)])
+        self.assertEqual(few, many)
+        self.assertEqual(ArticlesModel.objects.count(), 34)
+
+    def test_slugs_are_allocated_together(self):
+        for title in ('Taken', 'Taken', 'Taken 5', 'Taken 1'):
+            ArticlesModel.objects.create(title=title, description='description', body='body', author=self.author)
+        with self.assertNumQueries(2):
+            slugs = allocate_slugs(['taken', 'free', 'taken', 'free', 'taken-1'])
+        self.assertEqual(slugs, ['taken-6', 'free', 'taken-7', 'free-1', 'taken-1-2'])
+
+    def test_invalid_lines_are_reported_and_skipped(self):
+        importer = ArticleImporter()
+        created = importer.run(lines(article(0), article(1, author='nobody'), {'title': 'No body'},
+                                     article(3, tags=['no!']), article(4, author='author')) + ['{not json\n'])
+        self.assertEqual(created, 1)
+        self.assertEqual([number for number, errors in importer.errors], [1, 2, 3, 4, 6])
+        self.assertIn('body', importer.errors[2][1])
+        self.assertFalse(NotificationJob.objects.filter(kind=NotificationJob.ARTICLE).exists())
+
+    def test_imports_fill_the_feeds_without_notifying_by_default(self):
+        Follow.objects.create(follower=self.other.profile, followed=self.author.profile)
+        ArticleImporter(author=self.author).run(lines(article(0)))
+        call_command('process_notifications', '--once', '--workers', '1', stdout=StringIO())
+        self.assertEqual(list(TimelineEntry.objects.filter(user=self.other).values_list('article__slug', flat=True)),
+                         ['imported-0'])
+        self.assertFalse(UserNotifications.objects.exists())
+
+    def test_export_reads_back_in(self):
+        ArticleImporter(author=self.author).run(lines(article(0, created_at='2020-01-02T03:04:05Z'), article(1)))
+        path = os.path.join(tempfile.mkdtemp(), 'articles.ndjson')
+        call_command('export_articles', output=path, stderr=StringIO())
+        with open(path) as exported:
+            records = [json.loads(line) for line in exported]
+        self.assertEqual([record['slug'] for record in records], ['imported-0', 'imported-1'])
+        self.assertEqual((records[0]['author'], records[0]['tags'], records[0]['created_at']),
+                         ('author', ['bulk', 'import'], '2020-01-02T03:04:05Z'))
+
+        out = StringIO()
+        call_command('import_articles', path, skip_existing=True, stdout=out, stderr=StringIO())
+        self.assertIn('Imported 0 article(s)', out.getvalue())
+        ArticlesModel.objects.filter(slug='imported-1').delete()
+        call_command('import_articles', path, '--notify', skip_existing=True, stdout=out, stderr=StringIO())
+        self.assertEqual(ArticlesModel.objects.filter(slug='imported-1').count(), 1)
+        self.assertEqual(NotificationJob.objects.filter(kind=NotificationJob.ARTICLE).count(), 1)
+
+    def test_export_streams_a_chunk_at_a_time(self):
+        ArticleImporter(author=self.author).run(lines(*[article(i) for i in range(5)]))
+        exported = export_articles(chunk_size=2)
+        self.assertEqual(json.loads(next(exported))['slug'], 'imported-0')
+        self.assertEqual(len(list(exported)), 4)
+
+    def test_bulk_endpoint_is_for_admins(self):
+        client = APIClient()
+        url = API_Reverse('articles:bulk')
+        body = ''.join(lines(article(0), {'title': 'No body'}))
+        client.force_authenticate(self.author)
+        self.assertEqual(client.post(url, body, content_type='application/x-ndjson').status_code, 403)
+
+        admin = User.objects.create_superuser('admin', 'admin@test.com', 'password')
+        client.force_authenticate(admin)
+        response = client.post(url, body, content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual((response.data['created'], response.data['errors'][0]['line']), (1, 2))
+        self.assertEqual(ArticlesModel.objects.get().author, admin)
+        self.assertFalse(NotificationJob.objects.filter(kind=NotificationJob.ARTICLE).exists())
+        client.post(url + '?notify=true', ''.join(lines(article(1))), content_type='application/x-ndjson')
+        self.assertEqual(NotificationJob.objects.filter(kind=NotificationJob.ARTICLE).count(), 1)
+
+        response = client.get(url, {'author': 'admin'})
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertEqual([json.loads(line)['slug'] for line in b''.join(response.streaming_content).splitlines()],
+                         ['imported-0', 'imported-1'])
@@ -0,0 +1,97 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.db import DatabaseError
+from django.utils import timezone
+from rest_framework.reverse import reverse as API_Reverse
+
+from authors.apps.articles.models import ArticlesModel, Comment, CommentQuerySet
+from authors.apps.authentication.models import User
+from .base_tests import BaseTest
+
+
+class CommentPathTest(BaseTest):
+    """
+    Tests for the materialized comment paths and the thread endpoint
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.token = self.create_and_login_user()
+        self.slug = self.create_article(token=self.token)
+        self.article = ArticlesModel.objects.get(slug=self.slug)
+        self.author = User.objects.get(email=self.user['user']['email'])
+        # root -> a -> a1 -> a1x, root -> b
+        self.root = self.reply(None)
+        self.a = self.reply(self.root)
+        self.a1 = self.reply(self.a)
+        self.a1x = self.reply(self.a1)
+        self.b = self.reply(self.root)
+        self.other = self.reply(None)
+
+    def reply(self, parent):
+        return Comment.objects.create(body='comment', author=self.author, article=self.article, parent=parent)
+
+    def thread(self, comment, **params):
+        url = API_Reverse('articles:comment-thread', {self.slug: 'slug', comment.id: 'id'})
+        return self.client.get(url, params)
+
+    def test_paths_follow_the_tree(self):
+        self.a1x.refresh_from_db()
+        self.assertEqual(self.a1x.depth, 3)
+        self.assertEqual(self.a1x.path, ''.join(
+            Comment.PATH_STEP.format(comment.id) for comment in (self.root, self.a, self.a1, self.a1x)))
+
+    def test_subtree_is_one_query_in_thread_order(self):
+        with self.assertNumQueries(1):
+            replies = list(Comment.objects.subtree(self.root))
+        self.assertEqual(replies, [self.a, self.a1, self.a1x, self.b])
+
+    def test_thread_endpoint_depth_limit(self):
+        response = self.thread(self.root, depth=1)
+        self.assertEqual([reply['id'] for reply in response.data['replies']], [self.a.id, self.b.id])
+        self.assertEqual(response.data['replies'][0]['depth'], 1)
+
+    def test_thread_endpoint_replies_since(self):
+        Comment.objects.filter(id__in=[self.a.id, self.a1.id]).update(
+            created_at=timezone.now() - timedelta(days=2))
+        since = (timezone.now() - timedelta(days=1)).isoformat().replace('+00:00', 'Z')
+        response = self.thread(self.root, since=since)
+        self.assertEqual([reply['id'] for reply in response.data['replies']], [self.a1x.id, self.b.id])
+
+    def test_thread_endpoint_rejects_bad_parameters(self):
+        self.assertEqual(self.thread(self.root, depth='deep').status_code, 400)
+        self.assertEqual(self.thread(self.root, since='yesterday').status_code, 400)
+
+    def test_deleting_a_comment_removes_its_subtree(self):
+        self.a.delete()
+        self.assertEqual(list(Comment.objects.subtree(self.root)), [self.b])
+
+    def test_subtree_stays_in_the_article(self):
+        other_article = ArticlesModel.objects.create(title='Other', body='body', author=self.author)
+        # a path that matches the root's, as a bad import or a manual fix could leave
+        stray = Comment.objects.create(body='comment', author=self.author, article=other_article)
+        Comment.objects.filter(pk=stray.pk).update(path=self.root.path + Comment.PATH_STEP.format(stray.pk))
+        self.assertNotIn(stray, Comment.objects.subtree(self.root))
+
+    def test_subtree_of_a_comment_without_a_path_is_refused(self):
+        with self.assertRaises(ValueError):
+            Comment.objects.subtree(Comment(article=self.article))
+
+    def test_failed_path_update_rolls_back_the_insert(self):
+        count = Comment.objects.count()
+        with mock.patch.object(CommentQuerySet, 'update', side_effect=DatabaseError):
+            with self.assertRaises(DatabaseError):
+                self.reply(self.root)
+        self.assertEqual(Comment.objects.count(), count)
+
+    def test_replies_past_the_deepest_path_are_refused(self):
+        self.assertLessEqual(len(Comment.PATH_STEP.format(0)) * (Comment.MAX_DEPTH + 1), Comment.PATH_LENGTH)
+        Comment.objects.filter(pk=self.a1x.pk).update(depth=Comment.MAX_DEPTH - 1)
+        Comment.objects.filter(pk=self.b.pk).update(depth=Comment.MAX_DEPTH)
+        reply = {'comment': {'body': 'reply'}}
+        for parent, expected in ((self.a1x, 201), (self.b, 400)):
+            url = API_Reverse('articles:comment-details', {self.slug: 'slug', parent.id: 'id'})
+            response = self.client.post(url, reply, format='json')
+            self.assertEqual(response.status_code, expected)
+        self.assertIn('parent', response.data)
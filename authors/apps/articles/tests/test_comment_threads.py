@@ -0,0 +1,59 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.reverse import reverse as API_Reverse
+
+from authors.apps.articles.models import ArticlesModel, Comment, CommentLike
+from authors.apps.authentication.models import User
+from .base_tests import BaseTest
+
+
+class CommentThreadsTest(BaseTest):
+    """
+    Tests for loading a page of comment threads in a fixed number of queries
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.token = self.create_and_login_user()
+        self.slug = self.create_article(token=self.token)
+        self.url = API_Reverse('articles:comments', {self.slug: 'slug'})
+        self.author = User.objects.get(email=self.user['user']['email'])
+        self.liker = User.objects.create_user('liker', 'liker@test.com', 'password')
+
+    def add_thread(self, replies):
+        article_id = ArticlesModel.objects.get(slug=self.slug).id
+        comment = Comment.objects.create(body='comment', author=self.author, article_id=article_id)
+        CommentLike.objects.react(comment, self.liker, True)
+        for i in range(replies):
+            reply = Comment.objects.create(body='reply', author=self.liker, article_id=article_id, parent=comment)
+            CommentLike.objects.react(reply, self.author, True)
+            Comment.objects.create(body='nested', author=self.author, article_id=article_id, parent=reply)
+        return comment
+
+    def queries_for_page(self):
+        self.client.get(self.url)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries), response.data
+
+    def test_threads_are_serialized_with_counts(self):
+        self.add_thread(replies=2)
+        count, data = self.queries_for_page()
+        comment = data['comments'][0]
+        self.assertEqual(comment['reply_count'], 2)
+        self.assertEqual(comment['comment_like_count'], 1)
+        self.assertEqual(len(comment['threads']), 2)
+        self.assertEqual(comment['threads'][0]['replies'], 1)
+        self.assertEqual(comment['threads'][0]['comment_like_count'], 1)
+        self.assertEqual(comment['threads'][0]['author']['username'], 'liker')
+        self.assertEqual(comment['article'], 'test article')
+
+    def test_query_count_does_not_grow_with_comments(self):
+        self.add_thread(replies=1)
+        few, data = self.queries_for_page()
+        for i in range(4):
+            self.add_thread(replies=5)
+        many, data = self.queries_for_page()
+        self.assertEqual(len(data['comments']), 5)
+        self.assertEqual(few, many)
@@ -0,0 +1,110 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.reverse import reverse as API_Reverse
+
+from authors.apps.articles.models import ArticleCounters, Rating
+from .base_tests import BaseTest
+
+
+class ArticleCountersTest(BaseTest):
+    """
+    Tests for the denormalized article counters
+    """
+
+    def setUp(self):
+        super().setUp()
+        author_token = self.create_and_login_user()
+        self.slug = self.create_article(token=author_token)
+        self.create_and_login_user(self.user2)
+
+    def counters(self):
+        return ArticleCounters.objects.get(article__slug=self.slug)
+
+    def test_counters_created_with_article(self):
+        counters = self.counters()
+        self.assertEqual(counters.likes, 0)
+        self.assertIsNone(counters.avg_rating)
+
+    def test_like_switch_and_delete_update_counters(self):
+        url = API_Reverse('articles:article-like', {self.slug: 'slug'})
+        self.client.post(url, {'likes': True}, format='json')
+        self.assertEqual((self.counters().likes, self.counters().dislikes), (1, 0))
+        self.client.post(url, {'likes': False}, format='json')
+        self.assertEqual((self.counters().likes, self.counters().dislikes), (0, 1))
+        self.client.delete(url)
+        self.assertEqual((self.counters().likes, self.counters().dislikes), (0, 0))
+
+    def test_rating_updates_counters(self):
+        url = API_Reverse('articles:ratings', {self.slug: 'slug'})
+        self.client.post(url, {'rating': {'rating': 4}}, format='json')
+        self.client.post(url, {'rating': {'rating': 2}}, format='json')
+        self.assertEqual(self.counters().rating_count, 1)
+        self.assertEqual(self.counters().avg_rating, 2)
+        self.client.delete(url)
+        self.assertEqual(self.counters().rating_count, 0)
+        self.assertIsNone(self.counters().avg_rating)
+
+    def test_comments_favourites_and_views_update_counters(self):
+        self.client.post(API_Reverse('articles:comments', {self.slug: 'slug'}),
+                         self.comment, format='json')
+        self.client.post(API_Reverse('articles:favourite', {self.slug: 'slug'}))
+        response = self.client.get(API_Reverse('articles:article-details', {self.slug: 'slug'}))
+        call_command('flush_article_views', stdout=StringIO())
+        counters = self.counters()
+        self.assertEqual((counters.comments, counters.favourites, counters.views), (1, 1, 1))
+        self.assertEqual(response.data['likes_count'], 0)
+
+    def test_verify_detects_drift_and_rebuild_fixes_it(self):
+        self.client.post(API_Reverse('articles:comments', {self.slug: 'slug'}),
+                         self.comment, format='json')
+        ArticleCounters.objects.filter(article__slug=self.slug).update(comments=7)
+        with self.assertRaises(CommandError):
+            call_command('rebuild_article_counters', '--verify', stdout=StringIO())
+        call_command('rebuild_article_counters', stdout=StringIO())
+        self.assertEqual(self.counters().comments, 1)
+        call_command('rebuild_article_counters', '--verify', stdout=StringIO())
+
+    def test_rating_histogram_follows_changes(self):
+        url = API_Reverse('articles:ratings', {self.slug: 'slug'})
+        self.client.post(url, {'rating': {'rating': 4}}, format='json')
+        self.assertEqual(self.counters().rating_4, 1)
+        self.client.put(url, {'rating': {'rating': 2.5}}, format='json')
+        counters = self.counters()
+        self.assertEqual((counters.rating_4, counters.rating_2), (0, 1))
+        self.client.delete(url)
+        self.assertEqual(list(self.counters().rating_histogram.values()), [0] * 6)
+
+    def test_rating_readers_use_the_counters(self):
+        url = API_Reverse('articles:ratings', {self.slug: 'slug'})
+        self.client.post(url, {'rating': {'rating': 5}}, format='json')
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as queries:
+            rated = self.client.get(url)
+            anonymous = self.unauthorised_client.get(url)
+            article = self.unauthorised_client.get(API_Reverse('articles:article-details', {self.slug: 'slug'}))
+        self.assertFalse(any('AVG(' in query['sql'] for query in queries.captured_queries))
+        self.assertEqual(rated.data['avg_rating'], 5)
+        self.assertEqual(anonymous.data['avg_rating'], 5)
+        self.assertEqual(anonymous.data['ratings']['5'], 1)
+        self.assertEqual(article.data['rating'], {'avg_rating': 5})
+
+    def test_verify_detects_rating_drift(self):
+        url = API_Reverse('articles:ratings', {self.slug: 'slug'})
+        self.client.post(url, {'rating': {'rating': 3}}, format='json')
+        Rating.objects.update(rating=1)
+        with self.assertRaises(CommandError):
+            call_command('rebuild_article_counters', '--verify', stdout=StringIO())
+        call_command('rebuild_article_counters', stdout=StringIO())
+        counters = self.counters()
+        self.assertEqual((counters.rating_sum, counters.rating_1, counters.rating_3), (1, 1, 0))
+
+    def test_verify_ignores_float_rounding_in_the_rating_sum(self):
+        url = API_Reverse('articles:ratings', {self.slug: 'slug'})
+        self.client.post(url, {'rating': {'rating': 0.1}}, format='json')
+        # summed in another order, the same ratings can differ in the last bit
+        ArticleCounters.objects.filter(article__slug=self.slug).update(rating_sum=0.1 + 1e-12)
+        call_command('rebuild_article_counters', '--verify', stdout=StringIO())
@@ -0,0 +1,123 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.reverse import reverse as API_Reverse
+from rest_framework.test import APIClient
+
+from authors.apps.articles.models import (ArticlesModel, ArticleDailyStats, ArticleStat, Comment,
+                                          LikesDislikes, Rating)
+from authors.apps.articles.rollups import compact, day_start
+from authors.apps.authentication.models import User
+
+
+class DailyStatsTest(TestCase):
+    """
+    Tests for the daily article statistics and the author statistics endpoint
+    """
+
+    def setUp(self):
+        self.today = timezone.localdate()
+        self.author = User.objects.create_user('author', 'author@test.com', 'password')
+        self.readers = [User.objects.create_user('reader{}'.format(i), 'reader{}@test.com'.format(i), 'password')
+                        for i in range(2)]
+        self.first, self.second = [
+            ArticlesModel.objects.create(title=title, description='description', body='body', author=self.author)
+            for title in ('First', 'Second')]
+        self.client = APIClient()
+        self.client.force_authenticate(self.author)
+
+    def at(self, days_ago):
+        return day_start(self.today - timedelta(days=days_ago)) + timedelta(hours=12)
+
+    def view(self, article, reader, days_ago, count=1):
+        ArticleStat.objects.bulk_create([ArticleStat(article=article, user=reader, created_at=self.at(days_ago))
+                                         for i in range(count)])
+
+    def stats(self, **params):
+        return self.client.get(API_Reverse('articles:stats'), params)
+
+    def test_compaction_rolls_up_a_day(self):
+        self.view(self.first, self.readers[0], 1, count=2)
+        self.view(self.first, self.readers[1], 1)
+        self.view(self.first, self.readers[1], 2)
+        Rating.objects.create(article=self.first, user=self.readers[0], rating=4, created_at=self.at(1))
+        Rating.objects.create(article=self.first, user=self.readers[1], rating=2, created_at=self.at(1))
+        LikesDislikes.objects.create(article=self.second, reader=self.readers[0], likes=True, created_at=self.at(1))
+        comment = Comment.objects.create(article=self.second, author=self.readers[1], body='comment')
+        Comment.objects.filter(pk=comment.pk).update(created_at=self.at(1))
+
+        self.assertEqual(compact(self.today - timedelta(days=1)), 2)
+        first = ArticleDailyStats.objects.get(article=self.first)
+        self.assertEqual((first.author, first.views, first.unique_viewers, first.ratings, first.rating_sum),
+                         (self.author, 3, 2, 2, 6))
+        second = ArticleDailyStats.objects.get(article=self.second)
+        self.assertEqual((second.likes, second.comments, second.views), (1, 1, 0))
+
+        # compacting again replaces the day
+        ArticleStat.objects.filter(created_at__lt=self.at(0) - timedelta(hours=12)).delete()
+        compact(self.today - timedelta(days=1))
+        self.assertEqual(ArticleDailyStats.objects.get(article=self.first).views, 0)
+
+    def test_endpoint_adds_todays_events_to_the_rollups(self):
+        self.view(self.first, self.readers[0], 3, count=2)
+        self.view(self.second, self.readers[0], 1)
+        call_command('compact_article_stats', stdout=StringIO())
+        self.view(self.first, self.readers[1], 0)
+        Rating.objects.create(article=self.second, user=self.readers[0], rating=3)
+
+        response = self.stats(since=(self.today - timedelta(days=3)).isoformat())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['totals']['views'], 4)
+        self.assertEqual(response.data['totals']['average_rating'], 3)
+        self.assertEqual([day['views'] for day in response.data['series']], [2, 0, 1, 1])
+        periods = {article['title']: article['period'] for article in response.data['articles']}
+        self.assertEqual((periods['First']['views'], periods['Second']['views'], periods['Second']['ratings']),
+                         (3, 1, 1))
+
+        # days before the range are left out
+        response = self.stats(since=(self.today - timedelta(days=1)).isoformat())
+        self.assertEqual(response.data['totals']['views'], 2)
+
+    def test_queries_do_not_grow_with_the_articles(self):
+        self.view(self.first, self.readers[0], 2)
+        call_command('compact_article_stats', stdout=StringIO())
+        self.view(self.first, self.readers[0], 0)
+        with self.assertNumQueries(9):
+            self.stats()
+        for i in range(5):
+            article = ArticlesModel.objects.create(title='More {}'.format(i), description='description',
+                                                   body='body', author=self.author)
+            self.view(article, self.readers[1], 2)
+            self.view(article, self.readers[1], 0)
+        compact(self.today - timedelta(days=2))
+        with self.assertNumQueries(9):
+            response = self.stats()
+        self.assertEqual(response.data['totals']['views'], 12)
+        self.assertEqual(len(response.data['series']), 30)
+
+    def test_command_compacts_up_to_yesterday(self):
+        self.view(self.first, self.readers[0], 2)
+        self.view(self.first, self.readers[0], 0)
+        out = StringIO()
+        call_command('compact_article_stats', stdout=out)
+        self.assertIn('Compacted 2 day(s)', out.getvalue())
+        self.assertEqual(list(ArticleDailyStats.objects.values_list('day', flat=True)),
+                         [self.today - timedelta(days=2)])
+        # the days after the last one with events are compacted again, in
+        # case events came in late
+        out = StringIO()
+        call_command('compact_article_stats', stdout=out)
+        self.assertIn('Compacted 1 day(s), 0 article day(s)', out.getvalue())
+        out = StringIO()
+        call_command('compact_article_stats', since=self.today.isoformat(), stdout=out)
+        self.assertIn('Nothing to compact', out.getvalue())
+
+    def test_invalid_ranges_are_rejected(self):
+        self.assertEqual(self.stats(since='yesterday').status_code, 400)
+        self.assertEqual(self.stats(since='2026-02-30').status_code, 400)
+        self.assertEqual(self.stats(since=self.today.isoformat(),
+                                    until=(self.today - timedelta(days=1)).isoformat()).status_code, 400)
+        self.assertEqual(self.stats(since='2000-01-01').status_code, 400)
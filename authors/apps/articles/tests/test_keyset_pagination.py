@@ -0,0 +1,82 @@
+from django.utils import timezone
+from rest_framework.reverse import reverse as API_Reverse
+
+from authors.apps.articles.models import ArticlesModel
+from .base_tests import BaseTest
+
+
+class KeysetPaginationTest(BaseTest):
+    """
+    Tests for the cursor pagination of the list endpoints
+    """
+
+    def setUp(self):
+        super().setUp()
+        token = self.create_and_login_user()
+        self.slugs = [self.create_article(token=token) for i in range(5)]
+
+    def walk(self, url):
+        """Follows the next links from url and returns every page"""
+        pages = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            pages.append(response.data)
+            url = response.data['next']
+        return pages
+
+    def slugs_of(self, pages):
+        return [article['slug'] for page in pages for article in page['results']]
+
+    def test_pages_cover_every_article_once_newest_first(self):
+        pages = self.walk(self.url + '?page_size=2')
+        self.assertEqual([len(page['results']) for page in pages], [2, 2, 1])
+        self.assertEqual(self.slugs_of(pages), list(reversed(self.slugs)))
+
+    def test_rows_with_the_same_created_at_are_ordered_by_id(self):
+        ArticlesModel.objects.update(created_at=timezone.now())
+        pages = self.walk(self.url + '?page_size=2')
+        self.assertEqual(self.slugs_of(pages), list(reversed(self.slugs)))
+
+    def test_previous_link_returns_the_page_before(self):
+        first = self.client.get(self.url + '?page_size=2').data
+        second = self.client.get(first['next']).data
+        back = self.client.get(second['previous']).data
+        self.assertEqual(back['results'], first['results'])
+        self.assertIsNone(back['previous'])
+
+    def test_count_can_be_skipped(self):
+        response = self.client.get(self.url + '?page_size=2&count=false')
+        self.assertNotIn('count', response.data)
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertIn('count=false', response.data['next'])
+
+    def test_page_numbers_fall_back_to_offset_pagination(self):
+        response = self.client.get(self.url + '?page_size=2&page=3')
+        self.assertEqual(response.data['count'], 5)
+        self.assertEqual([article['slug'] for article in response.data['results']],
+                         [self.slugs[0]])
+
+    def test_invalid_cursor_is_not_found(self):
+        response = self.client.get(self.url + '?cursor=garbage')
+        self.assertEqual(response.status_code, 404)
+
+    def test_comments_are_paginated(self):
+        url = API_Reverse('articles:comments', {self.slugs[0]: 'slug'})
+        for i in range(3):
+            self.client.post(url, self.comment, format='json')
+        response = self.client.get(url + '?page_size=2')
+        self.assertEqual(response.data['count'], 3)
+        self.assertEqual(len(response.data['comments']), 2)
+        response = self.client.get(response.data['next'])
+        self.assertEqual(len(response.data['comments']), 1)
+        self.assertIsNone(response.data['next'])
+
+    def test_favourites_are_paginated_oldest_first(self):
+        for slug in self.slugs:
+            self.client.post(API_Reverse('articles:favourite', {slug: 'slug'}))
+        response = self.client.get(API_Reverse('articles:favourite-list') + '?page_size=3')
+        page = response.json()['article']
+        self.assertEqual(page['count'], 5)
+        self.assertEqual([favourite['article']['slug'] for favourite in page['results']],
+                         self.slugs[:3])
@@ -0,0 +1,80 @@
+from unittest import mock
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.reverse import reverse as API_Reverse
+
+from authors.apps.articles.models import (ArticlesModel, ArticleCounters, Comment, CommentLike,
+                                          LikesDislikes, ReactionManager)
+from authors.apps.authentication.models import User
+from .base_tests import BaseTest
+
+
+class ReactionsTest(BaseTest):
+    """
+    Tests for setting likes and dislikes with conditional writes
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.create_and_login_user()
+        self.slug = self.create_article()
+        self.article = ArticlesModel.objects.get(slug=self.slug)
+        self.create_and_login_user(self.user2)
+        self.reader = User.objects.get(email=self.user2['user']['email'])
+        self.like_url = API_Reverse('articles:article-like', {self.slug: 'slug'})
+
+    def counters(self):
+        counters = ArticleCounters.objects.get(article=self.article)
+        return counters.likes, counters.dislikes
+
+    def test_toggling_never_rewrites_the_article(self):
+        updated_at = self.article.updated_at
+        self.client.post(self.like_url, {'likes': True}, format='json')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.like_url, {'likes': False}, format='json')
+        self.assertEqual(response.status_code, 200)
+        statements = [query['sql'] for query in queries.captured_queries if 'SAVEPOINT' not in query['sql']]
+        self.assertFalse(any(sql.startswith('UPDATE "articles_articlesmodel"') for sql in statements))
+        # the article lookup, the switch and the counters
+        self.assertEqual(len(statements), 3)
+        self.assertEqual(ArticlesModel.objects.get(slug=self.slug).updated_at, updated_at)
+        self.assertEqual(self.counters(), (0, 1))
+
+    def test_repeating_a_reaction_changes_nothing(self):
+        self.assertIsNone(LikesDislikes.objects.react(self.article, self.reader, True))
+        self.assertTrue(LikesDislikes.objects.react(self.article, self.reader, True))
+        self.assertEqual(self.counters(), (1, 0))
+        self.assertTrue(LikesDislikes.objects.withdraw(self.article, self.reader))
+        self.assertIsNone(LikesDislikes.objects.withdraw(self.article, self.reader))
+        self.assertEqual(self.counters(), (0, 0))
+        # the managers still count rows as usual
+        self.assertEqual((LikesDislikes.objects.count(), CommentLike.objects.count()), (0, 0))
+
+    def test_a_reaction_created_meanwhile_is_switched(self):
+        LikesDislikes.objects.react(self.article, self.reader, False)
+        switch = ReactionManager.switch
+        calls = []
+
+        def racing_switch(manager, lookup, value):
+            # the first switch runs before the other request's row exists
+            calls.append(value)
+            return 0 if len(calls) == 1 else switch(manager, lookup, value)
+
+        with mock.patch.object(ReactionManager, 'switch', racing_switch):
+            self.assertFalse(LikesDislikes.objects.react(self.article, self.reader, True))
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(self.counters(), (1, 0))
+        self.assertTrue(LikesDislikes.objects.get(article=self.article, reader=self.reader).likes)
+
+    def test_comment_likes_are_counted_on_the_comment(self):
+        comment = Comment.objects.create(body='comment', author=self.article.author, article=self.article)
+        url = API_Reverse('articles:comment-like', {self.slug: 'slug', comment.id: 'id'})
+        self.assertEqual(self.client.post(url, {'comment_likes': True}, format='json').status_code, 201)
+        self.assertEqual(Comment.objects.get(id=comment.id).like_count, 1)
+        self.assertEqual(self.client.post(url, {'comment_likes': False}, format='json').status_code, 200)
+        self.assertEqual(Comment.objects.get(id=comment.id).like_count, 0)
+        self.assertFalse(CommentLike.objects.get(specific_comment=comment).comment_likes)
+        self.client.delete(url)
+        self.assertFalse(CommentLike.objects.exists())
+        self.assertEqual(Comment.objects.get(id=comment.id).like_count, 0)
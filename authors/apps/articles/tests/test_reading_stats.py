@@ -1,7 +1,15 @@
 import json
+import os
+import tempfile
+import threading
+import time
+from io import StringIO
+from django.core.management import call_command
 from rest_framework import status
+from rest_framework.reverse import reverse
 
-from authors.apps.articles.models import ArticleStat, Comment
+from authors.apps.articles.models import ArticlesModel, ArticleStat, Comment
+from authors.apps.articles.stats import view_buffer
 from authors.apps.articles.tests.base_tests import BaseTest
 
 
@@ -17,6 +25,7 @@ class StatsTestCase(BaseTest):
         old_count = ArticleStat.objects.count()
         url = self.single_article_details()
         self.client.get(url, format='json')
+        call_command('flush_article_views', stdout=StringIO())
         new_count = ArticleStat.objects.count()
         self.assertNotEqual(old_count, new_count)
 
@@ -45,8 +54,87 @@ class StatsTestCase(BaseTest):
         """
         url = self.single_article_details()
         self.client.get(url, format='json')
+        call_command('flush_article_views', stdout=StringIO())
         old_count = ArticleStat.objects.count()
         url = self.single_article_details()
         self.client.get(url, format='json')
+        call_command('flush_article_views', stdout=StringIO())
         new_count = ArticleStat.objects.count()
-        self.assertNotEqual(old_count, new_count)          
\ No newline at end of file
+        self.assertNotEqual(old_count, new_count)
+
+    def test_repeat_views_within_window_are_counted_once(self):
+        """
+        Method asserts that the same user re-reading an article is deduped
+        """
+        url = self.single_article_details()
+        self.client.get(url, format='json')
+        self.client.get(url, format='json')
+        call_command('flush_article_views', stdout=StringIO())
+        self.assertEqual(ArticleStat.objects.count(), 1)
+
+    def test_full_buffer_wakes_the_flusher(self):
+        """
+        Method asserts that reaching the buffer size asks for a flush without writing on the read
+        """
+        url = self.single_article_details()
+        with self.settings(ARTICLE_VIEWS_BUFFER_SIZE=2):
+            self.client.get(url, format='json')
+            self.assertFalse(view_buffer.due.is_set())
+            self.create_and_login_user(self.user2)
+            self.client.get(url, format='json')
+        self.assertTrue(view_buffer.due.is_set())
+        self.assertEqual(ArticleStat.objects.count(), 0)
+        self.assertEqual(view_buffer.flush(), 2)
+        self.assertFalse(view_buffer.due.is_set())
+
+    def test_views_of_deleted_articles_are_dropped(self):
+        """
+        Method asserts that a view of a deleted article doesn't stop the others being written
+        """
+        url = self.single_article_details()
+        self.client.get(url, format='json')
+        article = ArticlesModel.objects.get()
+        view_buffer.record(article.id + 1000, article.author_id)
+        self.assertEqual(view_buffer.flush(), 1)
+        self.assertEqual(ArticleStat.objects.count(), 1)
+        self.assertEqual(view_buffer.pending, [])
+
+    def test_views_can_be_spooled_to_a_file(self):
+        """
+        Method asserts that spooled views are written on flush
+        """
+        spool = os.path.join(tempfile.mkdtemp(), 'views.spool')
+        url = self.single_article_details()
+        with self.settings(ARTICLE_VIEWS_SPOOL=spool):
+            self.client.get(url, format='json')
+            self.assertTrue(os.path.exists(spool))
+            call_command('flush_article_views', stdout=StringIO())
+        self.assertFalse(os.path.exists(spool))
+        self.assertEqual(ArticleStat.objects.count(), 1)
+
+    def test_appends_waiting_on_a_flush_go_to_the_new_spool(self):
+        """
+        Method asserts that a view appended while the spool is taken over isn't lost
+        """
+        spool = os.path.join(tempfile.mkdtemp(), 'views.spool')
+        claimed = spool + '.claimed'
+        open(spool, 'w').close()
+        with view_buffer.open_spool(spool, 'a'):
+            appender = threading.Thread(target=view_buffer.append_to_spool, args=(spool, '1 1 1.0\n'))
+            appender.start()
+            time.sleep(0.1)
+            os.rename(spool, claimed)
+        appender.join()
+        with open(claimed) as claimed_file, open(spool) as spool_file:
+            self.assertEqual((claimed_file.read(), spool_file.read()), ('', '1 1 1.0\n'))
+
+    def test_stats_endpoint_includes_buffered_views(self):
+        """
+        Method asserts that the statistics count views not yet flushed
+        """
+        url = self.single_article_details()
+        self.client.get(url, format='json')
+        response = self.client.get(reverse('articles:stats'))
+        self.assertEqual(response.data['articles'][0]['view_count'], 1)
+        self.assertEqual(response.data['articles'][0]['period']['views'], 1)
+
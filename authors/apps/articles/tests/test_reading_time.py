@@ -0,0 +1,56 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.reverse import reverse as API_Reverse
+
+from authors.apps.articles.models import ArticlesModel
+from .base_tests import BaseTest
+
+
+class ReadingTimeTest(BaseTest):
+    """
+    Tests for the stored word count and reading time of articles
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.token = self.create_and_login_user()
+        self.slug = self.create_article(token=self.token)
+        self.detail_url = API_Reverse('articles:article-details', {self.slug: 'slug'})
+
+    def stored(self):
+        return ArticlesModel.objects.get(slug=self.slug)
+
+    def test_reading_time_is_stored_on_save(self):
+        article = self.stored()
+        self.assertEqual(article.word_count, 5)
+        self.assertEqual(article.reading_time, 1)
+
+    def test_reading_time_follows_body_edits(self):
+        self.client.put(self.detail_url, {'article': {'body': 'word ' * 600}}, format='json')
+        article = self.stored()
+        self.assertEqual(article.word_count, 600)
+        self.assertEqual(article.reading_time, 3)
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response.data['time_to_read'], '3 mins')
+
+    def test_summary_list_does_not_load_the_body(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, {'view': 'summary'})
+        article = response.data['results'][0]
+        self.assertNotIn('body', article)
+        self.assertEqual(article['time_to_read'], '1 min')
+        self.assertFalse(any('"body"' in query['sql'] for query in queries.captured_queries
+                             if 'FROM "articles_articlesmodel"' in query['sql']))
+
+    def test_full_list_still_has_the_body(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['results'][0]['body'], 'This is a test body')
+
+    def test_backfill_command(self):
+        ArticlesModel.objects.update(word_count=0, reading_time=0)
+        call_command('backfill_reading_time', stdout=StringIO())
+        article = self.stored()
+        self.assertEqual((article.word_count, article.reading_time), (5, 1))
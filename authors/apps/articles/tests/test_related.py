@@ -0,0 +1,113 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from rest_framework.reverse import reverse as API_Reverse
+from rest_framework.test import APIClient
+
+from authors.apps.articles.models import ArticlesModel, Favourite, RelatedArticle, Tags
+from authors.apps.articles.related import related_articles
+from authors.apps.authentication.models import User
+from authors.apps.notifications.models import NotificationJob
+
+
+@override_settings(RELATED_SIZE=2, RELATED_FAVOURITE_WEIGHT=0.5)
+class RelatedArticlesTest(TestCase):
+    """
+    Tests for the related articles index
+    """
+
+    def setUp(self):
+        self.author = User.objects.create_user('author', 'author@test.com', 'password')
+
+    def publish(self, title, *tags):
+        article = ArticlesModel.objects.create(title=title, description='description', body='body',
+                                               author=self.author)
+        article.tags.add(*Tags.objects.resolve(tags))
+        return article
+
+    def run_worker(self):
+        call_command('process_notifications', '--once', '--workers', '1', stdout=StringIO())
+
+    def related(self, article):
+        return [entry['title'] for entry in related_articles(article)]
+
+    def test_articles_sharing_more_tags_rank_higher(self):
+        django = self.publish('Django', 'python', 'web', 'orm')
+        flask = self.publish('Flask', 'python', 'web')
+        self.publish('Numpy', 'python', 'science')
+        self.publish('Rust', 'systems')
+        self.run_worker()
+        self.assertEqual(self.related(django), ['Flask', 'Numpy'])
+        self.assertAlmostEqual(related_articles(django)[0]['score'], round(2 / 3, 4))
+        self.assertEqual(self.related(flask), ['Django', 'Numpy'])
+
+    def test_tag_changes_refresh_the_neighbours(self):
+        django = self.publish('Django', 'python', 'web')
+        numpy = self.publish('Numpy', 'python', 'science')
+        self.publish('Pandas', 'python', 'science', 'data')
+        self.run_worker()
+        self.assertEqual(self.related(django), ['Numpy', 'Pandas'])
+
+        flask = self.publish('Flask', 'python', 'web')
+        self.run_worker()
+        self.assertEqual(self.related(django), ['Flask', 'Numpy'])
+        flask.tags.clear()
+        self.run_worker()
+        self.assertEqual(self.related(django), ['Numpy', 'Pandas'])
+        self.assertFalse(RelatedArticle.objects.filter(related=flask).exists())
+
+        numpy.delete()
+        self.run_worker()
+        self.assertEqual(self.related(django), ['Pandas'])
+
+    def test_shared_favouriters_count_too(self):
+        first = self.publish('First', 'python')
+        second = self.publish('Second', 'python')
+        third = self.publish('Third', 'python')
+        readers = [User.objects.create_user('reader{}'.format(i), 'reader{}@test.com'.format(i), 'password')
+                   for i in range(2)]
+        for reader in readers:
+            Favourite.objects.create(article=first, user=reader)
+            Favourite.objects.create(article=third, user=reader)
+        self.run_worker()
+        self.assertEqual(self.related(first), ['Third', 'Second'])
+        self.assertAlmostEqual(related_articles(first)[0]['score'], 1.5)
+
+    def test_details_list_the_related_articles(self):
+        django = self.publish('Django', 'python')
+        self.publish('Flask', 'python')
+        self.run_worker()
+        with self.assertNumQueries(1):
+            related_articles(django)
+        response = APIClient().get(API_Reverse('articles:article-details', {django.slug: 'slug'}))
+        self.assertEqual([entry['slug'] for entry in response.data['related']], ['flask'])
+
+    def test_editing_an_article_refreshes_the_details_listing_it(self):
+        django = self.publish('Django', 'python')
+        flask = self.publish('Flask', 'python')
+        self.run_worker()
+        url = API_Reverse('articles:article-details', {django.slug: 'slug'})
+        APIClient().get(url)
+        flask.title = 'Flask 2'
+        flask.save()
+        # a cached response has no .data, read what was sent
+        related = APIClient().get(url).json()['article']['related']
+        self.assertEqual([entry['title'] for entry in related], ['Flask 2'])
+
+    def test_lists_are_rebuilt_by_the_worker(self):
+        django = self.publish('Django', 'python')
+        flask = self.publish('Flask', 'python')
+        Favourite.objects.create(article=flask, user=self.author)
+        # the requests only queue one rebuild per article
+        self.assertEqual((self.related(django), self.related(flask)), ([], []))
+        self.assertEqual(NotificationJob.objects.filter(kind=NotificationJob.RELATED).count(), 2)
+        self.run_worker()
+        self.assertEqual((self.related(django), self.related(flask)), (['Flask'], ['Django']))
+
+    def test_command_rebuilds_every_article(self):
+        django = self.publish('Django', 'python')
+        self.publish('Flask', 'python')
+        RelatedArticle.objects.all().delete()
+        call_command('rebuild_related_articles', stdout=StringIO())
+        self.assertEqual(self.related(django), ['Flask'])
@@ -0,0 +1,173 @@
+import shutil
+import tempfile
+
+from django.core.cache.backends.filebased import FileBasedCache
+from django.db import transaction
+from django.test import RequestFactory, SimpleTestCase, TransactionTestCase
+from rest_framework.reverse import reverse as API_Reverse
+from rest_framework.response import Response
+
+from authors.apps.articles.cache import ResponseCache, response_cache
+from authors.apps.articles.models import ArticlesModel, Comment
+from authors.apps.articles.renderers import ArticlesRenderer
+from authors.apps.authentication.models import User
+from .base_tests import BaseTest
+
+
+class ResponseCacheTest(BaseTest):
+    """
+    Tests for caching the responses of anonymous article reads
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.token = self.create_and_login_user()
+        self.slug = self.create_article(token=self.token)
+        self.detail_url = API_Reverse('articles:article-details', {self.slug: 'slug'})
+        self.anonymous = self.unauthorised_client
+
+    def test_anonymous_reads_are_served_from_the_cache(self):
+        first = self.anonymous.get(self.detail_url)
+        with self.assertNumQueries(0):
+            second = self.anonymous.get(self.detail_url)
+        self.assertEqual((first['X-Cache'], second['X-Cache']), ('MISS', 'HIT'))
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(first['ETag'], second['ETag'])
+
+    def test_lists_are_cached_per_query_string(self):
+        self.anonymous.get(self.url)
+        self.assertEqual(self.anonymous.get(self.url)['X-Cache'], 'HIT')
+        self.assertEqual(self.anonymous.get(self.url, {'view': 'summary'})['X-Cache'], 'MISS')
+
+    def test_authenticated_reads_are_not_cached(self):
+        self.client.get(self.detail_url)
+        response = self.client.get(self.detail_url)
+        self.assertNotIn('X-Cache', response)
+
+    def test_session_reads_are_not_cached(self):
+        user = User.objects.create_user('session', 'session@test.com', 'password')
+        self.anonymous.get(self.detail_url)
+        self.anonymous.force_login(user)
+        response = self.anonymous.get(self.detail_url)
+        self.assertNotIn('X-Cache', response)
+        self.assertIn('Cookie', response['Vary'])
+        self.assertIn('Authorization', response['Vary'])
+
+    def test_conditional_requests_get_a_304(self):
+        response = self.anonymous.get(self.detail_url)
+        with self.assertNumQueries(0):
+            by_etag = self.anonymous.get(self.detail_url, HTTP_IF_NONE_MATCH=response['ETag'])
+            by_date = self.anonymous.get(self.detail_url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual((by_etag.status_code, by_date.status_code), (304, 304))
+        self.assertEqual(by_etag.content, b'')
+        stale = self.anonymous.get(self.detail_url, HTTP_IF_NONE_MATCH='"stale"')
+        self.assertEqual(stale.status_code, 200)
+
+    def test_edits_invalidate_the_detail_and_lists(self):
+        self.anonymous.get(self.detail_url)
+        self.anonymous.get(self.url)
+        self.client.put(self.detail_url, {'article': {'title': 'A new title'}}, format='json')
+        detail = self.anonymous.get(self.detail_url)
+        self.assertEqual(detail['X-Cache'], 'MISS')
+        self.assertEqual(detail.data['title'], 'A new title')
+        self.assertEqual(self.anonymous.get(self.url)['X-Cache'], 'MISS')
+
+    def test_reactions_invalidate_the_article(self):
+        etag = self.anonymous.get(self.detail_url)['ETag']
+        self.create_and_login_user(user=self.user2)
+        self.client.post(API_Reverse('articles:article-like', {self.slug: 'slug'}), {'likes': True}, format='json')
+        response = self.anonymous.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['likes_count'], 1)
+        self.client.post(API_Reverse('articles:article-like', {self.slug: 'slug'}), {'likes': False}, format='json')
+        self.assertEqual(self.anonymous.get(self.detail_url).data['dislikes_count'], 1)
+        self.client.delete(API_Reverse('articles:article-like', {self.slug: 'slug'}))
+        self.assertEqual(self.anonymous.get(self.detail_url).data['dislikes_count'], 0)
+
+        self.anonymous.get(self.detail_url)
+        article = ArticlesModel.objects.get(slug=self.slug)
+        Comment.objects.create(body='comment', author=article.author, article=article)
+        self.assertEqual(self.anonymous.get(self.detail_url)['X-Cache'], 'MISS')
+
+    def test_tag_changes_invalidate_the_article(self):
+        self.anonymous.get(self.detail_url)
+        ArticlesModel.objects.get(slug=self.slug).tags.clear()
+        response = self.anonymous.get(self.detail_url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['tags'], [])
+
+    def test_clearing_a_tag_invalidates_its_articles_only(self):
+        other = self.create_article(token=self.token)
+        other_url = API_Reverse('articles:article-details', {other: 'slug'})
+        ArticlesModel.objects.get(slug=other).tags.clear()
+        self.anonymous.get(self.detail_url)
+        self.anonymous.get(other_url)
+        tag = ArticlesModel.objects.get(slug=self.slug).tags.first()
+        tag.articles.clear()
+        self.assertEqual(self.anonymous.get(self.detail_url)['X-Cache'], 'MISS')
+        self.assertEqual(self.anonymous.get(other_url)['X-Cache'], 'HIT')
+
+    def test_other_articles_stay_cached(self):
+        other = self.create_article(token=self.token)
+        other_url = API_Reverse('articles:article-details', {other: 'slug'})
+        self.anonymous.get(other_url)
+        self.client.post(API_Reverse('articles:favourite', {self.slug: 'slug'}))
+        self.assertEqual(self.anonymous.get(other_url)['X-Cache'], 'HIT')
+        self.assertEqual(self.anonymous.get(self.detail_url)['X-Cache'], 'MISS')
+
+    def test_profile_changes_invalidate_embedded_authors(self):
+        self.anonymous.get(self.detail_url)
+        User.objects.filter(username='test_user').first().save()
+        self.assertEqual(self.anonymous.get(self.detail_url)['X-Cache'], 'MISS')
+
+
+class ResponseCacheCommitTest(TransactionTestCase):
+    """
+    Tests for invalidating the responses when the writes commit
+    """
+
+    def setUp(self):
+        response_cache.cache.clear()
+        author = User.objects.create_user('author', 'author@test.com', 'password')
+        self.article = ArticlesModel.objects.create(title='title', description='description', body='body',
+                                                    author=author)
+
+    def test_versions_are_replaced_again_on_commit(self):
+        name = 'article:' + self.article.slug
+        with transaction.atomic():
+            self.article.title = 'A new title'
+            self.article.save()
+            # what a read racing the transaction would have cached under
+            uncommitted = response_cache.versions(name, response_cache.LISTS)
+        self.assertNotEqual(response_cache.versions(name, response_cache.LISTS)[0], uncommitted[0])
+        self.assertNotEqual(response_cache.versions(name, response_cache.LISTS)[1], uncommitted[1])
+
+
+class FileBasedResponseCacheTest(SimpleTestCase):
+    """
+    Tests for keeping the responses in a file based cache
+    """
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.cache = ResponseCache(FileBasedCache(directory, {}))
+        self.request = RequestFactory().get('/api/articles/test-article')
+
+    def rendered(self, data):
+        response = Response(data)
+        response.accepted_renderer = ArticlesRenderer()
+        response.accepted_media_type = 'application/json'
+        response.renderer_context = {}
+        return response.render()
+
+    def test_entries_are_invalidated_by_version(self):
+        key = self.cache.key(self.request, 'test-article')
+        self.cache.store(key, self.rendered({'title': 'cached'}))
+        self.assertEqual(self.cache.key(self.request, 'test-article'), key)
+        response = self.cache.respond(self.request, self.cache.get(key))
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertIn(b'cached', response.content)
+
+        self.cache.invalidate_article('test-article')
+        self.assertIsNone(self.cache.get(self.cache.key(self.request, 'test-article')))
@@ -0,0 +1,105 @@
+from io import StringIO
+from unittest import mock
+
+from django.apps import apps
+from django.core.management import call_command
+from django.db.models.signals import post_save
+from django.test import override_settings
+from rest_framework.reverse import reverse as API_Reverse
+
+from authors.apps.articles.apps import ArticlesConfig
+from authors.apps.articles.models import ArticlesModel, ArticleSearchTerm
+from authors.apps.articles.search import PostingsSearchBackend, document_count, index_article
+from .base_tests import BaseTest
+
+
+class ArticleSearchIndexTest(BaseTest):
+    """
+    Tests for the indexed, ranked article search
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.token = self.create_and_login_user()
+        self.in_body = self.publish('Gardening notes', 'Spring planting', 'How to grow python plants')
+        self.in_title = self.publish('Python for beginners', 'Learn to code', 'Variables and loops',
+                                     tags=['python', 'code'])
+
+    def publish(self, title, description, body, tags=()):
+        article = {'article': {'title': title, 'description': description,
+                               'body': body, 'tags': list(tags)}}
+        return self.create_article(token=self.token, article=article)
+
+    def search(self, text):
+        response = self.client.get(self.url, {'search': text})
+        self.assertEqual(response.status_code, 200)
+        return [article['slug'] for article in response.data['results']]
+
+    def test_results_are_ranked_by_relevance(self):
+        self.assertEqual(self.search('python'), [self.in_title, self.in_body])
+
+    def test_every_term_must_match(self):
+        self.assertEqual(self.search('python loops'), [self.in_title])
+        self.assertEqual(self.search('python unknownword'), [])
+
+    def test_matching_several_tags_returns_the_article_once(self):
+        self.assertEqual(self.search('code'), [self.in_title])
+
+    def test_stop_words_alone_match_nothing(self):
+        self.assertEqual(self.search('the'), [])
+
+    def test_updated_article_is_reindexed(self):
+        url = API_Reverse('articles:article-details', {self.in_body: 'slug'})
+        self.client.put(url, {'article': {'body': 'How to grow tomatoes'}}, format='json')
+        self.assertEqual(self.search('python'), [self.in_title])
+        self.assertEqual(self.search('tomatoes'), [self.in_body])
+
+    def test_tag_changes_are_reindexed(self):
+        article = ArticlesModel.objects.get(slug=self.in_title)
+        python = ArticleSearchTerm.objects.filter(article=article, term='python')
+        # the title counts 4 and the tag 3
+        self.assertEqual(python.get().weight, 7)
+        article.tags.clear()
+        self.assertEqual(python.get().weight, 4)
+
+    def test_deleted_article_leaves_the_index(self):
+        url = API_Reverse('articles:article-details', {self.in_body: 'slug'})
+        self.client.delete(url)
+        self.assertEqual(self.search('gardening'), [])
+        self.assertFalse(ArticleSearchTerm.objects.filter(term='gardening').exists())
+
+    def test_common_terms_rank_only_their_heaviest_articles(self):
+        with override_settings(SEARCH_MAX_CANDIDATES=1):
+            found = PostingsSearchBackend().search(ArticlesModel.objects.all(), 'python')
+            self.assertEqual([article.slug for article in found], [self.in_title])
+
+    def test_saving_an_article_with_its_tags_indexes_it_once(self):
+        index_many = mock.patch.object(PostingsSearchBackend, 'index_many', autospec=True,
+                                       side_effect=PostingsSearchBackend.index_many)
+        with index_many as indexed:
+            slug = self.publish('Gardening tools', 'Spades', 'Dig', tags=['garden', 'tools'])
+            self.assertEqual(indexed.call_count, 1)
+            url = API_Reverse('articles:article-details', {slug: 'slug'})
+            self.client.put(url, {'article': {'title': 'Garden tools', 'tags': ['garden']}}, format='json')
+            self.assertEqual(indexed.call_count, 2)
+        self.assertEqual(self.search('garden tools'), [slug])
+        self.assertEqual(self.search('gardening'), [self.in_body])
+
+    def test_article_count_is_cached_until_articles_change(self):
+        self.assertEqual(document_count(), 2)
+        with self.assertNumQueries(0):
+            document_count()
+        self.publish('Another one', 'description', 'body')
+        self.assertEqual(document_count(), 3)
+        ArticlesModel.objects.get(slug=self.in_body).delete()
+        self.assertEqual(document_count(), 2)
+
+    def test_receivers_are_connected_by_the_app(self):
+        # saves outside the API, e.g from commands, are indexed too
+        self.assertIsInstance(apps.get_app_config('articles'), ArticlesConfig)
+        self.assertIn(index_article, post_save._live_receivers(ArticlesModel))
+
+    def test_rebuild_command_restores_the_index(self):
+        ArticleSearchTerm.objects.all().delete()
+        call_command('rebuild_search_index', '--batch-size', '1', stdout=StringIO())
+        self.assertEqual(self.search('python'), [self.in_title, self.in_body])
@@ -0,0 +1,105 @@
+import threading
+from unittest import mock
+
+from django.db import IntegrityError, connection, connections
+from django.test import TestCase, TransactionTestCase, skipUnlessDBFeature
+from django.test.utils import CaptureQueriesContext
+
+from authors.apps.articles.models import ArticlesModel, ArticleCounters
+from authors.apps.authentication.models import User
+
+
+def publish(author, title='Introduction'):
+    return ArticlesModel.objects.create(
+        title=title, description='description', body='body', author=author)
+
+
+class SlugTest(TestCase):
+    """
+    Tests for allocating article slugs
+    """
+
+    def setUp(self):
+        self.author = User.objects.create_user('author', 'author@test.com', 'password')
+
+    def test_repeated_titles_get_the_next_suffix(self):
+        slugs = [publish(self.author).slug for i in range(3)]
+        self.assertEqual(slugs, ['introduction', 'introduction-1', 'introduction-2'])
+        publish(self.author, title='Introduction to Django')
+        ArticlesModel.objects.filter(slug='introduction-1').delete()
+        self.assertEqual(publish(self.author).slug, 'introduction-3')
+
+    def test_one_query_finds_the_slug(self):
+        for i in range(20):
+            publish(self.author)
+        with CaptureQueriesContext(connection) as queries:
+            article = publish(self.author)
+        self.assertEqual(article.slug, 'introduction-20')
+        lookups = [query for query in queries.captured_queries
+                   if query['sql'].startswith('SELECT') and '"articles_articlesmodel"."slug"' in query['sql']]
+        self.assertEqual(len(lookups), 1)
+
+    def test_a_slug_taken_meanwhile_is_picked_again(self):
+        publish(self.author)
+        stale = ArticlesModel(title='Introduction', description='description', body='body', author=self.author)
+        original = ArticlesModel.create_title_slug
+        calls = []
+
+        def taken_first(article, random_suffix=False):
+            calls.append(random_suffix)
+            return 'introduction' if len(calls) == 1 else original(article, random_suffix)
+
+        with mock.patch.object(ArticlesModel, 'create_title_slug', taken_first):
+            stale.save()
+        self.assertEqual(stale.slug, 'introduction-1')
+        self.assertEqual(calls, [False, False])
+
+    def test_other_integrity_errors_are_not_retried(self):
+        with mock.patch.object(ArticleCounters.objects, 'create', side_effect=IntegrityError) as create:
+            with self.assertRaises(IntegrityError):
+                publish(self.author)
+        self.assertEqual(create.call_count, 1)
+        # the counters are inserted with the article, or neither is
+        self.assertFalse(ArticlesModel.objects.exists())
+
+
+class ConcurrentSlugTest(TransactionTestCase):
+    """
+    Tests for publishing articles with the same title at once
+    """
+
+    @skipUnlessDBFeature('test_db_allows_multiple_connections')
+    def test_parallel_creates_get_distinct_slugs(self):
+        author = User.objects.create_user('author', 'author@test.com', 'password')
+        writers = 6
+        # every writer picks its slug before any of them inserts
+        barrier = threading.Barrier(writers)
+        original = ArticlesModel.create_title_slug
+        created, errors, waited = [], [], set()
+
+        def create_title_slug(article, random_suffix=False):
+            slug = original(article, random_suffix)
+            writer = threading.current_thread().name
+            if writer.startswith('writer') and writer not in waited:
+                waited.add(writer)
+                barrier.wait(timeout=5)
+            return slug
+
+        def write():
+            try:
+                created.append(publish(author).slug)
+            except Exception as error:
+                errors.append(error)
+            finally:
+                connections.close_all()
+
+        with mock.patch.object(ArticlesModel, 'create_title_slug', create_title_slug):
+            threads = [threading.Thread(target=write, name='writer-{}'.format(i)) for i in range(writers)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len(set(created)), writers)
+        self.assertEqual(ArticlesModel.objects.filter(slug__startswith='introduction').count(), writers)
@@ -1,6 +1,12 @@
+from importlib import import_module
 from rest_framework import status
 import json
 
+from django.apps import apps
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from authors.apps.articles.models import ArticlesModel, Tags
 from authors.apps.articles.tests.base_tests import BaseTest, API_Reverse
 
 
@@ -58,3 +64,91 @@ class TagsTest(BaseTest):
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn('Tag cannot have special characters', json.dumps(response.data))
         self.assertIn('error', json.dumps(response.data))
+
+    def tag_lookups(self, article):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.url, article, format='json', HTTP_AUTHORIZATION=self.token)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return [query for query in queries.captured_queries if '"articles_tags"."tag" IN' in query['sql']]
+
+    def test_tags_of_an_article_are_looked_up_at_once(self):
+        self.article['article']['tags'] = ['one', 'two', 'three', 'four']
+        self.assertEqual(len(self.tag_lookups(self.article)), 2)
+        self.article['article']['tags'].append('five')
+        # the existing tags and the new one's id
+        self.assertEqual(len(self.tag_lookups(self.article)), 2)
+        self.assertEqual(len(self.tag_lookups(self.article)), 1)
+        self.assertEqual(Tags.objects.count(), 5)
+
+    def test_the_same_tag_written_differently_is_stored_once(self):
+        self.article['article']['tags'] = ['Python', 'python', 'NEW TAG', 'new-tag']
+        response = self.client.post(self.url, self.article, format='json', HTTP_AUTHORIZATION=self.token)
+        self.assertEqual(response.data['tags'], ['python', 'new-tag'])
+        self.assertEqual(Tags.objects.count(), 2)
+
+    def test_tags_can_be_replaced(self):
+        url = self.single_article_details()
+        response = self.client.put(url, {'article': {'tags': ['test', 'other']}}, format='json')
+        self.assertEqual(sorted(response.data['tags']), ['other', 'test'])
+
+    def test_duplicate_tags_are_merged_by_the_migration(self):
+        slug = self.create_article(token=self.token)
+        article = ArticlesModel.objects.get(slug=slug)
+        written = Tags.objects.create(tag='Test')
+        other = ArticlesModel.objects.create(title='Other', description='d', body='b', author=article.author)
+        article.tags.add(written)
+        other.tags.add(written)
+        migration = import_module('authors.apps.articles.migrations.0010_dedupe_tags')
+        migration.dedupe_tags(apps, None)
+        self.assertFalse(Tags.objects.filter(tag='Test').exists())
+        self.assertEqual(sorted(article.tags.values_list('tag', flat=True)), ['tags', 'test'])
+        self.assertEqual(list(other.tags.values_list('tag', flat=True)), ['test'])
+
+
+class TagListingTest(BaseTest):
+    """
+    Tests for listing tags with their article counts
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.token = self.create_and_login_user()
+        self.tags_url = API_Reverse('tags:tags')
+        for tags in (['python', 'django'], ['python', 'rest'], ['python', 'django', 'pytest']):
+            self.article['article']['tags'] = tags
+            self.create_article(token=self.token)
+
+    def counts(self):
+        return dict(Tags.objects.values_list('tag', 'article_count'))
+
+    def test_counts_follow_tagging(self):
+        self.assertEqual(self.counts(), {'python': 3, 'django': 2, 'rest': 1, 'pytest': 1})
+        article = ArticlesModel.objects.filter(tags__tag='rest').get()
+        url = API_Reverse('articles:article-details', {article.slug: 'slug'})
+        self.client.put(url, {'article': {'tags': ['django']}}, format='json')
+        self.assertEqual(self.counts(), {'python': 2, 'django': 3, 'rest': 0, 'pytest': 1})
+        ArticlesModel.objects.filter(tags__tag='pytest').get().tags.clear()
+        self.assertEqual(self.counts(), {'python': 1, 'django': 2, 'rest': 0, 'pytest': 0})
+        self.client.delete(url)
+        self.assertEqual(self.counts(), {'python': 1, 'django': 1, 'rest': 0, 'pytest': 0})
+        Tags.objects.update(article_count=0)
+        Tags.objects.recount()
+        self.assertEqual(self.counts(), {'python': 1, 'django': 1, 'rest': 0, 'pytest': 0})
+
+    def test_tags_are_listed_by_popularity(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(self.tags_url)
+        self.assertEqual(response.data['count'], 4)
+        self.assertEqual(response.data['tags'][:2], [
+            {'tag': 'python', 'article_count': 3}, {'tag': 'django', 'article_count': 2}])
+        response = self.client.get(self.tags_url, {'ordering': 'tag'})
+        self.assertEqual([tag['tag'] for tag in response.data['tags']], ['django', 'pytest', 'python', 'rest'])
+
+    def test_tags_can_be_completed_from_a_prefix(self):
+        response = self.client.get(self.tags_url, {'prefix': 'Py'})
+        self.assertEqual([tag['tag'] for tag in response.data['tags']], ['python', 'pytest'])
+
+    def test_tags_are_paginated(self):
+        response = self.client.get(self.tags_url, {'page_size': 3})
+        self.assertEqual(len(response.data['tags']), 3)
+        self.assertIsNotNone(response.data['next'])
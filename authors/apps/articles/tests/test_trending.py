@@ -0,0 +1,81 @@
+from datetime import datetime, timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.reverse import reverse as API_Reverse
+from rest_framework.test import APIClient
+
+from authors.apps.articles.models import (ArticlesModel, ArticleStat, Favourite, LikesDislikes,
+                                          TrendingScore)
+from authors.apps.articles.trending import compute_scores, refresh_scores
+from authors.apps.authentication.models import User
+
+NOW = datetime(2026, 10, 18, 12, 30, tzinfo=timezone.utc)
+
+
+def decay(hours):
+    return 0.5 ** (hours / 24)
+
+
+@override_settings(TRENDING_WINDOW_HOURS=72, TRENDING_BUCKET_HOURS=1, TRENDING_HALF_LIFE_HOURS=24)
+class TrendingTest(TestCase):
+    """
+    Tests for scoring articles by their recent engagement
+    """
+
+    def setUp(self):
+        self.author = User.objects.create_user('author', 'author@test.com', 'password')
+        self.readers = [User.objects.create_user('reader{}'.format(i), 'reader{}@test.com'.format(i), 'password')
+                        for i in range(3)]
+        self.fresh, self.older, self.quiet = [
+            ArticlesModel.objects.create(title=title, description='description', body='body', author=self.author)
+            for title in ('Fresh', 'Older', 'Quiet')]
+
+    def view(self, article, hours_ago, count=1):
+        ArticleStat.objects.bulk_create([
+            ArticleStat(article=article, user=self.readers[0], created_at=NOW - timedelta(hours=hours_ago))
+            for i in range(count)])
+
+    def test_events_decay_by_the_half_life(self):
+        # the middle of the hour long bucket the events fall in is their age
+        self.view(self.fresh, 0.25, count=2)
+        LikesDislikes.objects.create(article=self.fresh, reader=self.readers[1], likes=True,
+                                     created_at=NOW - timedelta(minutes=45))
+        self.view(self.older, 24.1, count=4)
+        Favourite.objects.create(article=self.older, user=self.readers[2])
+        Favourite.objects.filter(article=self.older).update(created_at=NOW - timedelta(hours=47.9))
+        self.view(self.quiet, 80)
+
+        scores = compute_scores(NOW)
+        self.assertAlmostEqual(scores[self.fresh.id], (2 + 3) * decay(0.5))
+        self.assertAlmostEqual(scores[self.older.id], 4 * decay(24.5) + 5 * decay(47.5))
+        self.assertNotIn(self.quiet.id, scores)
+
+    def test_refresh_replaces_the_scores(self):
+        self.view(self.older, 1)
+        refresh_scores(NOW)
+        self.view(self.fresh, 1, count=3)
+        self.assertEqual(refresh_scores(NOW), 2)
+        self.assertEqual(list(TrendingScore.objects.order_by('-score').values_list('article_id', flat=True)),
+                         [self.fresh.id, self.older.id])
+        self.assertTrue(all(score.computed_at == NOW for score in TrendingScore.objects.all()))
+
+    def test_endpoint_reads_the_top_scores(self):
+        for article, count in ((self.fresh, 3), (self.older, 2), (self.quiet, 1)):
+            self.view(article, 1, count=count)
+        refresh_scores(NOW)
+        client = APIClient()
+        url = API_Reverse('articles:trending')
+        with self.assertNumQueries(2):
+            response = client.get(url, {'limit': 2})
+        self.assertEqual([article['title'] for article in response.data], ['Fresh', 'Older'])
+        self.assertEqual(client.get(url, {'limit': 'many'}).status_code, 400)
+
+    def test_command_scores_the_recent_events(self):
+        ArticleStat.objects.create(article=self.fresh, user=self.readers[0])
+        out = StringIO()
+        call_command('compute_trending', stdout=out)
+        self.assertIn('Scored 1 trending article(s)', out.getvalue())
+        self.assertTrue(TrendingScore.objects.filter(article=self.fresh).exists())
@@ -0,0 +1,79 @@
+from collections import defaultdict
+from datetime import timedelta
+from math import ceil
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, FloatField, Sum, Value, When
+from django.utils import timezone
+
+from .models import ArticleStat, Comment, Favourite, LikesDislikes, Rating, TrendingScore
+
+# How much one event of each kind adds to a score before it decays
+WEIGHTS = {
+    'views': 1,
+    'likes': 3,
+    'ratings': 3,
+    'comments': 4,
+    'favourites': 5,
+}
+
+
+def event_sources():
+    """Returns the querysets of the events counted, by kind"""
+    return {
+        'views': ArticleStat.objects.all(),
+        'likes': LikesDislikes.objects.filter(likes=True),
+        'ratings': Rating.objects.all(),
+        'comments': Comment.objects.all(),
+        'favourites': Favourite.objects.all(),
+    }
+
+
+def decay_buckets(now):
+    """
+    Returns (start, weight) for every bucket of the window, newest first,
+    the weight halving every TRENDING_HALF_LIFE_HOURS from the middle of
+    the bucket
+    """
+    width = settings.TRENDING_BUCKET_HOURS
+    buckets = int(ceil(settings.TRENDING_WINDOW_HOURS / width))
+    return [(now - timedelta(hours=width * (index + 1)),
+             0.5 ** (width * (index + 0.5) / settings.TRENDING_HALF_LIFE_HOURS))
+            for index in range(buckets)]
+
+
+def compute_scores(now=None):
+    """
+    Returns the trending score of every article with events in the last
+    TRENDING_WINDOW_HOURS.
+
+    Each kind of event is summed in a single grouped query over the
+    created_at index, every event adding the decayed weight of the bucket
+    it falls in, so the database returns one row per article however many
+    events there are.
+    """
+    now = now or timezone.now()
+    buckets = decay_buckets(now)
+    decayed = Sum(Case(*[When(created_at__gte=start, then=Value(weight)) for start, weight in buckets],
+                       default=Value(0.0), output_field=FloatField()))
+    scores = defaultdict(float)
+    for kind, events in event_sources().items():
+        totals = (events.filter(created_at__gte=buckets[-1][0], created_at__lte=now).order_by()
+                  .values_list('article_id').annotate(total=decayed))
+        for article_id, total in totals:
+            scores[article_id] += WEIGHTS[kind] * total
+    return scores
+
+
+def refresh_scores(now=None):
+    """Replaces the stored trending scores and returns how many articles have one"""
+    now = now or timezone.now()
+    scores = compute_scores(now)
+    with transaction.atomic():
+        TrendingScore.objects.all().delete()
+        TrendingScore.objects.bulk_create([
+            TrendingScore(article_id=article_id, score=score, computed_at=now)
+            for article_id, score in scores.items()
+        ])
+    return len(scores)
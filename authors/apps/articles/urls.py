@@ -6,6 +6,8 @@ app_name = "articles"
 
 urlpatterns = [
     path('articles/', views.ArticlesList.as_view(), name='articles'),
+    path('articles/bulk/', views.ArticlesBulkView.as_view(), name='bulk'),
+    path('articles/trending/', views.TrendingArticlesView.as_view(), name='trending'),
     path('articles/<slug>', views.ArticlesDetails.as_view(),  name='article-details'),
     path('articles/<slug>/comments/', views.CommentsListCreateView.as_view(), name='comments'),
     path('articles/<slug>/comments/<int:id>/', views.CommentsRetrieveUpdateDestroy.as_view(), name='comment-details'),
@@ -14,6 +16,7 @@ urlpatterns = [
     path('favourite/', views.FavoriteList.as_view(), name="favourite-list"),
     path('tags/', views.TagsView.as_view(), name='tags'),
     path('articles/<slug>/like/', views.ArticlesLikesDislikes.as_view(),  name='article-like'),
+    path('articles/<slug>/comments/<int:id>/thread/', views.CommentThreadView.as_view(), name='comment-thread'),
     path('articles/<slug>/comments/<int:id>/like', views.CommentLikes.as_view(), name='comment-like'),
     path('articles/<slug>/report/', views.ReportArticlesView.as_view(), name='report'),
     path('articles/statistics/', views.ArticleStatsView.as_view(),  name='stats'),
@@ -1,27 +1,32 @@
 import os
+from collections import OrderedDict
+from datetime import timedelta
 
 from django.conf import settings
 from django.core.mail import send_mail
-from django.db.models import Avg
+from django.db import transaction
+from django.http import StreamingHttpResponse
 from django.template.loader import render_to_string
-from rest_framework.filters import SearchFilter, OrderingFilter
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.text import slugify
+from rest_framework.filters import OrderingFilter
 from rest_framework.generics import (ListCreateAPIView,
                                      RetrieveUpdateDestroyAPIView,
                                      GenericAPIView,
                                      ListAPIView, CreateAPIView)
 from rest_framework.views import APIView
-from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticated, AllowAny
+from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticated, AllowAny, IsAdminUser
 from rest_framework.response import Response
 from django.contrib.auth.models import AnonymousUser
 from rest_framework import status
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from rest_framework.exceptions import NotFound, ValidationError
-from rest_framework.pagination import PageNumberPagination
 from django_filters.rest_framework import DjangoFilterBackend
 from django.conf import settings
 
-from .models import ArticlesModel, Comment, Rating, Favourite, Tags, LikesDislikes, CommentHistory, CommentLike, ArticleStat, ReportArticles, Highlighted
+from .models import ArticlesModel, ArticleCounters, Comment, Rating, Favourite, Tags, LikesDislikes, CommentHistory, CommentLike, ReportArticles, Highlighted, TrendingScore
 from .serializers import (ArticlesSerializers,
                           CommentsSerializers,
                           RatingSerializer,
@@ -31,6 +36,7 @@ from .serializers import (ArticlesSerializers,
                           LikesDislikesSerializer,
                           CommentsLikeSerializer,
                           CommentHistorySerializer,
+                          CommentTreeSerializer,
                           ReportArticlesSerializer,
                           ArticleStatSerializer,
                           HighlightedSerializer)
@@ -43,16 +49,46 @@ from .permissions import IsOwnerOrReadonly
 from .models import ArticlesModel
 from .serializers import ArticlesSerializers
 from .renderers import ArticlesRenderer
-from authors.apps.notifications.models import UserNotifications
-from .filters import ArticlesFilter
+from authors.apps.notifications.tasks import enqueue_article_notifications, enqueue_comment_notifications
+from .filters import ArticlesFilter, ArticleSearchFilter
+from .stats import view_buffer
+from .cache import AnonymousResponseCacheMixin, response_cache
+from .related import related_articles
+from .rollups import author_stats
+from .bulk import ArticleImporter, export_articles
+from .parsers import NDJSONParser
 from authors.apps.profiles.models import Profile
-from authors.apps.authentication.models import User
+from authors.apps.core.pagination import KeysetPagination, StandardPagination
 
 
-class StandardPagination(PageNumberPagination):
-    page_size = settings.PAGE_SIZE
-    page_size_query_param = 'page_size'
-    max_page_size = settings.MAX_PAGE_SIZE
+class OffsetArticlesPagination(StandardPagination):
+    # paged even when PAGE_SIZE is not set, as the keyset pages are
+    page_size = KeysetPagination.page_size
+
+
+class ArticlesPagination(KeysetPagination):
+    # ?page= links, client chosen orderings and search results, which are
+    # ordered by relevance, keep the offset pagination
+    fallback_class = OffsetArticlesPagination
+    fallback_params = ('page', 'ordering', 'search')
+
+
+class FavouritesPagination(KeysetPagination):
+    ordering = 'created_at'
+
+
+class TagsPagination(StandardPagination):
+    # paged even when PAGE_SIZE is not set
+    page_size = StandardPagination.page_size or 10
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('count', self.page.paginator.count),
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('tags', data),
+        ]))
+
 
 def get_article(slug):
     """
@@ -66,17 +102,42 @@ def get_article(slug):
     return article
 
 
-class ArticlesList(ListCreateAPIView):
-    queryset = ArticlesModel.objects.all()
+class ArticleFieldsMixin:
+    """
+    Lets a list of articles be limited to some fields with ?fields=title,slug
+    or ?view=summary, the columns and methods of the others are skipped
+    """
+    article_fields = None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method == 'GET':
+            self.article_fields = ArticlesSerializers.requested_fields(request.query_params)
+
+    def deferred_article_columns(self, prefix=''):
+        return [prefix + column for column in ArticlesSerializers.deferred_columns(self.article_fields)]
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['fields'] = self.article_fields
+        return context
+
+
+class ArticlesList(AnonymousResponseCacheMixin, ArticleFieldsMixin, ListCreateAPIView):
+    # Each page is serialized by ArticlesListSerializer, which loads the
+    # per-row counts in bulk, so only the joins it cannot batch are done here
+    queryset = ArticlesModel.objects.select_related('author__profile', 'counters')
     serializer_class = ArticlesSerializers
     permission_classes = (IsAuthenticatedOrReadOnly,)
-    pagination_class = StandardPagination
+    pagination_class = ArticlesPagination
     renderer_classes = (ArticlesRenderer,)
-    filter_backends = (SearchFilter, OrderingFilter, DjangoFilterBackend)
+    filter_backends = (ArticleSearchFilter, OrderingFilter, DjangoFilterBackend)
     filter_class = ArticlesFilter
-    search_fields = ('title', 'description', 'tags__tag', 'author__username')
     ordering_fields = ('title', 'author__username')
 
+    def get_queryset(self):
+        return super().get_queryset().defer(*self.deferred_article_columns())
+
     def post(self, request):
         article = request.data.get('article', {})
         serializer = self.serializer_class(
@@ -89,51 +150,17 @@ class ArticlesList(ListCreateAPIView):
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 @receiver(post_save, sender=ArticlesModel)
-# This receiver handles notification creation immediately a new article is created.
+# This receiver queues the notifications immediately a new article is created.
 def notification(sender, instance=None, created=None, **kwargs):
     """
-    Sends notification
+    Queues notifying the author's followers, the process_notifications
+    worker creates the notifications and sends the emails
     """
     if created == True:
-        username = instance.author.username
-        author = instance.author
-        title = instance.title
-        # domain for the application
-        current_domain = settings.DEFAULT_DOMAIN
-
-        # create a link for to the article
-        url = (current_domain + "/api/articles/" + str(instance.slug))
-        # get the followers
-        profile = author.profile
-        followers = profile.is_following.all()
-
-        # send notification
-        for follower in followers:
-            subscription = User.objects.get(username=follower).is_subcribed
-            if subscription == True:
-                follower_email = User.objects.get(username=follower)
-                email = str(follower_email)
-                notification = (username + " created a new article about " + title)
-                UserNotifications.objects.create(article=instance,
-                    notification = notification, author_id=instance.author.id, recipient_id=email, article_link=url)
-                name = User.objects.get(username=follower).username
-                # send email notification
-                body = render_to_string('notification.html', {
-                    'url': url,
-                    'notification': notification,
-                    'name': name
-                })
-                send_mail(
-                    'You have a new notification',
-                    'You have a new notification from authors haven',
-                    'authors-haven@authors-heaven.com',
-                    [email],
-                    html_message=body,
-                    fail_silently=False,
-                )
+        enqueue_article_notifications(instance)
 
-class ArticlesDetails(RetrieveUpdateDestroyAPIView):
-    queryset = ArticlesModel.objects.all()
+class ArticlesDetails(AnonymousResponseCacheMixin, RetrieveUpdateDestroyAPIView):
+    queryset = ArticlesModel.objects.select_related('counters')
     serializer_class = ArticlesSerializers
     renderer_classes = (ArticlesRenderer,)
     permission_classes = (IsAuthenticatedOrReadOnly, IsOwnerOrReadonly)
@@ -145,9 +172,11 @@ class ArticlesDetails(RetrieveUpdateDestroyAPIView):
         if isinstance(article, dict):
             raise ValidationError(detail={'artcle': 'No article found for the slug given'})
         if request.user and not isinstance(request.user, AnonymousUser):
-            ArticleStat.objects.create(user=request.user, article=article)
+            view_buffer.record(article.id, request.user.id)
 
-        return super().get(request, slug)
+        response = super().get(request, slug)
+        response.data['related'] = related_articles(article)
+        return response
 
     def put(self, request, slug):
         """This method overwrites the """
@@ -175,24 +204,141 @@ class ArticlesDetails(RetrieveUpdateDestroyAPIView):
 
 
 class TagsView(ListAPIView):
+    """
+    Lists the tags with their article counts, most used first unless
+    ?ordering=tag is given, ?prefix=py completes a partly typed tag
+    """
     queryset = Tags.objects.all()
     serializer_class = TagSerializers
     permission_classes = (IsAuthenticatedOrReadOnly,)
+    pagination_class = TagsPagination
+    filter_backends = (OrderingFilter,)
+    ordering_fields = ('article_count', 'tag')
+    ordering = ('-article_count', 'tag')
 
-    def list(self, request):
-        data = self.get_queryset()
-        serializer = self.serializer_class(data, many=True)
-        return Response({'tags': serializer.data}, status=status.HTTP_200_OK)
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        # tags are stored slugged, so the prefix is too
+        prefix = slugify(self.request.query_params.get('prefix', ''))
+        if prefix:
+            queryset = queryset.filter(tag__startswith=prefix)
+        return queryset
 
 
 class ArticleStatsView(ListAPIView):
+    """
+    Returns the statistics of the author's articles from ?since= to ?until=,
+    both ISO dates included and the last ARTICLE_STATS_DAYS by default: the
+    totals, the series by day and every article's lifetime counts along
+    with its events in the period. The days compacted into the daily
+    rollups are read from those, so the number of queries does not grow
+    with the number of articles or days.
+    """
     serializer_class = ArticleStatSerializer
 
     def get_queryset(self):
        """
        This method filters articles by authors
        """
-       return ArticlesModel.objects.filter(author=self.request.user)
+       return ArticlesModel.objects.filter(author=self.request.user).select_related('counters')
+
+    def get_period(self, request):
+        today = timezone.localdate()
+        period = {}
+        for param, default in (('until', today), ('since', None)):
+            value = request.query_params.get(param)
+            if value is None:
+                period[param] = default
+                continue
+            try:
+                period[param] = parse_date(value)
+            except ValueError:
+                period[param] = None
+            if period[param] is None:
+                raise ValidationError({param: ['Provide a date as YYYY-MM-DD.']})
+        since, until = period['since'], period['until']
+        if since is None:
+            since = until - timedelta(days=settings.ARTICLE_STATS_DAYS - 1)
+        if since > until:
+            raise ValidationError({'since': ['Provide a date before until.']})
+        if (until - since).days >= settings.ARTICLE_STATS_MAX_DAYS:
+            raise ValidationError({'since': ['Provide a range of at most {} days.'.format(
+                settings.ARTICLE_STATS_MAX_DAYS)]})
+        return since, until
+
+    def list(self, request, *args, **kwargs):
+        since, until = self.get_period(request)
+        # write out buffered views so the counts include them
+        view_buffer.flush()
+        totals, series, by_article = author_stats(request.user, since, until)
+        serializer = self.serializer_class(self.get_queryset(), many=True,
+                                           context={'request': request, 'periods': by_article})
+        return Response({
+            'since': since,
+            'until': until,
+            'totals': dict(totals, average_rating=totals['rating_sum'] / totals['ratings']
+                           if totals['ratings'] else None),
+            'series': [dict(fields, day=day) for day, fields in series.items()],
+            'articles': serializer.data,
+        })
+
+
+class ArticlesBulkView(APIView):
+    """
+    Lets admins move articles between environments as NDJSON, one article
+    per line (see bulk.py). GET streams every article out, or those of
+    ?author=, and POST imports the lines of the body, the articles without
+    an author being the admin's. ?notify=true also notifies the followers
+    of the imported articles, ?skip_existing=true skips the lines whose
+    slug is taken.
+    """
+    permission_classes = (IsAdminUser,)
+    parser_classes = (NDJSONParser,)
+
+    def flag(self, request, name, default):
+        return request.query_params.get(name, str(default)).lower() in ('true', '1', 'yes')
+
+    def get(self, request):
+        articles = ArticlesModel.objects.all()
+        if request.query_params.get('author'):
+            articles = articles.filter(author__username=request.query_params['author'])
+        return StreamingHttpResponse(export_articles(articles), content_type=NDJSONParser.media_type)
+
+    def post(self, request):
+        importer = ArticleImporter(author=request.user, notify=self.flag(request, 'notify', False),
+                                   skip_existing=self.flag(request, 'skip_existing', False))
+        importer.run(request.data)
+        if importer.created:
+            status_code = status.HTTP_201_CREATED
+        else:
+            status_code = status.HTTP_400_BAD_REQUEST if importer.errors else status.HTTP_200_OK
+        return Response({
+            'created': importer.created,
+            'skipped': importer.skipped,
+            'errors': [{'line': number, 'errors': errors} for number, errors in importer.errors],
+        }, status=status_code)
+
+
+class TrendingArticlesView(ListAPIView):
+    """
+    Lists the articles with the highest trending scores, read in order from
+    the score index, ?limit= picks how many
+    """
+    serializer_class = ArticlesSerializers
+    permission_classes = (AllowAny,)
+    renderer_classes = (ArticlesRenderer,)
+
+    def get(self, request):
+        limit = request.query_params.get('limit', settings.TRENDING_SIZE)
+        try:
+            limit = min(int(limit), settings.TRENDING_MAX_SIZE)
+        except ValueError:
+            raise ValidationError({'limit': ['Provide a whole number.']})
+        scores = TrendingScore.objects.order_by('-score', 'article').select_related(
+            'article__author__profile', 'article__counters')[:max(limit, 0)]
+        serializer = self.serializer_class(
+            [score.article for score in scores], many=True, context={'request': request})
+        return Response(serializer.data)
 
 
 class RatingDetails(GenericAPIView):
@@ -206,10 +352,17 @@ class RatingDetails(GenericAPIView):
         Returns a rating given the user id and the article id
         """
         try:
-            return Rating.objects.get(user=user, article=article)
+            return Rating.objects.select_for_update().get(user=user, article=article)
         except Rating.DoesNotExist:
             raise NotFound(detail={'rating': 'Rating not found'})
 
+    def update_counters(self, article, previous, current):
+        """
+        Applies a rating change to the article counters, previous or current
+        being None when the rating is created or deleted
+        """
+        ArticleCounters.objects.bump(article, **ArticleCounters.rating_deltas(previous, current))
+
     def get(self, request, slug):
         """
         Returns the authenticated user's rating on an article given
@@ -231,10 +384,11 @@ class RatingDetails(GenericAPIView):
             except Rating.DoesNotExist:
                 pass
         if rating is None:
-            avg = Rating.objects.filter(article=article).aggregate(Avg('rating'))
+            counters = article.get_counters()
             return Response({
                 'article': article.slug,
-                'avg_rating': avg['rating__avg']
+                'avg_rating': counters.avg_rating,
+                'ratings': counters.rating_histogram
             })
 
     def post(self, request, slug):
@@ -256,19 +410,23 @@ class RatingDetails(GenericAPIView):
         if article.author == request.user:
             raise ValidationError(
                 detail={'author': 'You cannot rate your own article'})
-        # users current rating exists?
-        try:
-            # if the rating exists, we update it
-            current_rating = Rating.objects.get(
-                user=request.user.id,
-                article=article.id
-            )
-            serializer = self.serializer_class(current_rating, data=rating)
-        except Rating.DoesNotExist:
-            # if it doesn't, create a new one
-            serializer = self.serializer_class(data=rating)
-        serializer.is_valid(raise_exception=True)
-        serializer.save(user=request.user, article=article)
+        with transaction.atomic():
+            # users current rating exists?
+            try:
+                # if the rating exists, we update it
+                current_rating = Rating.objects.select_for_update().get(
+                    user=request.user.id,
+                    article=article.id
+                )
+                previous = current_rating.rating
+                serializer = self.serializer_class(current_rating, data=rating)
+            except Rating.DoesNotExist:
+                # if it doesn't, create a new one
+                previous = None
+                serializer = self.serializer_class(data=rating)
+            serializer.is_valid(raise_exception=True)
+            serializer.save(user=request.user, article=article)
+            self.update_counters(article, previous, serializer.instance.rating)
 
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
@@ -281,12 +439,15 @@ class RatingDetails(GenericAPIView):
         if isinstance(article, dict):
             raise ValidationError(
                 detail={'artcle': 'No article found for the slug given'})
-        current_rating = self.get_rating(
-            user=request.user.id, article=article.id)
-        serializer = self.serializer_class(
-            current_rating, data=rating, partial=True)
-        serializer.is_valid(raise_exception=True)
-        serializer.save(user=request.user, article=article)
+        with transaction.atomic():
+            current_rating = self.get_rating(
+                user=request.user.id, article=article.id)
+            previous = current_rating.rating
+            serializer = self.serializer_class(
+                current_rating, data=rating, partial=True)
+            serializer.is_valid(raise_exception=True)
+            serializer.save(user=request.user, article=article)
+            self.update_counters(article, previous, serializer.instance.rating)
 
         return Response(serializer.data)
 
@@ -299,8 +460,10 @@ class RatingDetails(GenericAPIView):
             raise ValidationError(
                 detail={'artcle': 'No article found for the slug given'})
 
-        rating = self.get_rating(user=request.user, article=article)
-        rating.delete()
+        with transaction.atomic():
+            rating = self.get_rating(user=request.user, article=article)
+            rating.delete()
+            self.update_counters(article, rating.rating, None)
         return Response(
             {'message': 'Successfully deleted rating'},
             status=status.HTTP_200_OK
@@ -314,6 +477,7 @@ class CommentsListCreateView(ListCreateAPIView):
     queryset = Comment.objects.all()
     serializer_class = CommentsSerializers
     permission_classes = (IsAuthenticatedOrReadOnly,)
+    pagination_class = KeysetPagination
 
     def post(self, request, slug):
         """
@@ -328,62 +492,20 @@ class CommentsListCreateView(ListCreateAPIView):
         comment['article'] = article.pk
         serializer = self.serializer_class(data=comment)
         serializer.is_valid(raise_exception=True)
-        serializer.save(author=request.user)
+        with transaction.atomic():
+            serializer.save(author=request.user)
+            ArticleCounters.objects.bump(article, comments=1)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
     @receiver(post_save, sender=Comment)
-    # This receiver handles notification creation immediately a new article is created.
+    # This receiver queues the notifications immediately a new comment is created.
     def comment_notification(sender, instance=None, created=None, **kwargs):
         """
-        Sends notification
+        Queues notifying the readers who favourited the article, the
+        process_notifications worker creates the notifications and sends the emails
         """
         if created == True:
-            username = instance.author.username
-            author = instance.author
-            # domain for the application
-            current_domain = settings.DEFAULT_DOMAIN
-
-            # create a link to the article
-            url = (current_domain + "/api/articles/" + str(instance.article.slug))
-            # get the followers
-            recipients = User.objects.all().filter(is_subcribed=True)
-            # send notification
-            for recipient in recipients:
-                id_user = recipient.id
-                # check whether user has favorited article being commented
-                favourites = Favourite.objects.all().filter(user_id=id_user)
-                if len(favourites) == 0:
-                    return None
-                # if we have some favourites in our records
-                elif len(favourites) > 0:
-                    for favourite in favourites:
-                        # check whether there is a favourite for this article
-                        if favourite.article_id == instance.article.id:
-                            # fetch the user to notify
-                            recipient_email = User.objects.get(id=favourite.user_id)
-                            email = str(recipient_email)
-                            author_id = instance.author.id
-
-                            notification = (username + " commented on this article about " + instance.article.title)
-                            UserNotifications.objects.create(article=instance.article,
-                                                             notification=notification, author_id=author_id,
-                                                             recipient_id=email, article_link=url)
-
-                            name = User.objects.get(email=email).username
-                            # send email notification
-                            body = render_to_string('notification.html', {
-                                'url': url,
-                                'notification': notification,
-                                'name': name
-                            })
-                            send_mail(
-                                'You have a new notification',
-                                'You have a new notification from authors haven',
-                                'authors-haven@authors-heaven.com',
-                                [email],
-                                html_message=body,
-                                fail_silently=False,
-                            )
+            enqueue_comment_notifications(instance)
 
     def get(self, request, slug):
         """
@@ -392,15 +514,52 @@ class CommentsListCreateView(ListCreateAPIView):
         article = get_article(slug=slug)
         if isinstance(article, dict):
             return Response(article, status=status.HTTP_404_NOT_FOUND)
-        comments = article.comments.filter(parent=None)
-        serializer = self.serializer_class(comments.all(), context={'request': request}, many=True)
-        data = {
-            'count': comments.count(),
-            'comments': serializer.data
-        }
+        # The serializer loads the replies of the whole page at once
+        comments = self.paginate_queryset(
+            article.comments.filter(parent=None).select_related('author__profile'))
+        serializer = self.serializer_class(comments, context={'request': request}, many=True)
+        data = self.paginator.get_paginated_data(serializer.data, key='comments')
         return Response(data, status=status.HTTP_200_OK)
 
 
+class CommentThreadView(GenericAPIView):
+    """
+    Returns the replies under a comment at every depth, in one query on
+    the comment paths. ?depth=n only goes n levels down and ?since= only
+    returns the replies created after the given time
+    """
+    serializer_class = CommentTreeSerializer
+    permission_classes = (IsAuthenticatedOrReadOnly,)
+
+    def get(self, request, slug, id):
+        article = get_article(slug)
+        if isinstance(article, dict):
+            return Response(article, status=status.HTTP_404_NOT_FOUND)
+        comment = article.comments.filter(id=id).first()
+        if not comment:
+            message = {'detail': 'Comment not found.'}
+            return Response(message, status=status.HTTP_404_NOT_FOUND)
+
+        depth = request.query_params.get('depth')
+        if depth is not None:
+            if not depth.isdigit():
+                raise ValidationError({'depth': ['Depth must be a whole number.']})
+            depth = int(depth)
+        since = request.query_params.get('since')
+        if since is not None:
+            try:
+                since = parse_datetime(since)
+            except ValueError:
+                since = None
+            if since is None:
+                raise ValidationError({'since': ['Provide an ISO 8601 date and time.']})
+
+        replies = list(Comment.objects.subtree(comment, max_depth=depth, since=since)
+                       .select_related('author__profile'))
+        serializer = self.serializer_class(replies, many=True)
+        return Response({'comment': comment.id, 'count': len(replies), 'replies': serializer.data})
+
+
 class CommentsRetrieveUpdateDestroy(RetrieveUpdateDestroyAPIView, ListCreateAPIView):
     """
     Class for retrieving, updating and deleting a comment
@@ -433,7 +592,9 @@ class CommentsRetrieveUpdateDestroy(RetrieveUpdateDestroyAPIView, ListCreateAPIV
         serializer = self.serializer_class(
             data=data, context=context)
         serializer.is_valid(raise_exception=True)
-        serializer.save(author=request.user)
+        with transaction.atomic():
+            serializer.save(author=request.user)
+            ArticleCounters.objects.bump(article, comments=1)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
     def destroy(self, request, slug, id):
@@ -448,7 +609,11 @@ class CommentsRetrieveUpdateDestroy(RetrieveUpdateDestroyAPIView, ListCreateAPIV
         if not comment:
             message = {'detail': 'Comment not found.'}
             return Response(message, status=status.HTTP_404_NOT_FOUND)
-        comment[0].delete()
+        with transaction.atomic():
+            # replies are deleted along with the comment, so they are uncounted too
+            deleted, per_model = comment[0].delete()
+            ArticleCounters.objects.bump(
+                article, comments=-per_model.get(Comment._meta.label, 0))
         message = {'detail': 'You have deleted the comment'}
         return Response(message, status=status.HTTP_200_OK)
 
@@ -583,7 +748,9 @@ class FavouriteGenericAPIView(APIView):
         favourite["article"] = article.pk
         serializer = self.serializer_class(data=favourite)
         serializer.is_valid(raise_exception=True)
-        serializer.save()
+        with transaction.atomic():
+            serializer.save()
+            ArticleCounters.objects.bump(article, favourites=1)
         article_serializer = ArticlesSerializers(
             instance=article, context={'request': request})
         data = {"article": article_serializer.data}
@@ -609,37 +776,34 @@ class FavouriteGenericAPIView(APIView):
             raise NotFound(detail={"message": [
                 "you had not favourited this article"
             ]})
-        favourite.delete()
+        with transaction.atomic():
+            favourite.delete()
+            ArticleCounters.objects.bump(article, favourites=-1)
         article_serializer = ArticlesSerializers(
             instance=article, context={'request': request})
         data = {"article": article_serializer.data}
         data["message"] = "unfavourited"
         return Response(data, status.HTTP_200_OK)
 
-class FavoriteList(ListAPIView):
+class FavoriteList(ArticleFieldsMixin, ListAPIView):
     """
     Class for retrieving a list of favorite articles by one user
     """
     serializer_class = FavouriteListSerializer
     permission_classes = (IsAuthenticated,)
     renderer_classes = (ArticlesRenderer,)
+    pagination_class = FavouritesPagination
 
     def get(self, request):
         """
         Get all favorite articles
         """
-        try:
-            queryset = Favourite.objects.filter(user=request.user)
-        except Favourite.DoesNotExist:
-            message = Response(
-                    {
-                        'message': 'No favorites found'
-                    },
-                    status=status.HTTP_404_NOT_FOUND
-                )
-        if queryset:
-            serializer = FavouriteListSerializer(queryset, many=True, context={'request': request})
-            return Response(serializer.data, status=status.HTTP_200_OK)
+        page = self.paginate_queryset(Favourite.objects.filter(user=request.user)
+                                      .select_related('article__author__profile', 'article__counters')
+                                      .defer(*self.deferred_article_columns('article__')))
+        if page or self.paginator.has_previous:
+            serializer = FavouriteListSerializer(page, many=True, context=self.get_serializer_context())
+            return self.get_paginated_response(serializer.data)
         else:
             return Response(
                     {
@@ -657,159 +821,66 @@ class ArticlesLikesDislikes(GenericAPIView):
     serializer_class = LikesDislikesSerializer
     permission_classes = (IsAuthenticatedOrReadOnly, IsOwnerOrReadonly)
 
+    def get_article(self, slug):
+        # only what the checks and the counters need, not the body
+        return ArticlesModel.objects.only('id', 'slug', 'author_id').filter(slug=slug).first()
+
     def post(self, request, slug):
         # Check if the article exists in the database
-        article = get_article(slug)
-
-        if isinstance(article, dict):
-            return Response(article, status=status.HTTP_404_NOT_FOUND)
+        article = self.get_article(slug)
+        if article is None:
+            return Response({'message': 'Article slug is not valid.'}, status=status.HTTP_404_NOT_FOUND)
 
         like = request.data.get('likes', None)
 
         # Check if the data in the request a valid boolean
-        if type(like) == bool:
-
-            # Check if the article belongs to the current user
-            if article.author == request.user:
-                message = {'detail': 'You cannot like/unlike your own article'}
-                return Response(message, status=status.HTTP_400_BAD_REQUEST)
-            like_data = {
-                'reader': request.user.id,
-                'article': article.id,
-                'likes': like
-            }
-
-            try:
-                # Verify if the instance of the article and the user
-                # exist in the database and get the like
-                user_likes = LikesDislikes.objects.get(
-                    article=article.id, reader=request.user.id)
-
-                # if an instance of the user and article both exist in the database
-                # we update the existing data instead of creating a new one
-                if user_likes:
-                    # check if the stored data and the request data are the same
-                    # and both true
-                    if user_likes.likes and like:
-                        return Response(
-                            {
-                                'detail': '{}, you have already liked this article.'
-                                .format(request.user.username)
-                            },
-                            status=status.HTTP_400_BAD_REQUEST
-                        )
-
-                    # check if the stored data and the request data are the same
-                    # and both false
-                    elif not user_likes.likes and not like:
-                        return Response(
-                            {
-                                'detail': '{}, you have already disliked this article.'
-                                .format(request.user.username)
-                            },
-                            status=status.HTTP_400_BAD_REQUEST
-                        )
-
-                    # check if the stored data and the request data are different
-                    # one true and the other false
-                    elif like and not user_likes.likes:
-                        user_likes.likes = True
-                        user_likes.save()
-                        article.likes.add(request.user)
-                        article.dislikes.remove(request.user)
-                        article.save()
-                        return Response(
-                            {
-                                'detail': '{}, you have liked this article.'
-                                .format(request.user.username)
-                            },
-                            status=status.HTTP_200_OK
-
-                        )
-
-                    else:
-                        user_likes.likes = False
-                        user_likes.save()
-                        article.likes.remove(request.user)
-                        article.dislikes.add(request.user)
-                        article.save()
-                        return Response(
-                            {
-                                'detail': '{}, you have disliked this article.'
-                                .format(request.user.username)
-                            },
-                            status=status.HTTP_200_OK
-                        )
-
-            except LikesDislikes.DoesNotExist:
-                # Create and save a new like object since one does not exist
-                serializer = self.serializer_class(data=like_data)
-                serializer.is_valid(raise_exception=True)
-                serializer.save(article=article, reader=request.user)
-
-                # if the request data is true, we update the article
-                # with the new data
-                if like:
-                    article.likes.add(request.user)
-                    article.save()
-                    return Response(
-                        {
-                            'detail': '{}, you have liked this article.'
-                                .format(request.user.username)
-                        },
-                        status=status.HTTP_201_CREATED
-                    )
-
-                # if the request data is false, we update the article
-                # with the new data
-                else:
-                    article.dislikes.add(request.user)
-                    article.save()
-                    return Response(
-                        {
-                            'detail': '{}, you have disliked this article.'
-                                .format(request.user.username)
-                        }
-                        , status=status.HTTP_201_CREATED
-                    )
-        else:
-
+        if type(like) != bool:
             return Response(
                 {
                     'detail': 'Please indicate whether you like/dislike this article.'
                 }, status=status.HTTP_400_BAD_REQUEST
             )
 
+        # Check if the article belongs to the current user
+        if article.author_id == request.user.id:
+            message = {'detail': 'You cannot like/unlike your own article'}
+            return Response(message, status=status.HTTP_400_BAD_REQUEST)
+
+        # Sets the reaction and the counters without reading them first
+        previous = LikesDislikes.objects.react(article, request.user, like)
+        reaction = 'liked' if like else 'disliked'
+        if previous == like:
+            return Response(
+                {
+                    'detail': '{}, you have already {} this article.'
+                    .format(request.user.username, reaction)
+                },
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        # switching a reaction is an update() without signals, so the
+        # reactions invalidate the article here rather than from receivers
+        response_cache.invalidate_article(article.slug)
+        return Response(
+            {
+                'detail': '{}, you have {} this article.'
+                .format(request.user.username, reaction)
+            },
+            status=status.HTTP_201_CREATED if previous is None else status.HTTP_200_OK
+        )
+
     def delete(self, request, slug):
         # Check if the article exists in the database
-        article = get_article(slug)
+        article = self.get_article(slug)
+        if article is None:
+            return Response({'message': 'Article slug is not valid.'}, status=status.HTTP_404_NOT_FOUND)
 
-        if isinstance(article, dict):
-            return Response(article, status=status.HTTP_404_NOT_FOUND)
-
-        try:
-            # Verify if the instance of the article and the user
-            # exist in the database and get the like
-            user_like = LikesDislikes.objects.get(
-                article=article.id, reader=request.user.id)
-            if user_like:
-                if user_like.likes:
-                    # If like field in the database is true we remove the count
-                    # from the likes field of the article and save the current state
-                    article.likes.remove(request.user)
-                    article.save()
-                else:
-                    # If like field in the database is false we remove the count
-                    # from the dislikes field of the article and save the current state
-                    article.dislikes.remove(request.user)
-                    article.save()
-        except LikesDislikes.DoesNotExist:
+        if LikesDislikes.objects.withdraw(article, request.user) is None:
             return Response(
                 {
                     'detail': 'Likes/dislikes not found.'
                 }, status=status.HTTP_404_NOT_FOUND
             )
-        user_like.delete()
+        response_cache.invalidate_article(article.slug)
         return Response(
             {
                 'detail': '{}, your reaction has been deleted successfully.'
@@ -828,83 +899,19 @@ class CommentLikes(GenericAPIView):
     serializer_class = CommentsLikeSerializer
     permission_classes = (IsAuthenticatedOrReadOnly, IsOwnerOrReadonly)
 
+    def get_comment(self, id):
+        return Comment.objects.only('id', 'author_id').filter(id=id).first()
+
     def post(self, request, slug, id):
         #Check if a comment exists in the database
-
-        comment = Comment.objects.filter(id=id).first()
+        comment = self.get_comment(id)
+        if comment is None:
+            return Response({'detail': 'Comment not found.'}, status=status.HTTP_404_NOT_FOUND)
 
         like = request.data.get('comment_likes', None)
 
         #Check if the data in the request a valid boolean
-        if type(like) == bool:
-
-            #Check if the comment belongs to the current user
-            if comment.author == request.user:
-                message = {'detail': 'You cannot like/unlike your own comment'}
-                return Response(message, status=status.HTTP_400_BAD_REQUEST)
-            like_data = {
-                'commentor': request.user.id,
-                'specific_comment': comment.id,
-                'comment_likes': like
-            }
-
-            try:
-                #Verify if the instance of the comment and the user
-                #exist in the database and get the like
-                user_likes = CommentLike.objects.get(specific_comment=comment.id, commentor=request.user.id)
-
-                #if an instance of the user and comment both exist in the database
-                #we update the existing data instead of creating a new one
-                if user_likes:
-                    #check if the stored data and the request data are the same
-                    #and both true
-                    if user_likes.comment_likes and like:
-                        return Response(
-                            {
-                                'detail':'{}, you have already liked this comment.'
-                                .format(request.user.username)
-                            },
-                            status=status.HTTP_400_BAD_REQUEST
-                        )
-
-                    #check if the stored data and the request data are different
-                    #one true and the other false
-                    elif like and not user_likes.comment_likes:
-                        user_likes.comment_likes = True
-                        user_likes.save()
-                        comment.comment_likes.add(request.user)
-                        comment.save()
-                        return Response(
-                            {
-                                'detail': '{}, you have liked this comment.'
-                                .format(request.user.username)
-                            },
-                            status=status.HTTP_200_OK
-                        )
-
-            except CommentLike.DoesNotExist:
-                #Create and save a new like object since one does not exist
-                serializer=self.serializer_class(data=like_data)
-                serializer.is_valid(raise_exception=True)
-                serializer.save(specific_comment=comment, commentor=request.user)
-
-                #if the request data is true, we update the article
-                #with the new data
-                if like:
-                    comment.comment_likes.add(request.user)
-                    comment.save()
-                    return Response(
-                        {
-                            'detail': '{}, you have liked this comment.'
-                            .format(request.user.username)
-                        },
-                        status=status.HTTP_201_CREATED
-                    )
-
-                #if the request data is false, we update the article
-                #with the new data
-        else:
-
+        if type(like) != bool:
             return Response(
                 {
                     'detail': 'Please indicate whether you likethis article.'
@@ -912,32 +919,42 @@ class CommentLikes(GenericAPIView):
                 , status=status.HTTP_400_BAD_REQUEST
             )
 
+        #Check if the comment belongs to the current user
+        if comment.author_id == request.user.id:
+            message = {'detail': 'You cannot like/unlike your own comment'}
+            return Response(message, status=status.HTTP_400_BAD_REQUEST)
+
+        previous = CommentLike.objects.react(comment, request.user, like)
+        reaction = 'liked' if like else 'unliked'
+        if previous == like:
+            return Response(
+                {
+                    'detail':'{}, you have already {} this comment.'
+                    .format(request.user.username, reaction)
+                },
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response(
+            {
+                'detail': '{}, you have {} this comment.'
+                .format(request.user.username, reaction)
+            },
+            status=status.HTTP_201_CREATED if previous is None else status.HTTP_200_OK
+        )
+
     def delete(self, request, slug, id):
         #Check if the comment exists in the database
+        comment = self.get_comment(id)
+        if comment is None:
+            return Response({'detail': 'Comment not found.'}, status=status.HTTP_404_NOT_FOUND)
 
-        comment = Comment.objects.filter(id=id).first()
-        if isinstance(comment, dict):
-            return Response(comment, status=status.HTTP_404_NOT_FOUND)
-
-        try:
-            #Verify if the instance of the comment and the user
-            #exist in the database and get the like
-            user_like = CommentLike.objects.get(specific_comment=comment.id, commentor=request.user.id)
-            if user_like:
-                if user_like.comment_likes:
-                    #If like field in the database is true we remove the count
-                    #from the likes field of the article and save the current state
-                    comment.comment_likes.remove(request.user)
-                    comment.save()
-
-        except CommentLike.DoesNotExist:
+        if CommentLike.objects.withdraw(comment, request.user) is None:
             return Response(
                 {
                     'detail': 'Likes not found.'
                 }
                 , status=status.HTTP_404_NOT_FOUND
             )
-        user_like.delete()
         return Response(
                 {
                     'detail': '{}, your like has been deleted successfully.'
@@ -1,10 +1,97 @@
+import threading
+import time
+from collections import OrderedDict
+
 import jwt
 from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from rest_framework import authentication
 from rest_framework.exceptions import AuthenticationFailed
 from .models import User
 
 
+class TokenUserCache:
+    """
+    A bounded, per-process LRU cache of verified tokens to the user row
+    they were issued for, so an authenticated request costs no queries on a hit.
+
+    Entries live for JWT_CACHE_TTL seconds, never past the token's own
+    expiry, and are dropped whenever the user is saved or deleted. The
+    hits, misses and evictions counters returned by stats() show whether
+    JWT_CACHE_SIZE is large enough.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, key):
+        """Returns a fresh User instance for the token, or None on a miss"""
+        now = time.time()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self.entries[key]
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            expires, user_id, email, db, values = entry
+        # Every request gets its own instance, so nothing cached on one
+        # request's user (e.g. its profile) leaks into another's
+        return User.from_db(db, self.field_names(), values)
+
+    def set(self, key, user, token_expiry):
+        """Caches the user for the token until the TTL or the token expires"""
+        expires = min(time.time() + settings.JWT_CACHE_TTL, token_expiry)
+        values = tuple(getattr(user, field) for field in self.field_names())
+        with self.lock:
+            self.entries[key] = (expires, user.pk, user.email, user._state.db, values)
+            self.entries.move_to_end(key)
+            while len(self.entries) > settings.JWT_CACHE_SIZE:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate_user(self, user):
+        """Drops every cached token of the user, or of their email"""
+        with self.lock:
+            stale = [key for key, entry in self.entries.items()
+                     if entry[1] == user.pk or entry[2] == user.email]
+            for key in stale:
+                del self.entries[key]
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        with self.lock:
+            return {
+                'size': len(self.entries),
+                'max_size': settings.JWT_CACHE_SIZE,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+    @staticmethod
+    def field_names():
+        return [field.attname for field in User._meta.concrete_fields]
+
+
+token_cache = TokenUserCache()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_tokens(sender, instance=None, **kwargs):
+    """Makes the next request re-read a user who was changed, e.g. deactivated"""
+    token_cache.invalidate_user(instance)
+
 
 """Configure JWT Here"""
 class JWTAuthentication(authentication.BaseAuthentication):
@@ -25,6 +112,14 @@ class JWTAuthentication(authentication.BaseAuthentication):
         if not token:
             return None
 
+        # A token seen recently has already been verified, so it is looked
+        # up without decoding it again. The whole token is the key rather
+        # than just its signature, so the signature of a valid token can't
+        # be reused with another header or payload.
+        user = token_cache.get(token)
+        if user is not None:
+            return (user, token)
+
         # Attempt decoding the token
         try:
             payload = jwt.decode(token, settings.SECRET_KEY)
@@ -41,4 +136,5 @@ class JWTAuthentication(authentication.BaseAuthentication):
         if not user.is_active:
             raise AuthenticationFailed('This user is deactivated')
 
+        token_cache.set(token, user, payload.get('exp', float('inf')))
         return (user, token)
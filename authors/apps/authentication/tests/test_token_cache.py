@@ -0,0 +1,53 @@
+from rest_framework.test import APITestCase, APIRequestFactory
+
+from authors.apps.authentication.backends import JWTAuthentication, token_cache
+from authors.apps.authentication.models import User
+
+
+class TokenCacheTest(APITestCase):
+    """
+    Tests for the cached JWT authentication
+    """
+
+    def setUp(self):
+        token_cache.clear()
+        self.addCleanup(token_cache.clear)
+        self.user = User.objects.create_user('janeDoe', 'jane@doe.com', 'janedoe123')
+        self.user.is_active = True
+        self.user.save()
+        self.request = APIRequestFactory().get('/', HTTP_AUTHORIZATION=self.user.token)
+
+    def authenticate(self):
+        return JWTAuthentication().authenticate(self.request)
+
+    def test_cache_hit_needs_no_queries(self):
+        self.authenticate()
+        with self.assertNumQueries(0):
+            user, _ = self.authenticate()
+        self.assertEqual(user.pk, self.user.pk)
+        self.assertEqual(token_cache.stats()['hits'], 1)
+        self.assertEqual(token_cache.stats()['misses'], 1)
+
+    def test_each_hit_returns_a_separate_instance(self):
+        first, _ = self.authenticate()
+        second, _ = self.authenticate()
+        self.assertIsNot(first, second)
+
+    def test_saving_the_user_invalidates_the_cache(self):
+        self.authenticate()
+        self.user.is_active = False
+        self.user.save()
+        with self.assertRaisesMessage(Exception, 'This user is deactivated'):
+            self.authenticate()
+
+    def test_cache_is_bounded(self):
+        with self.settings(JWT_CACHE_SIZE=1):
+            self.authenticate()
+            other = User.objects.create_user('johnDoe', 'john@doe.com', 'johndoe123')
+            other.is_active = True
+            other.save()
+            JWTAuthentication().authenticate(
+                APIRequestFactory().get('/', HTTP_AUTHORIZATION=other.token))
+            stats = token_cache.stats()
+        self.assertEqual(stats['size'], 1)
+        self.assertEqual(stats['evictions'], 1)
@@ -0,0 +1,145 @@
+import base64
+import json
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class StandardPagination(PageNumberPagination):
+    # The sizes come from the environment as strings
+    page_size = settings.PAGE_SIZE and int(settings.PAGE_SIZE)
+    page_size_query_param = 'page_size'
+    max_page_size = settings.MAX_PAGE_SIZE and int(settings.MAX_PAGE_SIZE)
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginates on (created_at, id) instead of an offset, so every page is
+    one index range scan however deep it is.
+
+    The cursor in the next and previous links encodes the position of the
+    last or first row of the page. ?count=false skips the COUNT(*) of the
+    whole list, which is then left out of the response.
+    Requests carrying one of the fallback_params (e.g ?ordering=title) are
+    paginated by fallback_class instead, as keyset pages only follow one order.
+    """
+    page_size = StandardPagination.page_size or 10
+    page_size_query_param = 'page_size'
+    max_page_size = StandardPagination.max_page_size
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    ordering = '-created_at'
+    fallback_class = None
+    fallback_params = ()
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.fallback = None
+        if self.fallback_class and any(
+                param in request.query_params for param in self.fallback_params):
+            self.fallback = self.fallback_class()
+            return self.fallback.paginate_queryset(queryset, request, view)
+
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.count = queryset.count() if self.get_with_count(request) else None
+
+        field = self.ordering.lstrip('-')
+        descending = self.ordering.startswith('-')
+        cursor = self.decode_cursor(request)
+        backwards = cursor is not None and cursor[0]
+        if cursor is not None:
+            value, pk = cursor[1:]
+            lookup = 'lt' if descending != backwards else 'gt'
+            queryset = queryset.filter(
+                Q(**{'{}__{}'.format(field, lookup): value}) |
+                Q(**{field: value, 'id__{}'.format(lookup): pk}))
+        # A previous page is read backwards from the cursor, then flipped
+        if descending == backwards:
+            queryset = queryset.order_by(field, 'id')
+        else:
+            queryset = queryset.order_by('-' + field, '-id')
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        self.page = rows[:self.page_size]
+        if backwards:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None
+        return self.page
+
+    def get_page_size(self, request):
+        page_size = self.page_size
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            pass
+        if page_size < 1:
+            page_size = self.page_size
+        if self.max_page_size:
+            page_size = min(page_size, self.max_page_size)
+        return page_size
+
+    def get_with_count(self, request):
+        return request.query_params.get(self.count_query_param, '').lower() not in ('false', '0', 'no')
+
+    def decode_cursor(self, request):
+        """Returns the (backwards, created_at, id) of the cursor, if any"""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            backwards, value, pk = json.loads(
+                base64.urlsafe_b64decode(encoded.encode('ascii')).decode('utf-8'))
+            value = parse_datetime(value)
+            if value is None:
+                raise ValueError
+            return bool(backwards), value, int(pk)
+        except (TypeError, ValueError, UnicodeError):
+            raise NotFound('Invalid cursor.')
+
+    def encode_cursor(self, backwards, row):
+        value = getattr(row, self.ordering.lstrip('-')).isoformat()
+        encoded = base64.urlsafe_b64encode(
+            json.dumps([backwards, value, row.id]).encode('utf-8')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if self.fallback:
+            return self.fallback.get_next_link()
+        if not (self.has_next and self.page):
+            return None
+        return self.encode_cursor(False, self.page[-1])
+
+    def get_previous_link(self):
+        if self.fallback:
+            return self.fallback.get_previous_link()
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(True, self.page[0])
+
+    def get_paginated_data(self, data, key='results'):
+        """Returns the page envelope, with the rows under the given key"""
+        if self.fallback:
+            count = self.fallback.page.paginator.count
+        else:
+            count = self.count
+        envelope = OrderedDict()
+        if count is not None:
+            envelope['count'] = count
+        envelope['next'] = self.get_next_link()
+        envelope['previous'] = self.get_previous_link()
+        envelope[key] = data
+        return envelope
+
+    def get_paginated_response(self, data):
+        return Response(self.get_paginated_data(data))
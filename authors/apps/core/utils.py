@@ -0,0 +1,10 @@
+from itertools import islice
+
+
+def chunked(items, size):
+    """Yields lists of at most size items"""
+    items = iter(items)
+    chunk = list(islice(items, size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(items, size))
@@ -0,0 +1,32 @@
+# Generated by Django 2.2.28 on 2026-10-18 11:41
+
+from django.conf import settings
+from django.db import migrations
+
+
+def backfill_timelines(apps, schema_editor):
+    """Fills the timelines of the existing follows with the authors' newest articles"""
+    Follow = apps.get_model('profiles', 'Follow')
+    ArticlesModel = apps.get_model('articles', 'ArticlesModel')
+    TimelineEntry = apps.get_model('feed', 'TimelineEntry')
+
+    follows = Follow.objects.values_list('follower__user_id', 'followed__user_id').iterator()
+    for user_id, author_id in follows:
+        articles = (ArticlesModel.objects.filter(author_id=author_id).order_by('-created_at', '-id')
+                    .values_list('id', 'created_at')[:settings.FEED_BACKFILL_SIZE])
+        TimelineEntry.objects.bulk_create([
+            TimelineEntry(user_id=user_id, article_id=article_id, author_id=author_id, created_at=created_at)
+            for article_id, created_at in articles
+        ], ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feed', '0001_timelineentry'),
+        ('profiles', '0009_profile_following_through_follow'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_timelines, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,117 @@
+from django.conf import settings
+from django.db import models
+from django.db.models import Max, Q
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from authors.apps.articles.models import ArticlesModel
+from authors.apps.authentication.models import User
+from authors.apps.profiles.models import Profile, Follow
+
+
+class TimelineManager(models.Manager):
+    """
+    Keeps every reader's timeline: the articles of the authors they follow,
+    written when an author publishes so a feed page is read from one index
+    """
+
+    def add(self, user_ids, articles):
+        """Adds the articles to the timelines, skipping the ones already there"""
+        self.bulk_create([
+            TimelineEntry(user_id=user_id, article_id=article.id, author_id=article.author_id,
+                          created_at=article.created_at)
+            for user_id in user_ids for article in articles
+        ], ignore_conflicts=True)
+
+    def fan_out(self, article):
+        """
+        Adds a new article to the timelines of the author's followers, a
+        chunk of followers at a time. Authors followed by more than
+        FEED_FANOUT_LIMIT readers are skipped, their readers pull the
+        articles when they read the feed instead.
+        """
+        if Profile.objects.filter(user=article.author_id,
+                                  followers_count__gt=settings.FEED_FANOUT_LIMIT).exists():
+            return False
+        follows = Follow.objects.filter(followed__user=article.author_id).order_by('id')
+        last_id = 0
+        while True:
+            chunk = list(follows.filter(id__gt=last_id).values_list(
+                'id', 'follower__user_id')[:settings.NOTIFICATION_CHUNK_SIZE])
+            if not chunk:
+                return True
+            last_id = chunk[-1][0]
+            self.add([user_id for _, user_id in chunk], [article])
+
+    def backfill(self, user_id, author_id):
+        """Adds the newest articles of a newly followed author"""
+        articles = ArticlesModel.objects.filter(author_id=author_id).only(
+            'id', 'author_id', 'created_at').order_by('-created_at', '-id')
+        self.add([user_id], articles[:settings.FEED_BACKFILL_SIZE])
+
+    def trim(self, user_id, author_id):
+        """Takes the articles of an unfollowed author out of the timeline"""
+        self.filter(user_id=user_id, author_id=author_id).delete()
+
+    def pull(self, user):
+        """
+        Adds the articles the reader's followed authors published since the
+        last pull, for the authors too popular to be fanned out to
+        """
+        followed_since = dict(Follow.objects.filter(
+            follower__user=user, followed__followers_count__gt=settings.FEED_FANOUT_LIMIT
+        ).values_list('followed__user_id', 'created_at'))
+        if not followed_since:
+            return
+        latest = dict(self.filter(user=user, author_id__in=followed_since).order_by()
+                      .values_list('author_id').annotate(Max('created_at')))
+        since = Q()
+        for author_id, followed_at in followed_since.items():
+            # older articles were backfilled when the author was followed
+            newest = latest.get(author_id)
+            if newest is None or newest < followed_at:
+                newest = followed_at
+            since |= Q(author_id=author_id, created_at__gt=newest)
+        self.add([user.id], ArticlesModel.objects.filter(since).only('id', 'author_id', 'created_at'))
+
+
+class TimelineEntry(models.Model):
+    """
+    An article in a reader's timeline, with the author to trim it by and
+    the article's creation time to page it by
+    """
+    user = models.ForeignKey(User, related_name='timeline', on_delete=models.CASCADE)
+    article = models.ForeignKey(ArticlesModel, related_name='timeline_entries', on_delete=models.CASCADE)
+    author = models.ForeignKey(User, related_name='+', on_delete=models.CASCADE)
+    created_at = models.DateTimeField()
+
+    objects = TimelineManager()
+
+    class Meta:
+        unique_together = ('user', 'article')
+        indexes = [
+            # the feed is paged on (created_at, id)
+            models.Index(fields=['user', 'created_at', 'id'], name='timeline_user_page_idx'),
+            models.Index(fields=['user', 'author'], name='timeline_user_author_idx'),
+        ]
+
+
+def follow_users(follow):
+    """Returns the user ids of the follower and the followed profile"""
+    users = dict(Profile.objects.filter(id__in=[follow.follower_id, follow.followed_id])
+                 .values_list('id', 'user_id'))
+    return users.get(follow.follower_id), users.get(follow.followed_id)
+
+
+@receiver(post_save, sender=Follow)
+def backfill_timeline(sender, instance, created, **kwargs):
+    if created:
+        TimelineEntry.objects.backfill(*follow_users(instance))
+
+
+@receiver(post_delete, sender=Follow)
+def trim_timeline(sender, instance, **kwargs):
+    user_id, author_id = follow_users(instance)
+    # when a profile is deleted its timeline goes with its user
+    if user_id is not None and author_id is not None:
+        TimelineEntry.objects.trim(user_id, author_id)
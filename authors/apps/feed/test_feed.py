@@ -0,0 +1,82 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import override_settings
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+
+from authors.apps.articles.models import ArticlesModel
+from authors.apps.authentication.models import User
+from authors.apps.feed.models import TimelineEntry
+
+
+class FeedTest(APITestCase):
+    """
+    Tests for the timelines behind the feed of followed authors
+    """
+
+    def setUp(self):
+        self.reader, self.author, self.stranger = [
+            User.objects.create_user(name, name + '@test.com', 'password')
+            for name in ('reader', 'author', 'stranger')]
+        self.reader.profile.follow(self.author.profile)
+        self.client.force_authenticate(self.reader)
+        self.url = reverse('feed:feed')
+
+    def publish(self, author, title='An article'):
+        return ArticlesModel.objects.create(title=title, description='description', body='body', author=author)
+
+    def run_worker(self):
+        call_command('process_notifications', '--once', '--workers', '1', stdout=StringIO())
+
+    def feed(self, **params):
+        return [article['title'] for article in self.client.get(self.url, params).data['articles']]
+
+    def test_published_articles_are_written_to_the_followers_timelines(self):
+        self.publish(self.author, 'first')
+        self.publish(self.stranger, 'elsewhere')
+        self.publish(self.author, 'second')
+        self.assertEqual(self.feed(), [])
+        self.run_worker()
+        self.assertEqual(self.feed(), ['second', 'first'])
+
+    def test_following_backfills_and_unfollowing_trims(self):
+        self.publish(self.stranger, 'older')
+        self.reader.profile.follow(self.stranger.profile)
+        self.assertEqual(self.feed(), ['older'])
+        self.reader.profile.unfollow(self.stranger.profile)
+        self.assertEqual(self.feed(), [])
+        self.assertFalse(TimelineEntry.objects.filter(author=self.stranger).exists())
+
+    @override_settings(FEED_FANOUT_LIMIT=0)
+    def test_popular_authors_are_pulled_when_reading(self):
+        self.publish(self.author, 'popular')
+        self.run_worker()
+        self.assertFalse(TimelineEntry.objects.exists())
+        self.assertEqual(self.feed(), ['popular'])
+        self.publish(self.author, 'again')
+        self.assertEqual(self.feed(), ['again', 'popular'])
+        self.assertEqual(TimelineEntry.objects.filter(user=self.reader).count(), 2)
+
+    def test_pages_cost_the_same_however_long_the_timeline(self):
+        self.publish(self.author)
+        self.run_worker()
+        self.client.get(self.url)
+        # the popular authors, the count, the page and the article batches
+        with self.assertNumQueries(7):
+            self.client.get(self.url)
+        for i in range(6):
+            self.publish(self.author, 'article {}'.format(i))
+        self.run_worker()
+        with self.assertNumQueries(7):
+            response = self.client.get(self.url)
+        self.assertEqual(response.data['count'], 7)
+
+    def test_pages_follow_the_cursor(self):
+        for i in range(3):
+            self.publish(self.author, 'article {}'.format(i))
+        self.run_worker()
+        response = self.client.get(self.url, {'page_size': 2})
+        self.assertEqual([article['title'] for article in response.data['articles']], ['article 2', 'article 1'])
+        response = self.client.get(response.data['next'])
+        self.assertEqual([article['title'] for article in response.data['articles']], ['article 0'])
@@ -0,0 +1,8 @@
+from django.urls import path
+from .views import FeedAPIView
+
+app_name = 'feed'
+
+urlpatterns = [
+    path('feed/', FeedAPIView.as_view(), name='feed'),
+]
@@ -0,0 +1,26 @@
+from rest_framework import generics
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from authors.apps.articles.serializers import ArticlesSerializers
+from authors.apps.core.pagination import KeysetPagination
+from .models import TimelineEntry
+
+
+class FeedAPIView(generics.ListAPIView):
+    """
+    Lists the articles of the authors the user follows, newest first, from
+    the user's timeline
+    """
+    renderer_classes = (JSONRenderer,)
+    permission_classes = (IsAuthenticated,)
+    pagination_class = KeysetPagination
+
+    def get(self, request, format=None):
+        TimelineEntry.objects.pull(request.user)
+        entries = TimelineEntry.objects.filter(user=request.user).select_related(
+            'article__author__profile', 'article__counters')
+        articles = [entry.article for entry in self.paginate_queryset(entries)]
+        serializer = ArticlesSerializers(articles, many=True, context={'request': request})
+        return Response(self.paginator.get_paginated_data(serializer.data, key='articles'))
@@ -0,0 +1,55 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from authors.apps.notifications.tasks import claim_jobs, run_job
+
+
+class Command(BaseCommand):
+    """
+    Worker that claims queued notification jobs and runs them on a pool
+    of threads, polling for new jobs until stopped
+    """
+    help = 'Run queued notification fan-out jobs'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', type=int, default=settings.NOTIFICATION_WORKERS,
+            help='Number of jobs to run at the same time')
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Exit once the queue is empty instead of polling')
+        parser.add_argument(
+            '--poll-interval', type=float, default=2,
+            help='Seconds to wait before checking an empty queue again')
+
+    def handle(self, *args, **options):
+        workers = options['workers']
+        done = failed = 0
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            while True:
+                jobs = claim_jobs(limit=workers * 2)
+                if not jobs:
+                    if options['once']:
+                        break
+                    time.sleep(options['poll_interval'])
+                    continue
+                if workers == 1:
+                    # run in this thread, and so in this database connection
+                    results = [run_job(job) for job in jobs]
+                else:
+                    results = list(pool.map(self.run_in_thread, jobs))
+                done += results.count(True)
+                failed += results.count(False)
+        self.stdout.write(self.style.SUCCESS(
+            'Ran {} notification job(s), {} failed'.format(done, failed)))
+
+    def run_in_thread(self, job):
+        try:
+            return run_job(job)
+        finally:
+            # each pool thread has its own connection, don't leave it open
+            connection.close()
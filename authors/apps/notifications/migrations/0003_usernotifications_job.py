@@ -0,0 +1,24 @@
+# Generated by Django 2.2.28 on 2026-10-18 10:26
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0002_notificationjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='usernotifications',
+            name='job',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='notifications', to='notifications.NotificationJob'),
+        ),
+        migrations.AlterField(
+            model_name='notificationjob',
+            name='kind',
+            field=models.CharField(choices=[('article', 'New article'), ('comment', 'New comment')], max_length=20),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 2.2.28 on 2026-10-18 10:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0003_usernotifications_job'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='usernotifications',
+            index=models.Index(fields=['created_at', 'id'], name='notification_created_id_idx'),
+        ),
+    ]
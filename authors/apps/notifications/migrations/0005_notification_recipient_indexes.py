@@ -0,0 +1,25 @@
+# Generated by Django 2.2.28 on 2026-10-18 10:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0004_notification_created_id_idx'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='usernotifications',
+            name='notification_created_id_idx',
+        ),
+        migrations.AddIndex(
+            model_name='usernotifications',
+            index=models.Index(fields=['recipient', 'created_at', 'id'], name='notif_recipient_page_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='usernotifications',
+            index=models.Index(fields=['recipient', 'read_status', 'created_at', 'id'], name='notif_recipient_unread_idx'),
+        ),
+    ]
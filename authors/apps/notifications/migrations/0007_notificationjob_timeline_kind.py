@@ -0,0 +1,18 @@
+# Generated by Django 2.2.28 on 2026-10-18 12:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0006_notificationjob_claimed_at'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='notificationjob',
+            name='kind',
+            field=models.CharField(choices=[('article', 'New article'), ('comment', 'New comment'), ('timeline', 'New article, timelines only')], max_length=20),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 2.2.28 on 2026-10-18 15:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0007_notificationjob_timeline_kind'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='notificationjob',
+            name='kind',
+            field=models.CharField(choices=[('article', 'New article'), ('comment', 'New comment'), ('timeline', 'New article, timelines only'), ('related', 'Related articles refresh')], max_length=20),
+        ),
+    ]
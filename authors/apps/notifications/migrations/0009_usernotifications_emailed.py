@@ -0,0 +1,25 @@
+# Generated by Django 2.2.28 on 2026-10-19 09:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0008_notificationjob_related_kind'),
+    ]
+
+    operations = [
+        # the notifications created before count as emailed, so no retry
+        # sends them again
+        migrations.AddField(
+            model_name='usernotifications',
+            name='emailed',
+            field=models.BooleanField(default=True),
+        ),
+        migrations.AlterField(
+            model_name='usernotifications',
+            name='emailed',
+            field=models.BooleanField(default=False),
+        ),
+    ]
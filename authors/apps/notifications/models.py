@@ -3,13 +3,13 @@
 
 from django.db import models
 from authors.apps.authentication.models import User
-from authors.apps.articles.models import ArticlesModel
+from authors.apps.articles.models import ArticlesModel, Comment
 from django.utils.timezone import now
 
 
 class UserNotifications(models.Model):
     """ Notification model """
-    author = models.ForeignKey(ArticlesModel, related_name="author_id+", on_delete=models.CASCADE, blank=True)
+    author = models.ForeignKey(User, related_name="author_id+", on_delete=models.CASCADE, blank=True)
     recipient = models.ForeignKey(User, to_field="email", on_delete=models.CASCADE, blank=True)
     article = models.ForeignKey(ArticlesModel, to_field="slug", on_delete=models.CASCADE, blank=True)
     notification = models.TextField()
@@ -21,11 +21,80 @@ class UserNotifications(models.Model):
     )
     read_status = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
+    # The fan-out job that created the notification, so a retried job
+    # can skip the readers it already notified
+    job = models.ForeignKey('NotificationJob', related_name="notifications", on_delete=models.SET_NULL,
+                            null=True, blank=True)
+    # Set once the email has been sent, a retried job emails the readers
+    # whose notification was created but not sent
+    emailed = models.BooleanField(default=False)
 
     class Meta:
         # Notice " - " : will order by created most recently
         ordering = ('-created_at',)
+        indexes = [
+            # a reader's notifications are paged on (created_at, id), the
+            # unread ones and the unread count use the read_status one
+            models.Index(fields=['recipient', 'created_at', 'id'], name='notif_recipient_page_idx'),
+            models.Index(fields=['recipient', 'read_status', 'created_at', 'id'],
+                         name='notif_recipient_unread_idx'),
+        ]
 
     def __str__(self):
         """return the notification"""
         return "{}".format(self.notification)
+
+
+class NotificationJob(models.Model):
+    """
+    A durable fan-out job, queued by the request that publishes an article
+    or comment and run later by the process_notifications worker
+    """
+    ARTICLE = 'article'
+    COMMENT = 'comment'
+    # Only adds the article to the followers' timelines, for articles
+    # imported without notifications
+    TIMELINE = 'timeline'
+    # Rebuilds the related articles of the article and its neighbours
+    # after its tags or favourites changed
+    RELATED = 'related'
+    KIND_CHOICES = (
+        (ARTICLE, 'New article'),
+        (COMMENT, 'New comment'),
+        (TIMELINE, 'New article, timelines only'),
+        (RELATED, 'Related articles refresh'),
+    )
+
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (PENDING, 'Pending'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    )
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    article = models.ForeignKey(ArticlesModel, related_name="notification_jobs", on_delete=models.CASCADE)
+    comment = models.ForeignKey(Comment, related_name="notification_jobs", on_delete=models.CASCADE,
+                                null=True, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    # When a worker last claimed the job, a job still running
+    # NOTIFICATION_JOB_LEASE seconds later is taken to have lost its worker
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ('created_at',)
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='notif_job_status_idx'),
+        ]
+
+    def __str__(self):
+        return "{} job for {}".format(self.kind, self.article_id)
+
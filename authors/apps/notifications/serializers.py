@@ -13,4 +13,4 @@ class NotificationSerializer(serializers.ModelSerializer):
         Notification fields to be returned to users
         """
         model = UserNotifications
-        fields = ("notification", "read_status", "created_at", "article", "author", "recipient", "article_link")
+        fields = ("id", "notification", "read_status", "created_at", "article", "author", "recipient", "article_link")
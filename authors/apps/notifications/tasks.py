@@ -0,0 +1,184 @@
+# authors/apps/notifications/tasks.py
+# Queues notification fan-out jobs and runs them outside the request
+
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from authors.apps.articles.related import refresh_lists
+from authors.apps.authentication.models import User
+from authors.apps.feed.models import TimelineEntry
+from .models import NotificationJob, UserNotifications
+
+logger = logging.getLogger(__name__)
+
+SENDER = 'authors-haven@authors-heaven.com'
+
+
+def article_link(article):
+    """Returns the link sent to readers for an article"""
+    return settings.DEFAULT_DOMAIN + "/api/articles/" + str(article.slug)
+
+
+def enqueue_article_notifications(article):
+    """Queues notifying the author's subscribed followers of a new article"""
+    return NotificationJob.objects.create(kind=NotificationJob.ARTICLE, article=article)
+
+
+def enqueue_comment_notifications(comment):
+    """Queues notifying the subscribed readers who favourited the commented article"""
+    return NotificationJob.objects.create(
+        kind=NotificationJob.COMMENT, article_id=comment.article_id, comment=comment)
+
+
+def claim_jobs(limit):
+    """
+    Marks up to `limit` pending jobs as running and returns them, skipping
+    jobs another worker has locked where the database supports it.
+
+    Jobs left running past NOTIFICATION_JOB_LEASE, whose worker died, are
+    claimed again, or failed once they have had all their attempts.
+    """
+    now = timezone.now()
+    stranded = Q(status=NotificationJob.RUNNING) & (
+        Q(claimed_at__lt=now - timedelta(seconds=settings.NOTIFICATION_JOB_LEASE)) | Q(claimed_at__isnull=True))
+    with transaction.atomic():
+        NotificationJob.objects.filter(stranded, attempts__gte=settings.NOTIFICATION_JOB_MAX_ATTEMPTS).update(
+            status=NotificationJob.FAILED, last_error='The worker running the job stopped')
+        claimable = NotificationJob.objects.filter(Q(status=NotificationJob.PENDING) | stranded)
+        if connection.features.has_select_for_update_skip_locked:
+            claimable = claimable.select_for_update(skip_locked=True)
+        # only the job rows are locked, the nullable comment join would make
+        # PostgreSQL reject FOR UPDATE, so the relations are loaded afterwards
+        ids = list(claimable.values_list('id', flat=True)[:limit])
+        NotificationJob.objects.filter(id__in=ids).update(
+            status=NotificationJob.RUNNING, attempts=F('attempts') + 1, claimed_at=now)
+        jobs = list(NotificationJob.objects.filter(id__in=ids).select_related(
+            'article__author', 'comment__author'))
+    return jobs
+
+
+def run_job(job):
+    """Runs a claimed job, putting it back in the queue if it fails"""
+    try:
+        HANDLERS[job.kind](job)
+    except Exception as error:
+        logger.exception('Notification job %s failed', job.id)
+        retry = job.attempts < settings.NOTIFICATION_JOB_MAX_ATTEMPTS
+        NotificationJob.objects.filter(id=job.id).update(
+            status=NotificationJob.PENDING if retry else NotificationJob.FAILED,
+            last_error=str(error))
+        return False
+    NotificationJob.objects.filter(id=job.id).update(status=NotificationJob.DONE, last_error='')
+    return True
+
+
+def publish_article(job):
+    """Adds the article to the followers' timelines, then notifies them"""
+    add_to_timelines(job)
+    notify_article_followers(job)
+
+
+def add_to_timelines(job):
+    """Adds the article to the followers' timelines"""
+    TimelineEntry.objects.fan_out(job.article)
+
+
+def notify_article_followers(job):
+    """Notifies the subscribed followers of the article's author"""
+    article = job.article
+    notification = article.author.username + " created a new article about " + article.title
+    recipients = User.objects.filter(
+        is_subcribed=True, profile__following__user=article.author_id)
+    fan_out(job, recipients, notification)
+
+
+def notify_article_favouriters(job):
+    """
+    Notifies the subscribed readers who favourited the article, other than
+    the commenter, selected with a single join on the favourites
+    """
+    comment = job.comment
+    notification = (comment.author.username + " commented on this article about " +
+                    job.article.title)
+    recipients = User.objects.filter(
+        is_subcribed=True, favourites__article=job.article_id
+    ).exclude(id=comment.author_id).distinct()
+    fan_out(job, recipients, notification)
+
+
+def fan_out(job, recipients, notification):
+    """
+    Creates the notification rows and emails for the recipients a chunk at
+    a time over a single mail connection. Recipients this job has already
+    emailed are skipped, so a retried job picks up where it failed: the
+    chunk whose sending failed is emailed again, without new rows, and a
+    reader may get its email twice if the failure came part way through.
+    """
+    article = job.article
+    url = article_link(article)
+    recipients = recipients.exclude(
+        email__in=UserNotifications.objects.filter(job=job, emailed=True).values('recipient_id')
+    ).order_by('id')
+
+    last_id = 0
+    with get_connection() as mail:
+        while True:
+            chunk = list(recipients.filter(id__gt=last_id).values_list(
+                'id', 'email', 'username')[:settings.NOTIFICATION_CHUNK_SIZE])
+            if not chunk:
+                break
+            last_id = chunk[-1][0]
+            emails = [email for _, email, _ in chunk]
+            unsent = UserNotifications.objects.filter(job=job, recipient_id__in=emails)
+            with transaction.atomic():
+                created = set(unsent.values_list('recipient_id', flat=True))
+                UserNotifications.objects.bulk_create([
+                    UserNotifications(
+                        job=job, article=article, notification=notification,
+                        author_id=article.author_id, recipient_id=email, article_link=url)
+                    for email in emails if email not in created
+                ])
+            # sent once the rows are committed, a rolled back chunk never emails
+            mail.send_messages([
+                notification_email(email, name, notification, url, mail)
+                for _, email, name in chunk
+            ])
+            unsent.update(emailed=True)
+
+
+def notification_email(email, name, notification, url, mail):
+    """Builds the email telling a reader about a notification"""
+    body = render_to_string('notification.html', {
+        'url': url,
+        'notification': notification,
+        'name': name
+    })
+    message = EmailMultiAlternatives(
+        'You have a new notification',
+        'You have a new notification from authors haven',
+        SENDER,
+        [email],
+        connection=mail,
+    )
+    message.attach_alternative(body, 'text/html')
+    return message
+
+
+def refresh_related_articles(job):
+    """Rebuilds the related articles of the article and of its neighbours"""
+    refresh_lists(job.article_id)
+
+
+HANDLERS = {
+    NotificationJob.ARTICLE: publish_article,
+    NotificationJob.COMMENT: notify_article_favouriters,
+    NotificationJob.TIMELINE: add_to_timelines,
+    NotificationJob.RELATED: refresh_related_articles,
+}
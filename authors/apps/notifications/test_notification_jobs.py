@@ -0,0 +1,147 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.conf import settings
+from django.core import mail
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.reverse import reverse
+
+from authors.apps.articles.tests.base_tests import BaseTest
+from authors.apps.notifications.models import NotificationJob, UserNotifications
+from authors.apps.notifications.tasks import claim_jobs, run_job
+
+
+class TestNotificationJobs(BaseTest):
+    """
+    Tests for the queued article notification fan-out
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.author_token = self.create_and_login_user()
+        self.create_and_login_user(self.user2)
+        self.client.get(reverse('notifications:subscribe'))
+        self.client.post(reverse("profiles:follow", kwargs={"username": self.user['user']['username']}))
+
+    def publish(self):
+        self.client.credentials(HTTP_AUTHORIZATION=self.author_token)
+        return self.create_article(token=self.author_token)
+
+    def jobs(self):
+        # leaves out the related articles refreshes queued by the tags
+        return NotificationJob.objects.exclude(kind=NotificationJob.RELATED)
+
+    def run_worker(self):
+        call_command('process_notifications', '--once', '--workers', '1', stdout=StringIO())
+
+    def test_publishing_only_queues_a_job(self):
+        sent = len(mail.outbox)
+        self.publish()
+        self.assertEqual(self.jobs().filter(status=NotificationJob.PENDING).count(), 1)
+        self.assertEqual(UserNotifications.objects.count(), 0)
+        self.assertEqual(len(mail.outbox), sent)
+
+    def test_worker_notifies_subscribed_followers(self):
+        self.publish()
+        sent = len(mail.outbox)
+        self.run_worker()
+        notification = UserNotifications.objects.get()
+        self.assertEqual(notification.recipient_id, self.user2['user']['email'])
+        self.assertEqual(len(mail.outbox), sent + 1)
+        self.assertEqual(mail.outbox[-1].to, [self.user2['user']['email']])
+        self.assertEqual(self.jobs().get().status, NotificationJob.DONE)
+
+    def test_rerun_job_does_not_duplicate_notifications(self):
+        self.publish()
+        self.run_worker()
+        self.jobs().update(status=NotificationJob.PENDING)
+        self.run_worker()
+        self.assertEqual(UserNotifications.objects.count(), 1)
+
+    def test_job_left_running_by_a_stopped_worker_is_claimed_again(self):
+        self.publish()
+        stale = timezone.now() - timedelta(days=1)
+        self.jobs().update(status=NotificationJob.RUNNING, attempts=1, claimed_at=stale)
+        self.run_worker()
+        job = self.jobs().get()
+        self.assertEqual(job.status, NotificationJob.DONE)
+        self.assertEqual(job.attempts, 2)
+        self.assertEqual(UserNotifications.objects.count(), 1)
+
+    def test_retried_job_emails_the_readers_a_failed_send_missed(self):
+        self.publish()
+        NotificationJob.objects.filter(kind=NotificationJob.RELATED).update(status=NotificationJob.DONE)
+        sent = len(mail.outbox)
+        with mock.patch('django.core.mail.backends.locmem.EmailBackend.send_messages',
+                        side_effect=OSError('SMTP is down')):
+            self.assertFalse(run_job(claim_jobs(1)[0]))
+        self.assertEqual(self.jobs().get().status, NotificationJob.PENDING)
+        self.assertFalse(UserNotifications.objects.get().emailed)
+        self.run_worker()
+        self.assertEqual(len(mail.outbox), sent + 1)
+        self.assertEqual(mail.outbox[-1].to, [self.user2['user']['email']])
+        self.assertTrue(UserNotifications.objects.get().emailed)
+
+    def test_running_job_out_of_attempts_fails(self):
+        self.publish()
+        self.jobs().update(
+            status=NotificationJob.RUNNING, attempts=settings.NOTIFICATION_JOB_MAX_ATTEMPTS,
+            claimed_at=timezone.now() - timedelta(days=1))
+        self.run_worker()
+        self.assertEqual(self.jobs().get().status, NotificationJob.FAILED)
+        self.assertEqual(UserNotifications.objects.count(), 0)
+
+    def test_running_job_within_its_lease_is_left_alone(self):
+        self.publish()
+        self.jobs().update(status=NotificationJob.RUNNING, attempts=1, claimed_at=timezone.now())
+        self.run_worker()
+        self.assertEqual(self.jobs().get().status, NotificationJob.RUNNING)
+        self.assertEqual(UserNotifications.objects.count(), 0)
+
+    def test_unsubscribed_followers_are_skipped(self):
+        self.client.get(reverse('notifications:unsubscribe'))
+        self.publish()
+        self.run_worker()
+        self.assertEqual(UserNotifications.objects.count(), 0)
+
+    def test_comment_notifies_subscribed_favouriters_only(self):
+        slug = self.publish()
+        # the author is subscribed but has no favourites, that used to
+        # stop every other reader from being notified
+        self.client.get(reverse('notifications:subscribe'))
+        self.login_user(self.user2)
+        self.client.post(reverse('articles:favourite', kwargs={'slug': slug}))
+        commenter = {"user": {"username": "commenter", "email": "commenter@test.com",
+                              "password": "testing123"}}
+        self.create_and_login_user(commenter)
+        self.client.post(reverse('articles:comments', kwargs={'slug': slug}), self.comment, format='json')
+        self.run_worker()
+        comment_notifications = UserNotifications.objects.filter(job__kind=NotificationJob.COMMENT)
+        self.assertEqual([n.recipient_id for n in comment_notifications], [self.user2['user']['email']])
+        self.assertIn('commenter commented on this article', comment_notifications[0].notification)
+
+    def test_commenter_is_not_notified_of_own_comment(self):
+        slug = self.publish()
+        self.login_user(self.user2)
+        self.client.post(reverse('articles:favourite', kwargs={'slug': slug}))
+        self.client.post(reverse('articles:comments', kwargs={'slug': slug}), self.comment, format='json')
+        self.run_worker()
+        self.assertFalse(UserNotifications.objects.filter(job__kind=NotificationJob.COMMENT).exists())
+
+
+    def test_claiming_locks_only_the_job_rows(self):
+        slug = self.publish()
+        self.login_user(self.user2)
+        self.client.post(reverse('articles:comments', kwargs={'slug': slug}), self.comment, format='json')
+        with CaptureQueriesContext(connection) as queries:
+            jobs = claim_jobs(10)
+        comment_job = next(job for job in jobs if job.kind == NotificationJob.COMMENT)
+        self.assertEqual(comment_job.comment.author.username, self.user2['user']['username'])
+        # FOR UPDATE on PostgreSQL rejects the outer join of the nullable comment
+        claim = [q['sql'] for q in queries if 'LIMIT' in q['sql']]
+        self.assertEqual(len(claim), 1)
+        self.assertNotIn('JOIN', claim[0])
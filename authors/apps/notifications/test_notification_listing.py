@@ -0,0 +1,74 @@
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from authors.apps.articles.models import ArticlesModel
+from authors.apps.articles.tests.base_tests import BaseTest
+from authors.apps.authentication.models import User
+from authors.apps.notifications.models import UserNotifications
+
+
+class TestNotificationListing(BaseTest):
+    """
+    Tests for listing and marking read the user's own notifications
+    """
+
+    def setUp(self):
+        super().setUp()
+        author_token = self.create_and_login_user()
+        self.create_article(token=author_token)
+        self.reader_token = self.create_and_login_user(self.user2)
+        self.client.credentials(HTTP_AUTHORIZATION=self.reader_token)
+        self.author = User.objects.get(email=self.user['user']['email'])
+        self.reader = User.objects.get(email=self.user2['user']['email'])
+        article = ArticlesModel.objects.get()
+        for recipient, count in ((self.reader, 3), (self.author, 2)):
+            for i in range(count):
+                UserNotifications.objects.create(
+                    author=self.author, recipient=recipient, article=article,
+                    notification='notification {}'.format(i))
+        self.list_url = reverse('notifications:notification')
+        self.read_url = reverse('notifications:mark_read')
+
+    def test_only_own_notifications_are_listed(self):
+        resp = self.client.get(self.list_url)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.data['count'], 3)
+        self.assertEqual(resp.data['unread_count'], 3)
+        self.assertEqual({n['recipient'] for n in resp.data['notifications']}, {self.reader.email})
+
+    def test_listing_is_paginated(self):
+        resp = self.client.get(self.list_url + '?page_size=2')
+        self.assertEqual(len(resp.data['notifications']), 2)
+        resp = self.client.get(resp.data['next'])
+        self.assertEqual(len(resp.data['notifications']), 1)
+
+    def test_unread_only(self):
+        read = UserNotifications.objects.filter(recipient=self.reader).first()
+        read.read_status = True
+        read.save()
+        resp = self.client.get(self.list_url + '?unread_only=true')
+        self.assertEqual(resp.data['count'], 2)
+        self.assertNotIn(read.id, [n['id'] for n in resp.data['notifications']])
+
+    def test_mark_some_read(self):
+        ids = list(UserNotifications.objects.filter(recipient=self.reader).values_list('id', flat=True))
+        resp = self.client.post(self.read_url, {'ids': ids[:2]}, format='json')
+        self.assertEqual(resp.data, {'marked_read': 2, 'unread_count': 1})
+
+    def test_mark_all_read_leaves_other_users_alone(self):
+        self.client.get(self.list_url)
+        # the token is cached by now, so this is the single UPDATE
+        with self.assertNumQueries(1):
+            resp = self.client.post(self.read_url, format='json')
+        self.assertEqual(resp.data['marked_read'], 3)
+        self.assertEqual(
+            UserNotifications.objects.filter(recipient=self.author, read_status=False).count(), 2)
+
+    def test_cannot_mark_read_someone_elses_notifications(self):
+        ids = list(UserNotifications.objects.filter(recipient=self.author).values_list('id', flat=True))
+        resp = self.client.post(self.read_url, {'ids': ids}, format='json')
+        self.assertEqual(resp.data['marked_read'], 0)
+
+    def test_invalid_ids(self):
+        resp = self.client.post(self.read_url, {'ids': 'all'}, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
@@ -4,26 +4,59 @@
 from rest_framework import generics
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.exceptions import ValidationError
 from rest_framework.renderers import JSONRenderer
 from authors.apps.notifications.models import UserNotifications
 from authors.apps.authentication.models import User
 from rest_framework.permissions import IsAuthenticated
+from authors.apps.core.pagination import KeysetPagination
 
 from authors.apps.authentication.serializers import (UserSerializer)
 from .serializers import NotificationSerializer
 
 
+def unread_count(user):
+    """Counts the user's unread notifications off the recipient/read_status index"""
+    return UserNotifications.objects.filter(recipient=user, read_status=False).count()
+
+
 class NotificationAPIView(generics.ListAPIView):
     """
     A View that returns notifications
     """
     renderer_classes = (JSONRenderer,)
     permission_classes = (IsAuthenticated,)
+    pagination_class = KeysetPagination
 
     def get(self, request, format=None):
-        notifications = UserNotifications.objects.all()
-        serializer = NotificationSerializer(notifications, many=True, read_only=True)
-        return Response({"notifications": serializer.data})
+        notifications = UserNotifications.objects.filter(recipient=request.user)
+        if request.query_params.get('unread_only', '').lower() in ('true', '1', 'yes'):
+            notifications = notifications.filter(read_status=False)
+        serializer = NotificationSerializer(self.paginate_queryset(notifications), many=True, read_only=True)
+        data = self.paginator.get_paginated_data(serializer.data, key='notifications')
+        data['unread_count'] = unread_count(request.user)
+        return Response(data)
+
+
+class MarkNotificationsReadAPIView(generics.GenericAPIView):
+    """
+    A view for marking the user's notifications as read, the ones listed
+    in "ids" or all of them, in a single UPDATE
+    """
+    renderer_classes = (JSONRenderer,)
+    permission_classes = (IsAuthenticated,)
+
+    def post(self, request):
+        notifications = UserNotifications.objects.filter(recipient=request.user, read_status=False)
+        ids = request.data.get('ids')
+        if ids is not None:
+            if not isinstance(ids, list) or not all(isinstance(id, int) for id in ids):
+                raise ValidationError({'ids': ['Provide a list of notification ids.']})
+            notifications = notifications.filter(id__in=ids)
+        marked = notifications.update(read_status=True)
+        # Marking everything read leaves nothing unread, no need to count
+        unread = unread_count(request.user) if ids is not None else 0
+        return Response({"marked_read": marked, "unread_count": unread})
 
 
 class SubscribeAPIView(generics.ListAPIView):
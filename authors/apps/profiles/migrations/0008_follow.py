@@ -0,0 +1,69 @@
+# Generated by Django 2.2.28 on 2026-10-18 12:10
+
+from django.db import migrations, models
+from django.db.models import Count
+import django.db.models.deletion
+
+
+def consolidate_follows(apps, schema_editor):
+    """
+    Moves both sides of every follow into Follow rows and stores the counts.
+    The followers table was written with the follower's user id in place of
+    a profile id, so those rows are mapped through the user first
+    """
+    Profile = apps.get_model('profiles', 'Profile')
+    Follow = apps.get_model('profiles', 'Follow')
+
+    edges = set(Profile.following.through.objects.values_list('from_profile_id', 'to_profile_id'))
+    profile_of_user = dict(Profile.objects.values_list('user_id', 'id'))
+    for followed_id, user_id in Profile.followers.through.objects.values_list('from_profile_id', 'to_profile_id'):
+        follower_id = profile_of_user.get(user_id)
+        if follower_id is not None:
+            edges.add((follower_id, followed_id))
+    Follow.objects.bulk_create([
+        Follow(follower_id=follower_id, followed_id=followed_id)
+        for follower_id, followed_id in edges if follower_id != followed_id
+    ], ignore_conflicts=True)
+
+    for field, column in (('followers_count', 'followed_id'), ('following_count', 'follower_id')):
+        counts = Follow.objects.order_by().values_list(column).annotate(Count('id'))
+        for profile_id, count in counts:
+            Profile.objects.filter(id=profile_id).update(**{field: count})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0007_profile_created_id_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Follow',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('followed', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='follower_edges', to='profiles.Profile')),
+                ('follower', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='following_edges', to='profiles.Profile')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='follow',
+            index=models.Index(fields=['followed', 'follower'], name='followed_follower_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='follow',
+            unique_together={('follower', 'followed')},
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='followers_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='following_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(consolidate_follows, migrations.RunPython.noop),
+    ]
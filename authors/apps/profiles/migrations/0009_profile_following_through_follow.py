@@ -0,0 +1,26 @@
+# Generated by Django 2.2.28 on 2026-10-18 12:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0008_follow'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='profile',
+            name='followers',
+        ),
+        migrations.RemoveField(
+            model_name='profile',
+            name='following',
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='following',
+            field=models.ManyToManyField(related_name='followers', through='profiles.Follow', to='profiles.Profile'),
+        ),
+    ]
@@ -1,4 +1,5 @@
-from django.db import models
+from django.db import models, transaction, IntegrityError
+from django.db.models import F
 from authors.apps.core.models import TimeStampedModel
 
 from django.db.models.signals import post_save
@@ -14,27 +15,86 @@ class Profile(TimeStampedModel):
     user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     bio = models.TextField(max_length=255, default='Update your bio')
     image_url = models.URLField(max_length=250, default="image-url", null=True)
-    # The related_name attribute specifies the name of the reverse relation from 
-    # the Profile model back to itself.
+    # One Follow row per edge, profile.followers is the reverse relation.
     # symmetrical=False results in creating one row
-    following = models.ManyToManyField('self', related_name='is_following',symmetrical=False)
-    followers = models.ManyToManyField('self', symmetrical=False)
+    following = models.ManyToManyField(
+        'self', through='Follow', related_name='followers', symmetrical=False)
+    # Kept up to date by follow() and unfollow()
+    followers_count = models.PositiveIntegerField(default=0)
+    following_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            # the profiles list is paged on (created_at, id)
+            models.Index(fields=['created_at', 'id'], name='profile_created_id_idx'),
+        ]
+
     def __str__(self):
         return self.user.username
 
+    def count_follow(self, profile, delta):
+        """Moves the stored counts of both profiles, and of these instances"""
+        Profile.objects.filter(pk=self.pk).update(following_count=F('following_count') + delta)
+        Profile.objects.filter(pk=profile.pk).update(followers_count=F('followers_count') + delta)
+        self.following_count += delta
+        profile.followers_count += delta
+
     def follow(self, profile):
-        self.following.add(profile)
-        profile.followers.add(self.user.id)
+        """Follows a profile, returns False if it was already followed"""
+        with transaction.atomic():
+            try:
+                with transaction.atomic():
+                    Follow.objects.create(follower=self, followed=profile)
+            except IntegrityError:
+                return False
+            self.count_follow(profile, 1)
+        return True
 
     def unfollow(self, profile):
-        self.following.remove(profile)
-        profile.followers.remove(self.user.id)
+        """Unfollows a profile, returns False if it wasn't followed"""
+        with transaction.atomic():
+            deleted, _ = Follow.objects.filter(follower=self, followed=profile).delete()
+            if deleted:
+                self.count_follow(profile, -1)
+        return bool(deleted)
 
     def list_followers(self, profile):
-        return profile.is_following.all()
+        return profile.followers.select_related('user')
 
     def list_following(self, profile):
-        return profile.following.all()
+        return profile.following.select_related('user')
+
+
+class FollowManager(models.Manager):
+
+    def followed_among(self, user, profiles):
+        """
+        Returns the ids of the profiles, out of many, that a user follows,
+        in one query for the whole list
+        """
+        if user is None or not user.is_authenticated or not profiles:
+            return set()
+        return set(self.filter(follower__user=user, followed__in=[profile.id for profile in profiles])
+                   .values_list('followed_id', flat=True))
+
+
+class Follow(models.Model):
+    """
+    Model for one profile following another, the unique index serves the
+    follower's side and followed_follower_idx the followed profile's side
+    """
+    follower = models.ForeignKey(Profile, related_name='following_edges', on_delete=models.CASCADE)
+    followed = models.ForeignKey(Profile, related_name='follower_edges', on_delete=models.CASCADE)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = FollowManager()
+
+    class Meta:
+        unique_together = ('follower', 'followed')
+        indexes = [
+            models.Index(fields=['followed', 'follower'], name='followed_follower_idx'),
+        ]
+
 
 @receiver(post_save, sender=settings.AUTH_USER_MODEL)
 def create_save_profile(sender, instance, created, **kwargs):
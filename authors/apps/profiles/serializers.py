@@ -1,10 +1,27 @@
 from rest_framework import serializers, status
 from rest_framework.validators import UniqueValidator
 
-from .models import Profile
+from django.db import models
+
+from .models import Profile, Follow
 from authors.apps.authentication.models import User
 from rest_framework.response import Response
 
+
+class ProfilesListSerializer(serializers.ListSerializer):
+    """
+    Serializes many profiles at once, checking which of them the reader
+    follows in one query for the whole list
+    """
+
+    def to_representation(self, data):
+        profiles = list(data.all() if isinstance(data, models.Manager) else data)
+        request = self.context.get('request')
+        followed = Follow.objects.followed_among(getattr(request, 'user', None), profiles)
+        for profile in profiles:
+            profile.is_followed = profile.id in followed
+        return super(ProfilesListSerializer, self).to_representation(profiles)
+
 class ProfileSerializer(serializers.ModelSerializer):
     """
     Serializer to map the UserProfile instance into JSON format
@@ -27,28 +44,13 @@ class ProfileSerializer(serializers.ModelSerializer):
         }
     )
 
-    followers_count = serializers.IntegerField(
-        read_only=True,
-        source="followers.count"
-    )
-
-    following_count = serializers.IntegerField(
-        read_only=True,
-        source="following.count"
-    )
-
     follow_status = serializers.SerializerMethodField()
 
-    def get_follow_status(self, request):
-        follows = Profile.objects.values_list('followers',flat=True).filter(
-            user=request.user.id,
-            followers=self.context['request'].user.id
-            )
-        if (follows):
-            return True
-        else:
-            return False
-        
+    def get_follow_status(self, obj):
+        # Lists check every profile up front
+        if hasattr(obj, 'is_followed'):
+            return obj.is_followed
+        return bool(Follow.objects.followed_among(self.context['request'].user, [obj]))
 
 
     def update(self, instance, validated_data):
@@ -63,6 +65,8 @@ class ProfileSerializer(serializers.ModelSerializer):
     class Meta:
         model = Profile
         fields = ('username', 'bio', 'image_url', 'followers_count', 'follow_status', 'following_count', 'created_at', 'updated_at')
+        read_only_fields = ('followers_count', 'following_count')
+        list_serializer_class = ProfilesListSerializer
 
 class ProfileListSerializer(serializers.ModelSerializer):
     """
@@ -70,15 +74,6 @@ class ProfileListSerializer(serializers.ModelSerializer):
     """
     username = serializers.CharField(source='user.username', read_only=True)
 
-    followers_count = serializers.IntegerField(
-        read_only=True,
-        source="followers.count"
-    )
-
-    following_count = serializers.IntegerField(
-        read_only=True,
-        source="following.count"
-    )
     class Meta:
         model = Profile
         fields = ('username', 'bio', 'image_url', 'followers_count', 'following_count')
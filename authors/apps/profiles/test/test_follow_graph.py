@@ -0,0 +1,64 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+
+from ..models import Profile, Follow
+from ...authentication.models import User
+
+
+class FollowGraphTest(APITestCase):
+    """
+    Tests for storing follows as edges with counts on the profiles
+    """
+
+    def setUp(self):
+        self.users = [User.objects.create_user('reader{}'.format(i), 'reader{}@test.com'.format(i), 'password')
+                      for i in range(5)]
+        self.profiles = [user.profile for user in self.users]
+        self.reader = self.profiles[0]
+
+    def profile(self, profile):
+        return Profile.objects.get(id=profile.id)
+
+    def test_counts_follow_the_edges(self):
+        writer = self.profiles[1]
+        self.assertTrue(self.reader.follow(writer))
+        self.assertFalse(self.reader.follow(writer))
+        self.profiles[2].follow(writer)
+        self.assertEqual(self.profile(writer).followers_count, 2)
+        self.assertEqual(self.profile(self.reader).following_count, 1)
+        self.assertEqual(Follow.objects.filter(followed=writer).count(), 2)
+
+        self.assertTrue(self.reader.unfollow(writer))
+        self.assertFalse(self.reader.unfollow(writer))
+        self.assertEqual(self.profile(writer).followers_count, 1)
+        self.assertEqual(self.profile(self.reader).following_count, 0)
+        self.assertEqual(list(self.reader.list_followers(writer)), [self.profiles[2]])
+
+    def test_profile_reads_the_stored_counts(self):
+        writer = self.profiles[1]
+        self.reader.follow(writer)
+        self.client.force_authenticate(self.users[0])
+        url = reverse('profiles:user-profile', kwargs={'username': 'reader1'})
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.data['followers_count'], 1)
+        self.assertTrue(response.data['follow_status'])
+        self.assertFalse(any('COUNT(' in query['sql'] for query in queries.captured_queries))
+
+    def test_follow_status_of_a_list_is_checked_at_once(self):
+        writer = self.profiles[1]
+        self.reader.follow(self.profiles[2])
+        self.profiles[2].follow(writer)
+        self.client.force_authenticate(self.users[0])
+        url = reverse('profiles:followers', kwargs={'username': 'reader1'})
+        with CaptureQueriesContext(connection) as few:
+            self.client.get(url)
+        for profile in self.profiles[3:]:
+            profile.follow(writer)
+        with CaptureQueriesContext(connection) as many:
+            response = self.client.get(url)
+        self.assertEqual(len(many.captured_queries), len(few.captured_queries))
+        statuses = {profile['username']: profile['follow_status'] for profile in response.data}
+        self.assertEqual(statuses, {'reader2': True, 'reader3': False, 'reader4': False})
@@ -4,7 +4,6 @@ from rest_framework.exceptions import NotFound
 from rest_framework.serializers import ValidationError
 from rest_framework import status, generics
 from rest_framework.response import Response
-from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.generics import CreateAPIView, ListAPIView
 from rest_framework import status
 
@@ -13,6 +12,7 @@ from .models import Profile
 from .renderers import ProfileJSONRenderer, ProfilesJSONRenderer
 from .serializers import ProfileSerializer, ProfileListSerializer
 from authors.apps.authentication.serializers import UserSerializer
+from authors.apps.core.pagination import KeysetPagination
 
 def current_profile(request):
     authenticated_user=request.user
@@ -152,20 +152,14 @@ class FollowedBy(generics.RetrieveAPIView):
 class ProfileListAPIView(ListAPIView):
     permission_classes = (IsAuthenticated,)
     renderer_classes = (ProfilesJSONRenderer,)
+    pagination_class = KeysetPagination
 
     def get(self, request):
         """
         List of profiles for other users
         """
-        try:
-            queryset = Profile.objects.all().exclude(user=request.user)
-        except Profile.DoesNotExist:
-            message = Response(
-                    {
-                        'message': 'Profile not found'
-                    },
-                    status=status.HTTP_404_NOT_FOUND
-                )
-        serializer = ProfileListSerializer(queryset, many=True)
-        message = Response({'profiles': serializer.data}, status=status.HTTP_200_OK)
+        queryset = Profile.objects.select_related('user').exclude(user=request.user)
+        serializer = ProfileListSerializer(self.paginate_queryset(queryset), many=True)
+        message = Response(self.paginator.get_paginated_data(serializer.data, key='profiles'),
+                           status=status.HTTP_200_OK)
         return message
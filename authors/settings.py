@@ -46,8 +46,9 @@ INSTALLED_APPS = [
     'authors.apps.core',
     'authors.apps.profiles',
 
-    'authors.apps.articles',
+    'authors.apps.articles.apps.ArticlesConfig',
     'authors.apps.notifications',
+    'authors.apps.feed',
     'rest_framework_swagger',
     'social_django',
 ]
@@ -215,3 +216,84 @@ DEFAULT_DOMAIN = 'https://shakas.herokuapp.com'
 WPM = 250
 PAGE_SIZE = os.getenv("PAGE_SIZE")
 MAX_PAGE_SIZE = os.getenv("MAX_PAGE_SIZE")
+
+# Article views are buffered and written in bulk (see articles/stats.py)
+# by a thread in each process, or only by the flush_article_views command
+# when ARTICLE_VIEWS_FLUSH_THREAD is off, the interval and window are in seconds
+ARTICLE_VIEWS_BUFFER_SIZE = int(os.getenv('ARTICLE_VIEWS_BUFFER_SIZE', 100))
+ARTICLE_VIEWS_FLUSH_INTERVAL = int(os.getenv('ARTICLE_VIEWS_FLUSH_INTERVAL', 30))
+ARTICLE_VIEWS_FLUSH_THREAD = os.getenv('ARTICLE_VIEWS_FLUSH_THREAD', 'True') == 'True'
+ARTICLE_VIEWS_DEDUPE_WINDOW = int(os.getenv('ARTICLE_VIEWS_DEDUPE_WINDOW', 30 * 60))
+ARTICLE_VIEWS_SPOOL = os.getenv('ARTICLE_VIEWS_SPOOL')
+
+# Trending scores (see articles/trending.py) count the events of the last
+# TRENDING_WINDOW_HOURS in buckets of TRENDING_BUCKET_HOURS, halving their
+# weight every TRENDING_HALF_LIFE_HOURS, the endpoint returns TRENDING_SIZE
+# articles unless ?limit= asks otherwise
+TRENDING_WINDOW_HOURS = int(os.getenv('TRENDING_WINDOW_HOURS', 72))
+TRENDING_BUCKET_HOURS = float(os.getenv('TRENDING_BUCKET_HOURS', 1))
+TRENDING_HALF_LIFE_HOURS = float(os.getenv('TRENDING_HALF_LIFE_HOURS', 24))
+TRENDING_SIZE = int(os.getenv('TRENDING_SIZE', 20))
+TRENDING_MAX_SIZE = int(os.getenv('TRENDING_MAX_SIZE', 100))
+
+# Related articles (see articles/related.py), the number kept per article
+# and how much sharing favouriters counts next to sharing tags
+RELATED_SIZE = int(os.getenv('RELATED_SIZE', 5))
+RELATED_FAVOURITE_WEIGHT = float(os.getenv('RELATED_FAVOURITE_WEIGHT', 0.5))
+
+# Author statistics (see articles/rollups.py) cover the last
+# ARTICLE_STATS_DAYS unless ?since= and ?until= ask for another range of at
+# most ARTICLE_STATS_MAX_DAYS
+ARTICLE_STATS_DAYS = int(os.getenv('ARTICLE_STATS_DAYS', 30))
+ARTICLE_STATS_MAX_DAYS = int(os.getenv('ARTICLE_STATS_MAX_DAYS', 366))
+
+# Bulk article imports (see articles/bulk.py) validate and insert this many
+# articles at a time, exports read this many rows at a time
+ARTICLE_IMPORT_CHUNK_SIZE = int(os.getenv('ARTICLE_IMPORT_CHUNK_SIZE', 500))
+
+# Notification fan-out jobs, run by the process_notifications worker
+NOTIFICATION_WORKERS = int(os.getenv('NOTIFICATION_WORKERS', 4))
+NOTIFICATION_CHUNK_SIZE = int(os.getenv('NOTIFICATION_CHUNK_SIZE', 500))
+NOTIFICATION_JOB_MAX_ATTEMPTS = int(os.getenv('NOTIFICATION_JOB_MAX_ATTEMPTS', 3))
+# Seconds a claimed job may run before another worker claims it again
+NOTIFICATION_JOB_LEASE = int(os.getenv('NOTIFICATION_JOB_LEASE', 15 * 60))
+
+# Timelines of the feed (see feed/models.py): new articles are written to
+# the followers' timelines by the same jobs, unless the author has more
+# than FEED_FANOUT_LIMIT followers, whose readers pull them when reading
+FEED_FANOUT_LIMIT = int(os.getenv('FEED_FANOUT_LIMIT', 5000))
+FEED_BACKFILL_SIZE = int(os.getenv('FEED_BACKFILL_SIZE', 20))
+
+# Users of recently seen tokens are cached per process (see
+# authentication/backends.py), the TTL is in seconds
+JWT_CACHE_SIZE = int(os.getenv('JWT_CACHE_SIZE', 1024))
+JWT_CACHE_TTL = int(os.getenv('JWT_CACHE_TTL', 60))
+
+# Article search backend (see articles/search.py), "postgres" or
+# "postings", by default postgres when the database is PostgreSQL
+SEARCH_BACKEND = os.getenv('SEARCH_BACKEND')
+# The postings backend ranks at most SEARCH_MAX_CANDIDATES articles, those
+# where the query's rarest term weighs the most, and counts the articles
+# for the term weights every SEARCH_COUNT_TTL seconds
+SEARCH_MAX_CANDIDATES = int(os.getenv('SEARCH_MAX_CANDIDATES', 1000))
+SEARCH_COUNT_TTL = int(os.getenv('SEARCH_COUNT_TTL', 300))
+# The cache the article count is kept in, shared by the processes serving
+# the API when ARTICLE_CACHE_BACKEND is a shared cache
+SEARCH_CACHE = os.getenv('SEARCH_CACHE', 'article_responses')
+
+# Rendered responses of anonymous article reads (see articles/cache.py)
+# are kept in the ARTICLE_RESPONSE_CACHE cache, set it to an empty string
+# to turn them off. Any Django cache backend works, e.g. FileBasedCache
+# with a directory in ARTICLE_CACHE_LOCATION, or a shared cache when
+# several processes serve the API
+ARTICLE_RESPONSE_CACHE = os.getenv('ARTICLE_RESPONSE_CACHE', 'article_responses')
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'article_responses': {
+        'BACKEND': os.getenv('ARTICLE_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('ARTICLE_CACHE_LOCATION', 'article-responses'),
+        'TIMEOUT': int(os.getenv('ARTICLE_CACHE_TIMEOUT', 300)),
+    },
+}
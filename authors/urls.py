@@ -26,6 +26,7 @@ urlpatterns = [
     path('api/', include(('authors.apps.authentication.urls', 'authentication'), namespace='authentication')),
     path('api/', include(('authors.apps.profiles.urls', 'profiles'), namespace='profiles')),
     path('api/', include('authors.apps.notifications.urls', namespace='notifications')),
+    path('api/', include('authors.apps.feed.urls', namespace='feed')),
     path(r'', schema_view),
 ]
 
@@ -0,0 +1,54 @@
+"""
+Benchmarks for the hot paths of the API.
+
+Each benchmark seeds its own throwaway test database, created and dropped
+the same way the test runner does it, so it never touches real data.
+Run one from the project root with e.g.
+
+    python -m benchmarks.comment_notifications --help
+"""
+import os
+import time
+from contextlib import contextmanager
+
+import django
+
+
+def setup():
+    """Configures Django for a benchmark run"""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'authors.settings')
+    django.setup()
+
+
+@contextmanager
+def bench_database():
+    """Creates a throwaway test database and drops it afterwards"""
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    setup_test_environment()
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+@contextmanager
+def timed(label, results):
+    """Records how long the block took, in seconds, under label"""
+    start = time.perf_counter()
+    yield
+    results[label] = time.perf_counter() - start
+
+
+def report(title, results, per=None):
+    """Prints the timings, optionally divided by the number of operations"""
+    print(title)
+    for label, seconds in results.items():
+        line = '  {:<45} {:>10.1f} ms'.format(label, seconds * 1000)
+        if per and label in per:
+            line += '  ({:.2f} ms each)'.format(seconds * 1000 / per[label])
+        print(line)
@@ -0,0 +1,67 @@
+"""
+Measures the bulk article import and export, against the target of
+100k articles a minute.
+
+    python -m benchmarks.article_import --articles 100000
+
+The articles are written to an NDJSON file first, each with a few of a
+thousand tags and a body of a few hundred words, imported with the
+import_articles command and exported back with export_articles.
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+
+from benchmarks import setup, bench_database, timed, report
+
+WORDS = ('article', 'python', 'django', 'query', 'index', 'cache', 'author', 'reader',
+         'tag', 'search', 'comment', 'rating', 'feed', 'view', 'slug', 'title')
+
+
+def write_articles(path, articles, rng):
+    with open(path, 'w') as output:
+        for i in range(articles):
+            output.write(json.dumps({
+                # one title in a hundred is repeated, its slug needs a suffix
+                'title': 'Imported article {}'.format(i if i % 100 else 0),
+                'description': 'An imported article',
+                'body': ' '.join(rng.choice(WORDS) for _ in range(rng.randint(100, 500))),
+                'tags': ['tag{}'.format(rng.randrange(1000)) for _ in range(rng.randint(1, 4))],
+                'author': 'bench_author',
+            }) + '\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--articles', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    setup()
+    from io import StringIO
+    from django.core.management import call_command
+    from django.db import connection
+    from authors.apps.authentication.models import User
+    from authors.apps.articles.models import ArticlesModel
+
+    directory = tempfile.mkdtemp()
+    source, exported = os.path.join(directory, 'source.ndjson'), os.path.join(directory, 'export.ndjson')
+    write_articles(source, args.articles, random.Random(args.seed))
+    with bench_database():
+        User.objects.create_user('bench_author', 'author@bench.test', 'password')
+        results = {}
+        with timed('import', results):
+            call_command('import_articles', source, stdout=StringIO(), stderr=StringIO())
+        with timed('export', results):
+            call_command('export_articles', output=exported, stderr=StringIO())
+
+        imported = ArticlesModel.objects.count()
+        print('{} articles imported, {:.0f} a minute'.format(imported, imported * 60 / results['import']))
+        report('Article import and export on {}'.format(connection.vendor), results,
+               per={'import': imported, 'export': imported})
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Compares the payload size and latency of 100-row article list pages
+returned in full, as ?view=summary and with ?fields= picking a few fields,
+for long articles.
+
+    python -m benchmarks.article_list_payload --articles 300 --words 3000
+"""
+import argparse
+
+from benchmarks import setup, bench_database, timed, report
+
+MODES = {
+    'full': {},
+    'view=summary': {'view': 'summary'},
+    'fields=slug,title,description,time_to_read': {'fields': 'slug,title,description,time_to_read'},
+}
+
+
+def seed(articles, words):
+    from authors.apps.authentication.models import User
+    from authors.apps.articles.models import ArticlesModel, Tags
+
+    author = User.objects.create_user('bench_author', 'author@bench.test', 'password')
+    tags = [Tags.objects.create(tag='tag{}'.format(i)) for i in range(5)]
+    body = ' '.join('word{}'.format(i % 500) for i in range(words))
+    for i in range(articles):
+        article = ArticlesModel.objects.create(
+            title='Bench article {}'.format(i), description='A long article to list',
+            body=body, author=author)
+        article.tags.add(*tags)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--articles', type=int, default=300)
+    parser.add_argument('--words', type=int, default=3000)
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    setup()
+    from django.conf import settings
+    from rest_framework.reverse import reverse
+    from rest_framework.test import APIClient
+    # the search index and counters receivers are registered by the views module
+    import authors.apps.articles.views  # noqa: F401
+
+    with bench_database():
+        results, per = {}, {}
+        with timed('seed', results):
+            seed(args.articles, args.words)
+
+        client = APIClient()
+        url = reverse('articles:articles')
+        sizes = {}
+        for mode, params in MODES.items():
+            params = dict(params, page_size=args.page_size, count='false')
+            label = 'GET {} rows, {}'.format(args.page_size, mode)
+            with timed(label, results):
+                for i in range(args.repeat):
+                    response = client.get(url, params)
+            assert response.status_code == 200, response.content
+            sizes[mode] = len(response.content)
+            per[label] = args.repeat
+
+        report('Article list pages', results, per)
+        print('Payload per page')
+        for mode, size in sizes.items():
+            print('  {:<45} {:>10.1f} KB'.format(mode, size / 1024))
+        if settings.MAX_PAGE_SIZE and int(settings.MAX_PAGE_SIZE) < args.page_size:
+            print('Note: MAX_PAGE_SIZE={} caps the page size'.format(settings.MAX_PAGE_SIZE))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""
+Compares the indexed article search against the LIKE '%term%' scan the
+SearchFilter used to do, for rare, common and multi-term queries over
+many synthetic articles. Each query fetches the first page and the count.
+
+    python -m benchmarks.article_search --articles 100000
+
+Seeding and indexing 100k articles takes several minutes on SQLite.
+"""
+import argparse
+import itertools
+import random
+import string
+
+from authors.apps.core.utils import chunked
+from benchmarks import setup, bench_database, timed, report
+
+
+def vocabulary(size, rng):
+    words = set()
+    while len(words) < size:
+        words.add(''.join(rng.choice(string.ascii_lowercase) for i in range(rng.randint(4, 10))))
+    return sorted(words)
+
+
+def seed(articles, words, rng):
+    from authors.apps.authentication.models import User
+    from authors.apps.articles.models import ArticlesModel
+    from authors.apps.articles.search import get_backend
+
+    # word frequencies follow Zipf's law, as in real text
+    cumulative = list(itertools.accumulate(1 / rank for rank in range(1, len(words) + 1)))
+
+    def text(length):
+        return ' '.join(rng.choices(words, cum_weights=cumulative, k=length))
+
+    author = User.objects.create_user('bench_author', 'author@bench.test', 'password')
+    backend = get_backend()
+    for batch in chunked(range(articles), 2000):
+        ArticlesModel.objects.bulk_create([
+            ArticlesModel(slug='bench-{}'.format(i), title=text(6), description=text(12),
+                          body=text(80), author=author)
+            for i in batch
+        ])
+        backend.index_many(list(ArticlesModel.objects.filter(slug__in=['bench-{}'.format(i) for i in batch])))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--articles', type=int, default=100000)
+    parser.add_argument('--vocabulary', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    setup()
+    from django.db.models import Q
+    from authors.apps.articles.models import ArticlesModel, ArticleSearchTerm
+    from authors.apps.articles.search import get_backend
+
+    rng = random.Random(7)
+    words = vocabulary(args.vocabulary, rng)
+    queries = {
+        'rare term': words[args.vocabulary // 2],
+        'common term': words[50],
+        'very common term': words[2],
+        'two terms': '{} {}'.format(words[10], words[200]),
+    }
+
+    with bench_database():
+        results, per = {}, {}
+        with timed('seed and index', results):
+            seed(args.articles, words, rng)
+
+        def like(text):
+            # what SearchFilter did: every term in any of the fields
+            found = ArticlesModel.objects.all()
+            for term in text.split():
+                found = found.filter(
+                    Q(title__icontains=term) | Q(description__icontains=term) |
+                    Q(tags__tag__icontains=term) | Q(author__username__icontains=term))
+            return found.distinct()
+
+        backend = get_backend()
+        matches = {}
+        for name, text in queries.items():
+            label = 'search, {} ({!r})'.format(name, text)
+            with timed(label, results):
+                for i in range(args.repeat):
+                    found = backend.search(ArticlesModel.objects.all(), text)
+                    list(found[:10])
+                    matches[name] = found.count()
+            per[label] = args.repeat
+
+            label = 'LIKE scan, {} ({!r})'.format(name, text)
+            with timed(label, results):
+                for i in range(args.repeat):
+                    found = like(text)
+                    list(found[:10])
+                    found.count()
+            per[label] = args.repeat
+
+        print('{} articles, {} postings'.format(
+            ArticlesModel.objects.count(), ArticleSearchTerm.objects.count()))
+        for name, count in matches.items():
+            print('  {:<20} {} matching articles'.format(name, count))
+        report('Article search', results, per)
+
+
+if __name__ == '__main__':
+    main()
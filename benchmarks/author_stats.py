@@ -0,0 +1,58 @@
+"""
+Measures the author statistics: compacting days of synthetic events into
+the daily rollups, and the statistics endpoint for an author of thousands
+of articles reading them.
+
+    python -m benchmarks.author_stats --events 1000000 --articles 5000
+
+The events are seeded as for the trending benchmark, over the last
+TRENDING_WINDOW_HOURS, all on articles of one author.
+"""
+import argparse
+import random
+from datetime import timedelta
+
+from benchmarks import setup, bench_database, timed, report
+from benchmarks.trending import seed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--events', type=int, default=1000000)
+    parser.add_argument('--articles', type=int, default=5000)
+    parser.add_argument('--users', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    setup()
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from django.utils import timezone
+    from rest_framework.test import APIClient
+    from authors.apps.authentication.models import User
+    from authors.apps.articles.models import ArticleDailyStats
+    from authors.apps.articles.rollups import compact, first_uncompacted_day
+
+    with bench_database():
+        results = {}
+        with timed('seed', results):
+            seed(args.events, args.articles, args.users, random.Random(args.seed))
+        day, yesterday, days = first_uncompacted_day(), timezone.localdate() - timedelta(days=1), 0
+        with timed('compact every day up to yesterday', results):
+            while day <= yesterday:
+                compact(day)
+                day, days = day + timedelta(days=1), days + 1
+        client = APIClient()
+        client.force_authenticate(User.objects.get(username='bench_author'))
+        with CaptureQueriesContext(connection) as queries:
+            with timed('statistics endpoint, last 30 days', results):
+                client.get('/api/articles/statistics/')
+
+        print('{} events on {} articles, {} days compacted into {} rows, endpoint ran {} queries'.format(
+            args.events, args.articles, days, ArticleDailyStats.objects.count(), len(queries)))
+        report('Author statistics on {}'.format(connection.vendor), results,
+               per={'compact every day up to yesterday': days or 1})
+
+
+if __name__ == '__main__':
+    main()
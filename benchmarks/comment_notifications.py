@@ -0,0 +1,87 @@
+"""
+Measures what a new comment costs once the readers to notify are found
+with one set-based query, against a database of many users and favourites.
+
+    python -m benchmarks.comment_notifications --users 50000 --favourites 500000
+"""
+import argparse
+
+from authors.apps.core.utils import chunked
+from benchmarks import setup, bench_database, timed, report
+
+
+def seed(users, favourites, articles):
+    from authors.apps.authentication.models import User
+    from authors.apps.articles.models import ArticlesModel, Favourite
+
+    author = User.objects.create_user('bench_author', 'author@bench.test', 'password')
+    for batch in chunked(range(users), 5000):
+        User.objects.bulk_create([
+            User(username='reader{}'.format(i), email='reader{}@bench.test'.format(i),
+                 password='!', is_active=True, is_subcribed=i % 2 == 0)
+            for i in batch
+        ])
+    ArticlesModel.objects.bulk_create([
+        ArticlesModel(slug='bench-{}'.format(i), title='Bench {}'.format(i),
+                      description='description', body='body', author=author)
+        for i in range(articles)
+    ])
+
+    user_ids = list(User.objects.exclude(id=author.id).values_list('id', flat=True))
+    article_ids = list(ArticlesModel.objects.values_list('id', flat=True))
+    per_user = max(1, favourites // len(user_ids))
+    pairs = ((user_id, article_ids[(index * 7 + k * 101) % len(article_ids)])
+             for index, user_id in enumerate(user_ids) for k in range(per_user))
+    for batch in chunked(pairs, 10000):
+        Favourite.objects.bulk_create(
+            [Favourite(user_id=user_id, article_id=article_id) for user_id, article_id in batch])
+    return author
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--users', type=int, default=50000)
+    parser.add_argument('--favourites', type=int, default=500000)
+    parser.add_argument('--articles', type=int, default=1000)
+    parser.add_argument('--comments', type=int, default=200)
+    args = parser.parse_args()
+
+    setup()
+    from django.db import connection
+    from authors.apps.authentication.models import User
+    from authors.apps.articles.models import ArticlesModel, Comment, Favourite
+    from authors.apps.notifications.models import NotificationJob
+    from authors.apps.notifications.tasks import claim_jobs, run_job
+    # the notification receivers are registered by the views module
+    import authors.apps.articles.views  # noqa: F401
+
+    with bench_database():
+        results = {}
+        with timed('seed', results):
+            author = seed(args.users, args.favourites, args.articles)
+        article = ArticlesModel.objects.order_by('id').first()
+        commenter = User.objects.filter(favourites__article=article).first()
+        favouriters = Favourite.objects.filter(article=article).count()
+
+        with timed('create comments (request side)', results):
+            for i in range(args.comments):
+                Comment.objects.create(body='comment {}'.format(i), article=article, author=commenter)
+
+        job = NotificationJob.objects.filter(kind=NotificationJob.COMMENT).first()
+        recipients = User.objects.filter(
+            is_subcribed=True, favourites__article=article).exclude(id=commenter.id).distinct()
+        with timed('select recipients', results):
+            notified = len(list(recipients.values_list('id', flat=True)))
+
+        NotificationJob.objects.exclude(id=job.id).delete()
+        with timed('run one fan-out job (worker side)', results):
+            run_job(claim_jobs(1)[0])
+
+        print('{} users, {} favourites, {} readers favourited the article, {} notified'.format(
+            User.objects.count(), Favourite.objects.count(), favouriters, notified))
+        report('Comment notifications on {}'.format(connection.vendor), results,
+               per={'create comments (request side)': args.comments})
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+"""
+Measures the trending aggregation job over millions of synthetic events,
+spread over the scoring window with most of them on a few popular
+articles, as well as the trending endpoint reading the stored scores.
+
+    python -m benchmarks.trending --events 3000000 --articles 20000
+
+Views make up most of the events, the rest are split between likes,
+ratings, comments and favourites. Seeding 3M events takes several minutes.
+"""
+import argparse
+import random
+from datetime import timedelta
+
+from authors.apps.core.utils import chunked
+from benchmarks import setup, bench_database, timed, report
+
+# share of the events of each kind, views being the rest
+SHARES = {'likes': 0.04, 'ratings': 0.02, 'comments': 0.02, 'favourites': 0.02}
+
+
+def seed(events, articles, users, rng):
+    from django.conf import settings
+    from django.utils import timezone
+    from authors.apps.authentication.models import User
+    from authors.apps.articles.models import (ArticlesModel, ArticleStat, Comment, Favourite,
+                                              LikesDislikes, Rating)
+
+    author = User.objects.create_user('bench_author', 'author@bench.test', 'password')
+    for batch in chunked(range(users), 5000):
+        User.objects.bulk_create([
+            User(username='reader{}'.format(i), email='reader{}@bench.test'.format(i), password='!')
+            for i in batch
+        ])
+    for batch in chunked(range(articles), 5000):
+        ArticlesModel.objects.bulk_create([
+            ArticlesModel(slug='bench-{}'.format(i), title='Bench {}'.format(i),
+                          description='description', body='body', author=author)
+            for i in batch
+        ])
+    user_ids = list(User.objects.values_list('id', flat=True))
+    article_ids = list(ArticlesModel.objects.values_list('id', flat=True))
+
+    now = timezone.now()
+    window = settings.TRENDING_WINDOW_HOURS * 3600
+
+    def random_events(count):
+        # article popularity follows a power law, as real traffic does
+        for i in range(count):
+            yield (article_ids[int(len(article_ids) * rng.random() ** 3)], rng.choice(user_ids),
+                   now - timedelta(seconds=rng.random() * window))
+
+    # likes, ratings and favourites are one per reader and article
+    def unique_events(count):
+        seen = set()
+        for article_id, user_id, created_at in random_events(count):
+            if (article_id, user_id) not in seen:
+                seen.add((article_id, user_id))
+                yield article_id, user_id, created_at
+
+    builders = {
+        'likes': lambda a, u, t: LikesDislikes(article_id=a, reader_id=u, likes=True, created_at=t),
+        'ratings': lambda a, u, t: Rating(article_id=a, user_id=u, rating=4, created_at=t),
+        'comments': lambda a, u, t: Comment(article_id=a, author_id=u, body='comment', created_at=t),
+        'favourites': lambda a, u, t: Favourite(article_id=a, user_id=u, created_at=t),
+    }
+    # keep the generated dates of the models that otherwise date rows on insert
+    for model in (Comment, Favourite):
+        model._meta.get_field('created_at').auto_now_add = False
+    for kind, share in SHARES.items():
+        model, build = type(builders[kind](0, 0, now)), builders[kind]
+        source = random_events if kind == 'comments' else unique_events
+        for batch in chunked(source(int(events * share)), 10000):
+            model.objects.bulk_create([build(*event) for event in batch])
+    views = events - sum(int(events * share) for share in SHARES.values())
+    for batch in chunked(random_events(views), 20000):
+        ArticleStat.objects.bulk_create(
+            [ArticleStat(article_id=a, user_id=u, created_at=t) for a, u, t in batch])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--events', type=int, default=3000000)
+    parser.add_argument('--articles', type=int, default=20000)
+    parser.add_argument('--users', type=int, default=20000)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    setup()
+    from django.db import connection
+    from django.test import Client
+    from authors.apps.articles.models import ArticleStat, TrendingScore
+    from authors.apps.articles.trending import compute_scores, refresh_scores
+
+    with bench_database():
+        results = {}
+        with timed('seed', results):
+            seed(args.events, args.articles, args.users, random.Random(args.seed))
+        with timed('compute scores (aggregation only)', results):
+            compute_scores()
+        with timed('refresh scores (aggregation and write)', results):
+            scored = refresh_scores()
+        client = Client()
+        with timed('trending endpoint, top 20', results):
+            client.get('/api/articles/trending/')
+
+        print('{} events ({} views) on {} articles, {} articles scored'.format(
+            args.events, ArticleStat.objects.count(), args.articles, TrendingScore.objects.count()))
+        report('Trending scores on {}'.format(connection.vendor), results,
+               per={'refresh scores (aggregation and write)': scored})
+
+
+if __name__ == '__main__':
+    main()